@@ -31,6 +31,19 @@ celery_app.conf.update(
     # Configuración básica de cola
     task_queues=(
         Queue('default', Exchange('default'), routing_key='default'),
+        # Cola exclusiva del worker de correos: celery -A app.celery_app worker -Q correos
+        Queue('correos', Exchange('correos'), routing_key='correos'),
     ),
     task_default_queue='default',
+    task_routes={
+        'enviar_bandeja_correos': {'queue': 'correos', 'routing_key': 'correos'},
+    },
+
+    # Revisión periódica de la bandeja de salida (reintentos con backoff)
+    beat_schedule={
+        'enviar-bandeja-correos': {
+            'task': 'enviar_bandeja_correos',
+            'schedule': settings.EMAIL_OUTBOX_POLL_SECONDS,
+        },
+    },
 )
\ No newline at end of file
@@ -42,9 +42,87 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[SecretStr] = None
     SMTP_SENDER_EMAIL: Optional[EmailStr] = None
     SMTP_SENDER_NAME: Optional[str] = None
-    
+
+    # Sesiones SMTP autenticadas que se mantienen abiertas y se reutilizan
+    SMTP_POOL_SIZE: int = 3
+    # Segundos que una sesión puede quedar inactiva antes de descartarse
+    SMTP_POOL_IDLE_SECONDS: int = 60
+    SMTP_TIMEOUT_SECONDS: int = 30
+    # Envíos simultáneos en los procesos masivos y límite de correos por segundo (0 = sin límite)
+    SMTP_MAX_CONCURRENCY: int = 3
+    SMTP_RATE_LIMIT_PER_SECOND: float = 5.0
+
+    # --- BANDEJA DE SALIDA DE CORREOS (email_outbox) ---
+    # Correos que el worker toma por lote
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    # Intentos antes de marcar un correo como FALLIDO
+    EMAIL_OUTBOX_MAX_INTENTOS: int = 5
+    # Espera base entre reintentos; se duplica en cada intento fallido
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = 60
+    # Plazo tras el cual un correo que quedó 'ENVIANDO' (worker caído) se vuelve a tomar
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 600
+    # Cada cuánto Celery beat revisa la bandeja por si quedaron reintentos pendientes
+    EMAIL_OUTBOX_POLL_SECONDS: int = 60
+
+    # --- ALMACENAMIENTO DE CONSTANCIAS (PDF) ---
+    # "local" (disco, carpetas por prefijo del hash) o "s3" (S3/MinIO, requiere boto3)
+    CERT_STORAGE_BACKEND: str = "local"
+    CERT_STORAGE_ROOT: str = "certificates"
+    S3_BUCKET: Optional[str] = None
+    S3_PREFIX: str = ""
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_REGION: Optional[str] = None
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[SecretStr] = None
+    # Vigencia de las URL firmadas de descarga directa
+    S3_PRESIGNED_URL_SECONDS: int = 300
+    # Regenerar el PDF desde la BD al descargarlo en lugar de guardarlo al emitir
+    # (la generación es determinista: mismos datos -> mismos bytes y mismo ETag)
+    CERT_RENDER_ON_READ: bool = False
+    # Caché en disco de los PDF regenerados (LRU acotada por tamaño)
+    CERT_RENDER_CACHE_DIR: str = "certificates/cache"
+    CERT_RENDER_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    # max-age de los PDF regenerados: cambian si se corrige un dato en la BD,
+    # así que no son 'immutable' y se vuelven a validar con el ETag
+    CERT_RENDER_HTTP_MAX_AGE_SECONDS: int = 300
+
     # Necesario para pdfkit o wkhtmltopdf
     WKHTMLTOPDF_PATH: Optional[str] = None
+
+    # --- GENERACIÓN MASIVA DE PDF (pool de procesos) ---
+    # Número de procesos para renderizar constancias en paralelo (0 = núcleos disponibles, 1 = sin pool).
+    # Dentro de un worker prefork de Celery (proceso daemon) el render siempre es en serie.
+    PDF_POOL_SIZE: int = 1
+    # Constancias que recibe cada proceso por tarea
+    PDF_POOL_CHUNK_SIZE: int = 10
+    # Certificados que se insertan por commit en la emisión masiva (1 = un commit por certificado)
+    CERT_COMMIT_BATCH_SIZE: int = 100
+    # Inscripciones por tarea de Celery al repartir una emisión masiva (chord)
+    BULK_EMISSION_CHUNK_SIZE: int = 200
+    # Tiempo que se conservan en Redis los contadores de avance de un job
+    JOB_PROGRESS_TTL_SECONDS: int = 86400
+    # Vigencia del token de un solo job para el flujo SSE de avance (va en la URL)
+    JOB_EVENTS_TOKEN_SECONDS: int = 60
+
+    # --- ESTADÍSTICAS DEL PANEL ---
+    # Segundos que se conservan en caché (se invalidan antes si hay escrituras)
+    STATS_CACHE_SECONDS: int = 60
+
+    # --- CACHÉ DE VERIFICACIÓN PÚBLICA POR FOLIO ---
+    # Entradas en el LRU en memoria de cada proceso
+    VERIFY_CACHE_MAX_ENTRIES: int = 10000
+    # Vigencia en memoria (corta: las invalidaciones de otros procesos solo llegan a Redis)
+    VERIFY_CACHE_LOCAL_TTL_SECONDS: int = 60
+    # Vigencia en Redis de un certificado encontrado y de un folio inexistente
+    VERIFY_CACHE_USE_REDIS: bool = True
+    VERIFY_CACHE_TTL_SECONDS: int = 86400
+    VERIFY_CACHE_NEGATIVE_TTL_SECONDS: int = 60
+    # max-age de la respuesta JSON de verificación para navegadores y CDN
+    VERIFY_HTTP_MAX_AGE_SECONDS: int = 300
+    # Folios por solicitud en POST /public/verificar
+    VERIFY_BULK_MAX_FOLIOS: int = 500
+    # Longitud máxima de cada folio en esa solicitud
+    VERIFY_FOLIO_MAX_LENGTH: int = 64
     
     # Configuración del motor de Pydantic V2
     model_config = SettingsConfigDict(
@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+import anyio
+from fastapi import Request, Response
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.types import Receive, Scope, Send
+
+# Un PDF emitido no cambia: se puede guardar un año sin volver a validar
+IMMUTABLE_MAX_AGE = 31536000
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 del archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def strong_etag(digest: str) -> str:
+    return f'"{digest}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match usa comparación débil: se ignora el prefijo W/."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidatos = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return etag in candidatos
+
+
+def _not_modified_since(request: Request, last_modified: Optional[datetime]) -> bool:
+    header = request.headers.get("if-modified-since")
+    if not header or last_modified is None:
+        return False
+    try:
+        desde = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    # La resolución de HTTP-date es de segundos
+    return int(last_modified.timestamp()) <= int(desde.timestamp())
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    RFC 7232: si el cliente envía If-None-Match se decide solo con él;
+    If-Modified-Since se usa únicamente cuando no hay ETag que comparar.
+    """
+    if request.headers.get("if-none-match"):
+        return _etag_matches(request, etag)
+    return _not_modified_since(request, last_modified)
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Interpreta un Range 'bytes=a-b', 'bytes=a-' o 'bytes=-n' y devuelve (inicio, fin)
+    inclusivos. Devuelve None si el encabezado no se puede usar (se responde el
+    archivo completo, como permite el RFC 7233, también para rangos múltiples)
+    y lanza ValueError si el rango no es satisfacible (416).
+    """
+    unidad, _, rangos = header.partition("=")
+    if unidad.strip().lower() != "bytes" or "," in rangos:
+        return None
+    inicio_txt, sep, fin_txt = rangos.strip().partition("-")
+    if not sep or not (inicio_txt or fin_txt):
+        return None
+    if not all(t.isdigit() for t in (inicio_txt, fin_txt) if t):
+        return None
+
+    if not inicio_txt:
+        # Sufijo: los últimos n bytes
+        largo = int(fin_txt)
+        if largo == 0:
+            raise ValueError(header)
+        return max(size - largo, 0), size - 1
+
+    inicio = int(inicio_txt)
+    fin = min(int(fin_txt), size - 1) if fin_txt else size - 1
+    if inicio >= size or fin < inicio:
+        raise ValueError(header)
+    return inicio, fin
+
+
+def _if_range_matches(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """If-Range: el rango solo se respeta si la versión del cliente sigue vigente (comparación fuerte)."""
+    header = request.headers.get("if-range")
+    if not header:
+        return True
+    header = header.strip()
+    if header.startswith('"') or header.startswith("W/"):
+        return header == etag
+    if last_modified is None:
+        return False
+    try:
+        return int(parsedate_to_datetime(header).timestamp()) == int(last_modified.timestamp())
+    except (TypeError, ValueError):
+        return False
+
+
+class FileRangeResponse(FileResponse):
+    """
+    206 Partial Content con un solo rango de bytes del archivo.
+    Si el servidor ASGI ofrece la extensión 'http.response.zerocopysend' el rango
+    se envía con sendfile desde el descriptor; si no, se lee por bloques.
+    """
+
+    def __init__(self, path: str, start: int, end: int, size: int, **kwargs):
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.end = end
+        self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        count = self.end - self.start + 1
+
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.start)
+                while count > 0:
+                    chunk = await file.read(min(self.chunk_size, count))
+                    if not chunk:
+                        break
+                    count -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": count > 0})
+                if count > 0:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        if self.background is not None:
+            await self.background()
+
+
+def _validator_headers(etag: str, cache_control: str, last_modified: Optional[datetime]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified.timestamp(), usegmt=True)
+    return headers
+
+
+def cached_file_response(
+    request: Request,
+    path: str,
+    digest: str,
+    filename: str,
+    last_modified: Optional[datetime] = None,
+    public: bool = True,
+    media_type: str = "application/pdf",
+    max_age: Optional[int] = None,
+) -> Response:
+    """
+    FileResponse para contenido inmutable con ETag fuerte (hash del archivo),
+    Last-Modified y Cache-Control 'immutable'. Responde 304 sin leer el archivo
+    cuando el cliente ya tiene la misma versión, y 206 con el rango pedido
+    (Range / If-Range) para que un reintento solo transfiera los bytes faltantes.
+    'public=False' para descargas autenticadas (no deben guardarse en un CDN).
+    Con 'max_age' el contenido puede cambiar: se usa ese max-age sin 'immutable'
+    y el cliente vuelve a validar con el ETag al vencer.
+    """
+    etag = strong_etag(digest)
+    if max_age is None:
+        cache_control = f"{'public' if public else 'private'}, max-age={IMMUTABLE_MAX_AGE}, immutable"
+    else:
+        cache_control = f"{'public' if public else 'private'}, max-age={max_age}"
+    headers = _validator_headers(etag, cache_control, last_modified)
+    headers["Accept-Ranges"] = "bytes"
+
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if range_header and _if_range_matches(request, etag, last_modified):
+        stat_result = os.stat(path)
+        size = stat_result.st_size
+        try:
+            rango = _parse_range(range_header, size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+        if rango is not None:
+            return FileRangeResponse(
+                path, *rango, size,
+                media_type=media_type, filename=filename, headers=headers, stat_result=stat_result,
+            )
+
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+
+
+def cached_json_response(request: Request, payload, max_age: int, public: bool = True) -> Response:
+    """
+    JSONResponse con ETag fuerte calculado sobre el cuerpo y un max-age corto
+    (el contenido puede cambiar si se elimina el registro).
+    """
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    etag = strong_etag(hashlib.sha256(body.encode()).hexdigest())
+    headers = _validator_headers(etag, f"{'public' if public else 'private'}, max-age={max_age}", None)
+
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    return JSONResponse(content=payload, headers=headers)
@@ -0,0 +1,60 @@
+import base64
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy.orm import Query
+
+# Encabezado con el cursor opaco de la siguiente página (ausente en la última)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """Cursor opaco a partir del último id entregado."""
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, value = base64.urlsafe_b64decode(padded.encode()).decode().split(":", 1)
+        if prefix != "id":
+            raise ValueError(prefix)
+        return int(value)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginación inválido.")
+
+
+def keyset_page(
+    query: Query,
+    id_column,
+    response: Response,
+    limit: int,
+    cursor: Optional[str] = None,
+    after_id: Optional[int] = None,
+    skip: int = 0,
+    descending: bool = True,
+) -> list:
+    """
+    Pagina por llave (keyset) sobre 'id_column': con cursor/after_id filtra
+    id < after_id (o > en orden ascendente) y usa el índice de la PK, así que
+    cualquier página cuesta lo mismo. Sin cursor se conserva el offset 'skip'
+    para los clientes anteriores.
+    Si hay más registros, el cursor de la siguiente página se envía en el
+    encabezado X-Next-Cursor; el cuerpo sigue siendo la lista de siempre.
+    """
+    limit = max(1, limit)
+    if cursor:
+        after_id = decode_cursor(cursor)
+
+    if after_id is not None:
+        query = query.filter(id_column < after_id if descending else id_column > after_id)
+    query = query.order_by(id_column.desc() if descending else id_column.asc())
+    if after_id is None and skip:
+        query = query.offset(skip)
+
+    # Se pide un registro extra solo para saber si existe otra página
+    items = query.limit(limit + 1).all()
+    if len(items) > limit:
+        items = items[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(items[-1].id)
+    return items
@@ -1,7 +1,7 @@
 import jwt
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union, Optional
-from jose import jwt
+from jose import JWTError, jwt
 import bcrypt
 
 # Importar status y HTTPException para la función de decodificación
@@ -35,6 +35,33 @@ def create_access_token(subject: Union[dict, Any], expires_delta: Optional[timed
     )
     return encoded_jwt
 
+# Alcance de los tokens para el flujo SSE de un job: no sirven como token Bearer
+JOB_EVENTS_SCOPE = "job_events"
+
+
+def create_job_events_token(email: str, job_id: str) -> str:
+    """
+    Token firmado para seguir un solo job por SSE. EventSource no permite
+    encabezados, así que viaja en la URL: por eso dura JOB_EVENTS_TOKEN_SECONDS,
+    está ligado al job_id y no lleva 'rol' (get_current_admin_user lo rechaza).
+    """
+    return create_access_token(
+        {"sub": email, "scope": JOB_EVENTS_SCOPE, "job_id": job_id},
+        expires_delta=timedelta(seconds=settings.JOB_EVENTS_TOKEN_SECONDS),
+    )
+
+
+def decode_job_events_token(token: str, job_id: str) -> Optional[str]:
+    """Devuelve el email del administrador si el token es válido para ese job; si no, None."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY.get_secret_value(), algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("scope") != JOB_EVENTS_SCOPE or payload.get("job_id") != job_id:
+        return None
+    return payload.get("sub")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica una contraseña plana contra su hash usando bcrypt."""
     password_bytes = plain_password.encode('utf-8')
@@ -18,6 +18,8 @@ from app.routers import (
     admin_productos_educativos,
     admin_inscripciones,
     admin_certificados,
+    admin_jobs,
+    admin_stats,
 )
 
 
@@ -44,6 +46,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor de paginación por llave (keyset) de los listados
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -65,6 +69,8 @@ api_router.include_router(admin_participantes.router)
 api_router.include_router(admin_productos_educativos.router)
 api_router.include_router(admin_inscripciones.router)
 api_router.include_router(admin_certificados.router)
+api_router.include_router(admin_jobs.router)
+api_router.include_router(admin_stats.router)
 
 # Prefijo global
 app.include_router(api_router, prefix="/api/v1")
@@ -7,6 +7,12 @@ from .participante import Participante
 from .producto_educativo import ProductoEducativo
 from .inscripciones import Inscripcion
 from .certificado import Certificado
+from .email_outbox import EmailOutbox
+from .estadisticas import (
+    EstadisticaCertificadosMes,
+    EstadisticaInscripcionesProducto,
+    EstadisticaCorreosMes,
+)
 from .association_tables import productos_educativos_docentes
 from .token_restablecimiento import TokenRestablecimientoPassword
 
@@ -18,6 +24,10 @@ __all__ = [
     "ProductoEducativo",
     "Inscripcion",
     "Certificado",
+    "EmailOutbox",
+    "EstadisticaCertificadosMes",
+    "EstadisticaInscripcionesProducto",
+    "EstadisticaCorreosMes",
     "productos_educativos_docentes",
     "token_restablecimiento",
 ]
\ No newline at end of file
@@ -16,6 +16,8 @@ class Certificado(Base):
     fecha_emision = Column(DateTime(timezone=True), server_default=func.now())
     
     archivo_path = Column(String)
+    # SHA-256 del PDF guardado (ETag fuerte para la caché HTTP)
+    archivo_sha256 = Column(String(64), nullable=True)
 
     con_competencias = Column(Boolean, default=False, nullable=False)
 
@@ -27,4 +29,5 @@ class Certificado(Base):
     # --- Relaciones ---
     inscripcion = relationship("Inscripcion", back_populates="certificados")
     docente = relationship("Docente", back_populates="certificados")
-    producto_educativo = relationship("ProductoEducativo")
\ No newline at end of file
+    producto_educativo = relationship("ProductoEducativo")
+    envios_correo = relationship("EmailOutbox", back_populates="certificado", cascade="all, delete-orphan")
\ No newline at end of file
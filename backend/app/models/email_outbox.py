@@ -0,0 +1,42 @@
+# backend/app/models/email_outbox.py
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Enum, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.database import Base
+from .enums import EstadoCorreoEnum
+
+class EmailOutbox(Base):
+    """
+    Bandeja de salida de correos con constancia adjunta.
+    La fila se inserta en la misma transacción que el certificado y un worker
+    de Celery aparte la envía, registrando intentos y estado por certificado.
+    """
+    __tablename__ = "email_outbox"
+
+    __table_args__ = (
+        # El worker busca siempre por estado y fecha del siguiente intento
+        Index("ix_email_outbox_estado_proximo_intento", "estado", "proximo_intento"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    certificado_id = Column(Integer, ForeignKey("certificados.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    recipient_email = Column(String(255), nullable=False)
+    recipient_name = Column(String(255), nullable=False)
+    course_name = Column(String(255), nullable=False)
+
+    # Job de Celery que encoló el correo (contadores de avance y checkpoint para reanudar)
+    job_id = Column(String(64), nullable=True, index=True)
+
+    estado = Column(Enum(EstadoCorreoEnum), default=EstadoCorreoEnum.PENDIENTE, nullable=False)
+    intentos = Column(Integer, default=0, nullable=False)
+    ultimo_error = Column(Text, nullable=True)
+
+    # Cuándo puede tomarse la fila (backoff entre reintentos / plazo de un envío en curso)
+    proximo_intento = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
+    fecha_envio = Column(DateTime(timezone=True), nullable=True)
+
+    # --- Relaciones ---
+    certificado = relationship("Certificado", back_populates="envios_correo")
@@ -10,3 +10,9 @@ class ModalidadEnum(str, Enum):
     REMOTA = "REMOTA"
     PRESENCIAL = "PRESENCIAL"
     HIBRIDA = "HIBRIDA"
+
+class EstadoCorreoEnum(str, Enum):
+    PENDIENTE = "PENDIENTE"
+    ENVIANDO = "ENVIANDO"
+    ENVIADO = "ENVIADO"
+    FALLIDO = "FALLIDO"
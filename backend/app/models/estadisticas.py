@@ -0,0 +1,45 @@
+# backend/app/models/estadisticas.py
+from sqlalchemy import Column, Integer, ForeignKey
+
+from app.database import Base
+
+# Tablas resumen para el panel y los reportes. Se actualizan de forma
+# incremental (INSERT ... ON CONFLICT DO UPDATE) en la misma transacción que
+# escribe los certificados, inscripciones y correos, así que consultarlas no
+# depende del tamaño del histórico.
+
+
+class EstadisticaCertificadosMes(Base):
+    """Certificados emitidos por producto educativo y mes."""
+    __tablename__ = "estadisticas_certificados_mes"
+
+    producto_educativo_id = Column(
+        Integer, ForeignKey("productos_educativos.id", ondelete="CASCADE"), primary_key=True
+    )
+    anio = Column(Integer, primary_key=True)
+    mes = Column(Integer, primary_key=True)
+
+    participantes = Column(Integer, default=0, nullable=False)
+    docentes = Column(Integer, default=0, nullable=False)
+    con_competencias = Column(Integer, default=0, nullable=False)
+
+
+class EstadisticaInscripcionesProducto(Base):
+    """Inscripciones por producto educativo."""
+    __tablename__ = "estadisticas_inscripciones_producto"
+
+    producto_educativo_id = Column(
+        Integer, ForeignKey("productos_educativos.id", ondelete="CASCADE"), primary_key=True
+    )
+    total = Column(Integer, default=0, nullable=False)
+
+
+class EstadisticaCorreosMes(Base):
+    """Correos de la bandeja de salida enviados o descartados (FALLIDO) por mes."""
+    __tablename__ = "estadisticas_correos_mes"
+
+    anio = Column(Integer, primary_key=True)
+    mes = Column(Integer, primary_key=True)
+
+    enviados = Column(Integer, default=0, nullable=False)
+    fallidos = Column(Integer, default=0, nullable=False)
@@ -1,17 +1,16 @@
 #Ruta: backend/app/routers/admin_certificados.py
 import datetime
-import os
 import json
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Body
 from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional, Dict
-from pathlib import Path
 
 from app.database import get_db
 from app import models
 
 from app.core.config import get_settings
+from app.core.pagination import keyset_page
 from app.tasks import emitir_y_enviar_certificados_masivamente_job
 
 from app.schemas.certificado import (
@@ -20,8 +19,16 @@ from app.schemas.certificado import (
 )
 CertificadoOut = Certificado
 
-from app.services.certificate_service import generate_certificate
+from app.services.certificate_service import (
+    generate_certificate,
+    discard_certificate_file,
+    certificate_file_response,
+    certificate_pdf_bytes,
+)
+from app.services.certificate_renderer import issue_date_for
 from app.services.email_service import send_certificate_email
+from app.services.stats_service import registrar_certificados
+from app.services.verification_cache import invalidate_verification
 from app.routers.dependencies import get_current_admin_user
 
 settings = get_settings()
@@ -58,9 +65,12 @@ def read_all_certificados(db: Session = Depends(get_db)):
 # ============================================================
 @router.get("/participantes", response_model=List[CertificadoOut])
 def read_certificados_participantes(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 15
+    limit: int = 15,
+    after_id: Optional[int] = None,
+    cursor: Optional[str] = None,
 ):
     query = (
         db.query(models.Certificado)
@@ -71,12 +81,12 @@ def read_certificados_participantes(
             selectinload(models.Certificado.inscripcion)
                 .selectinload(models.Inscripcion.producto_educativo)
         )
-        .order_by(models.Certificado.id.desc())
-        .offset(skip)
-        .limit(limit)
     )
 
-    return query.all()
+    return keyset_page(
+        query, models.Certificado.id, response, limit,
+        cursor=cursor, after_id=after_id, skip=skip,
+    )
 
 
 # ============================================================
@@ -84,9 +94,12 @@ def read_certificados_participantes(
 # ============================================================
 @router.get("/docentes", response_model=List[CertificadoOut])
 def read_certificados_docentes(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
-    limit: int = 15
+    limit: int = 15,
+    after_id: Optional[int] = None,
+    cursor: Optional[str] = None,
 ):
     query = (
         db.query(models.Certificado)
@@ -95,12 +108,12 @@ def read_certificados_docentes(
             selectinload(models.Certificado.docente),
             selectinload(models.Certificado.producto_educativo)
         )
-        .order_by(models.Certificado.id.desc())
-        .offset(skip)
-        .limit(limit)
     )
 
-    return query.all()
+    return keyset_page(
+        query, models.Certificado.id, response, limit,
+        cursor=cursor, after_id=after_id, skip=skip,
+    )
 
 
 # ============================================================
@@ -198,9 +211,10 @@ async def issue_certificate_to_participant(  
             detail="Se marcó 'con_competencias' pero no hay competencias válidas."
         )
 
-    # Generar certificado
+    # Generar certificado (la fecha impresa es la de fecha_emision)
+    fecha_emision = datetime.datetime.now(datetime.timezone.utc)
     try:
-        folio, path = generate_certificate(
+        folio, stored = generate_certificate(
             participant_name=db_inscripcion.participante.nombre_completo,
             course_name=producto.nombre,
             tipo_producto=producto.tipo_producto,
@@ -210,7 +224,8 @@ async def issue_certificate_to_participant(  
             is_docente=False,
             # CORRECCIÓN: Se eliminó el argumento obsoleto 'course_date_str'
             con_competencias=con_competencias_check,
-            competencias_list=competencias_list
+            competencias_list=competencias_list,
+            issue_date=issue_date_for(fecha_emision),
         )
     except Exception as e:
         raise HTTPException(500, f"Error al generar PDF: {e}")
@@ -218,14 +233,22 @@ async def issue_certificate_to_participant(  
     nuevo_cert = models.Certificado(
         inscripcion_id=db_inscripcion.id,
         producto_educativo_id=producto.id,
-        archivo_path=path,
+        archivo_path=stored.key,
+        archivo_sha256=stored.sha256,
         folio=folio,
-        fecha_emision=datetime.datetime.now(datetime.timezone.utc),
+        fecha_emision=fecha_emision,
         con_competencias=con_competencias_check
     )
 
-    db.add(nuevo_cert)
-    db.commit()
+    try:
+        db.add(nuevo_cert)
+        registrar_certificados(db, [nuevo_cert])
+        db.commit()
+    except Exception:
+        # El PDF ya se guardó: si el certificado no se guarda, no debe quedar huérfano
+        db.rollback()
+        discard_certificate_file(db, stored.key)
+        raise
     db.refresh(nuevo_cert)
 
     return nuevo_cert
@@ -267,7 +290,8 @@ def issue_certificate_to_docente(
 
     # CORRECCIÓN: Se eliminó la creación de 'course_date_str'
 
-    folio, path = generate_certificate(
+    fecha_emision = datetime.datetime.now(datetime.timezone.utc)
+    folio, stored = generate_certificate(
         participant_name=db_docente.nombre_completo,
         course_name=db_producto.nombre,
         tipo_producto=db_producto.tipo_producto,
@@ -279,20 +303,29 @@ def issue_certificate_to_docente(
         course_start_date=db_producto.fecha_inicio,
         course_end_date=db_producto.fecha_fin,
         con_competencias=False,
-        competencias_list=None
+        competencias_list=None,
+        issue_date=issue_date_for(fecha_emision),
     )
 
     nuevo = models.Certificado(
         docente_id=db_docente.id,
         producto_educativo_id=db_producto.id,
-        archivo_path=path,
+        archivo_path=stored.key,
+        archivo_sha256=stored.sha256,
         folio=folio,
-        fecha_emision=datetime.datetime.now(datetime.timezone.utc),
+        fecha_emision=fecha_emision,
         con_competencias=False
     )
 
-    db.add(nuevo)
-    db.commit()
+    try:
+        db.add(nuevo)
+        registrar_certificados(db, [nuevo])
+        db.commit()
+    except Exception:
+        # El PDF ya se guardó: si el certificado no se guarda, no debe quedar huérfano
+        db.rollback()
+        discard_certificate_file(db, stored.key)
+        raise
     db.refresh(nuevo)
 
     return nuevo
@@ -349,10 +382,7 @@ async def send_certificate_email_by_id(
     if not email:
         raise HTTPException(400, "El destinatario no tiene email válido")
 
-    if not certificado.archivo_path or not os.path.exists(certificado.archivo_path):
-        raise HTTPException(404, "PDF no encontrado en el servidor")
-
-    pdf_bytes = Path(certificado.archivo_path).read_bytes()
+    pdf_bytes = certificate_pdf_bytes(certificado)
 
     send_certificate_email(
         recipient_email=email,
@@ -380,15 +410,15 @@ def delete_certificado(certificado_id: int, db: Session = Depends(get_db)):
         raise HTTPException(404, "Certificado no encontrado")
 
     archivo = certificado.archivo_path
+    folio = certificado.folio
 
     db.delete(certificado)
+    registrar_certificados(db, [certificado], signo=-1)
     db.commit()
+    invalidate_verification(folio)
 
-    if archivo and os.path.exists(archivo):
-        try:
-            os.remove(archivo)
-        except Exception as e:
-            print(f"Error eliminando archivo físico: {e}")
+    # Las llaves son por contenido: solo se borra si ningún otro certificado la usa
+    discard_certificate_file(db, archivo)
 
     return None
 
@@ -399,6 +429,7 @@ def delete_certificado(certificado_id: int, db: Session = Depends(get_db)):
 @router.get("/download/{folio}", response_class=FileResponse)
 def download_certificado_by_folio(
     folio: str,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.Administrador = Depends(get_current_admin_user)
 ):
@@ -408,17 +439,11 @@ def download_certificado_by_folio(
         .first()
     )
 
-    if not certificado or not certificado.archivo_path:
+    if not certificado:
         raise HTTPException(404, "Certificado no encontrado")
 
-    if not os.path.exists(certificado.archivo_path):
-        raise HTTPException(404, "Archivo PDF no encontrado")
-
-    return FileResponse(
-        certificado.archivo_path,
-        media_type="application/pdf",
-        filename=f"{folio}.pdf"
-    )
+    # Descarga autenticada: inmutable, pero solo en la caché del navegador (private)
+    return certificate_file_response(request, db, certificado, filename=f"{folio}.pdf", public=False)
 
 
 # ============================================================
@@ -1,12 +1,14 @@
 # backend/app/routers/admin_docentes.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import models
 # ✅ Esta importación ahora tendrá éxito porque DocenteOut ya existe con ese nombre
 from app.schemas.docente import DocenteCreate, DocenteUpdate, DocenteOut
 from app.database import get_db
+from app.core.pagination import keyset_page
 from app.routers.dependencies import get_current_admin_user
 
 router = APIRouter(
@@ -31,9 +33,29 @@ def create_docente(docente: DocenteCreate, db: Session = Depends(get_db)):
     return db_docente
 
 @router.get("/", response_model=List[DocenteOut])
-def read_docentes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    docentes = db.query(models.Docente).order_by(models.Docente.id).offset(skip).limit(limit).all()
-    return docentes
+def read_docentes(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    q: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    query = db.query(models.Docente)
+    # Búsqueda por nombre o especialidad sobre todos los docentes (no solo la página actual)
+    if q and q.strip():
+        term = q.strip()
+        query = query.filter(or_(
+            models.Docente.nombre_completo.icontains(term, autoescape=True),
+            models.Docente.especialidad.icontains(term, autoescape=True),
+        ))
+
+    # Paginación por cursor (keyset) en orden ascendente de ID
+    return keyset_page(
+        query, models.Docente.id, response, limit,
+        cursor=cursor, after_id=after_id, skip=skip, descending=False,
+    )
 
 @router.get("/{docente_id}", response_model=DocenteOut)
 def read_docente(docente_id: int, db: Session = Depends(get_db)):
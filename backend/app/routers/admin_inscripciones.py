@@ -7,6 +7,7 @@ from app.database import get_db
 from app import models  # 💡 2. IMPORTA TUS MODELOS (usa 'models.' en lugar de 'InscripcionModel')
 from app.schemas.inscripcion import Inscripcion, InscripcionCreate
 from app.routers.dependencies import get_current_admin_user
+from app.services.stats_service import registrar_inscripciones
 
 router = APIRouter(
     prefix="/admin/inscripciones",
@@ -57,6 +58,7 @@ def create_inscripcion(inscripcion: InscripcionCreate, db: Session = Depends(get
 
     new_inscripcion = models.Inscripcion(**inscripcion.model_dump())
     db.add(new_inscripcion)
+    registrar_inscripciones(db, new_inscripcion.producto_educativo_id, 1)
     db.commit()
     db.refresh(new_inscripcion)
     return new_inscripcion
@@ -71,5 +73,6 @@ def delete_inscripcion(inscripcion_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Inscripción no encontrada.")
     
     db.delete(db_inscripcion)
+    registrar_inscripciones(db, db_inscripcion.producto_educativo_id, -1)
     db.commit()
     return
\ No newline at end of file
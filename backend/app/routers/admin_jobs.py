@@ -0,0 +1,127 @@
+# Ruta: backend/app/routers/admin_jobs.py
+import asyncio
+import json
+
+import redis.asyncio as aioredis
+from celery.result import AsyncResult
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from redis import RedisError
+from starlette.concurrency import run_in_threadpool
+
+from app.celery_app import celery_app
+from app.core.config import get_settings
+from app import models
+from app.core.security import create_job_events_token
+from app.routers.dependencies import get_current_admin_user, get_job_events_admin
+from app.schemas.job import JobEventsToken, JobProgreso, JobStatus
+from app.services.job_progress import events_channel, read_progress
+
+settings = get_settings()
+
+router = APIRouter(
+    prefix="/admin/jobs",
+    tags=["Admin - Jobs"],
+)
+
+# Segundos sin eventos tras los cuales se revisa el estado en Celery y se envía un keep-alive
+SSE_HEARTBEAT_SECONDS = 10
+
+
+def _build_job_status(job_id: str) -> JobStatus:
+    job = AsyncResult(job_id, app=celery_app)
+    estado = job.state
+    resultado = job.result if estado == "SUCCESS" else None
+
+    return JobStatus(
+        job_id=job_id,
+        estado=estado,
+        terminado=estado in ("SUCCESS", "FAILURE", "REVOKED"),
+        progreso=JobProgreso(**read_progress(job_id)),
+        resultado=resultado if isinstance(resultado, dict) else None,
+        error=str(job.result) if estado == "FAILURE" else None,
+    )
+
+
+# ============================================================
+# GET: Estado y avance de una tarea masiva
+# ============================================================
+@router.get("/{job_id}", response_model=JobStatus, dependencies=[Depends(get_current_admin_user)])
+def read_job_status(job_id: str):
+    """
+    Consulta el estado de la tarea en el backend de resultados de Celery y los
+    contadores de avance que la tarea publica en Redis. No consulta la BD principal.
+    """
+    try:
+        return _build_job_status(job_id)
+    except RedisError as e:
+        raise HTTPException(503, f"No se pudo consultar el estado de la tarea: {e}")
+
+
+# ============================================================
+# POST: Token de corta duración para el flujo SSE de un job
+# ============================================================
+@router.post("/{job_id}/events-token", response_model=JobEventsToken)
+def create_events_token(job_id: str, current_user: models.Administrador = Depends(get_current_admin_user)):
+    """
+    EventSource no puede enviar el encabezado Authorization, así que el token
+    viaja en la URL del flujo. Para no exponer el JWT de sesión en logs e
+    historial se entrega uno que solo vale para este job y dura unos segundos.
+    """
+    return JobEventsToken(
+        token=create_job_events_token(current_user.email_institucional, job_id),
+        expires_in=settings.JOB_EVENTS_TOKEN_SECONDS,
+    )
+
+
+# ============================================================
+# GET (SSE): Avance en vivo de una tarea masiva
+# ============================================================
+async def _job_event_stream(job_id: str, request: Request):
+    client = aioredis.from_url(settings.REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        # Suscribirse antes de leer el estado inicial para no perder eventos
+        await pubsub.subscribe(events_channel(job_id))
+
+        while True:
+            job_status = await run_in_threadpool(_build_job_status, job_id)
+            yield f"event: estado\ndata: {job_status.model_dump_json()}\n\n"
+            if job_status.terminado:
+                return
+
+            mensaje = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=SSE_HEARTBEAT_SECONDS
+            )
+            if mensaje is None:
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+
+            # Agrupar los eventos acumulados en una sola actualización
+            while await pubsub.get_message(ignore_subscribe_messages=True, timeout=0):
+                pass
+
+            if json.loads(mensaje["data"]).get("evento") == "terminado":
+                # El callback avisa justo antes de que Celery guarde su resultado
+                await asyncio.sleep(0.5)
+    except RedisError as e:
+        yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+@router.get("/{job_id}/events", dependencies=[Depends(get_job_events_admin)])
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Server-Sent Events con el estado del job (mismo formato que GET /admin/jobs/{job_id}).
+    Se emite un evento 'estado' al conectar y cada vez que la tarea publica avance en
+    Redis pub/sub; el flujo se cierra cuando la tarea termina.
+    """
+    return StreamingResponse(
+        _job_event_stream(job_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,11 +1,12 @@
 # backend/app/routers/admin_participantes.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app import models
 from app.schemas.participante import Participante, ParticipanteCreate, ParticipanteUpdate
 from app.database import get_db
+from app.core.pagination import keyset_page
 from app.routers.dependencies import get_current_admin_user
 
 router = APIRouter(
@@ -32,12 +33,23 @@ def create_participante(participante: ParticipanteCreate, db: Session = Depends(
     return db_participante
 
 @router.get("/", response_model=List[Participante])
-def read_participantes(skip: int = 0, limit: int = 15, db: Session = Depends(get_db)): # ✅ Límite: 15
+def read_participantes(
+    response: Response,
+    skip: int = 0,
+    limit: int = 15, # ✅ Límite: 15
+    after_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     # 🌟 CORRECCIÓN 1: Filtrar para mostrar solo los participantes NO eliminados y ordenar por ID descendente.
-    participantes = db.query(models.Participante).filter(
+    query = db.query(models.Participante).filter(
         models.Participante.is_deleted == False
-    ).order_by(models.Participante.id.desc()).offset(skip).limit(limit).all() # ✅ Ordenado por ID descendente
-    return participantes
+    )
+    # ✅ Paginación por cursor (keyset) ordenada por ID descendente
+    return keyset_page(
+        query, models.Participante.id, response, limit,
+        cursor=cursor, after_id=after_id, skip=skip,
+    )
 
 @router.get("/{participante_id}", response_model=Participante)
 def read_participante(participante_id: int, db: Session = Depends(get_db)):
@@ -2,9 +2,9 @@
 
 import pandas as pd
 import io
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List
 from pathlib import Path
 
@@ -18,6 +18,8 @@ from app.schemas.producto_educativo import (
 )
 from app.database import get_db
 from app.routers.dependencies import get_current_admin_user
+from app.services.certificate_service import certificate_print_batch, certificate_zip_stream
+from app.services.stats_service import registrar_inscripciones
 
 # ============================================================
 # Router principal
@@ -261,8 +263,9 @@ def upload_participantes_file(producto_id: int, file: UploadFile = File(...), db
                     whatsapp=str(row.get("whatsapp") or "").strip(),
                 )
                 db.add(db_part)
-                db.commit()
-                db.refresh(db_part)
+                # flush (no commit): todo el archivo y el resumen de inscripciones
+                # se confirman juntos al final, o se deshacen juntos si algo falla
+                db.flush()
                 creados += 1
 
             insc_exist = (
@@ -281,6 +284,7 @@ def upload_participantes_file(producto_id: int, file: UploadFile = File(...), db
                 db.add(nueva)
                 inscritos += 1
 
+        registrar_inscripciones(db, producto_id, inscritos)
         db.commit()
 
     except Exception as e:
@@ -293,6 +297,83 @@ def upload_participantes_file(producto_id: int, file: UploadFile = File(...), db
         "nuevas_inscripciones_realizadas": inscritos,
     }
 
+# ============================================================
+# DESCARGA DE TODOS LOS CERTIFICADOS DEL PRODUCTO (ZIP / PDF)
+# ============================================================
+
+def _certificados_del_producto(db: Session, producto_id: int) -> list[models.Certificado]:
+    producto = db.query(models.ProductoEducativo).filter(models.ProductoEducativo.id == producto_id).first()
+    if not producto:
+        raise HTTPException(status_code=404, detail="Producto educativo no encontrado")
+
+    certificados = (
+        db.query(models.Certificado)
+        .options(
+            selectinload(models.Certificado.producto_educativo),
+            selectinload(models.Certificado.inscripcion).selectinload(models.Inscripcion.participante),
+            selectinload(models.Certificado.docente),
+        )
+        .filter(models.Certificado.producto_educativo_id == producto_id)
+        .order_by(models.Certificado.id)
+        .all()
+    )
+    if not certificados:
+        raise HTTPException(status_code=404, detail="El producto no tiene certificados emitidos")
+    return certificados
+
+
+@router.get(
+    "/{producto_id}/certificados.zip",
+    response_class=StreamingResponse,
+    dependencies=[Depends(get_current_admin_user)],
+    summary="Descargar en un ZIP los certificados emitidos del producto",
+)
+def download_certificados_zip(
+    producto_id: int,
+    render_faltantes: bool = True,
+    db: Session = Depends(get_db),
+):
+    """
+    El ZIP se genera mientras se descarga (sin archivos temporales). Con
+    render_faltantes=true los PDF que no estén en el almacenamiento se
+    regeneran desde la BD.
+    """
+    certificados = _certificados_del_producto(db, producto_id)
+
+    return StreamingResponse(
+        certificate_zip_stream(certificados, render_missing=render_faltantes),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="certificados_producto_{producto_id}.zip"',
+            "Cache-Control": "private, no-store",
+        },
+    )
+
+
+@router.get(
+    "/{producto_id}/certificados.pdf",
+    response_class=Response,
+    dependencies=[Depends(get_current_admin_user)],
+    summary="PDF de impresión con todas las constancias del producto",
+)
+def download_certificados_impresion(producto_id: int, db: Session = Depends(get_db)):
+    """
+    Un solo documento con una constancia por página para imprimir. La
+    plantilla y las fuentes se incluyen una sola vez, en lugar de concatenar
+    los PDF individuales.
+    """
+    certificados = _certificados_del_producto(db, producto_id)
+
+    return Response(
+        content=certificate_print_batch(certificados),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f'attachment; filename="impresion_producto_{producto_id}.pdf"',
+            "Cache-Control": "private, no-store",
+        },
+    )
+
+
 # ============================================================
 # DESCARGA DE PLANTILLA (SIN AUTENTICACIÓN)
 # ============================================================
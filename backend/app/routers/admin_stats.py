@@ -0,0 +1,40 @@
+# Ruta: backend/app/routers/admin_stats.py
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.routers.dependencies import get_current_admin_user
+from app.schemas.stats import AdminStats
+from app.services.stats_service import get_admin_stats, reconstruir_estadisticas
+
+router = APIRouter(
+    prefix="/admin/stats",
+    tags=["Admin - Estadísticas"],
+    dependencies=[Depends(get_current_admin_user)]
+)
+
+
+# ============================================================
+# GET: Conteos del panel de control
+# ============================================================
+@router.get("/", response_model=AdminStats)
+def read_admin_stats(db: Session = Depends(get_db)):
+    """
+    Totales y desgloses del panel leídos de las tablas resumen (y COUNT de los
+    catálogos), en lugar de descargar todos los registros. Se guardan en caché
+    unos segundos y se invalidan al escribir certificados, inscripciones y catálogos.
+    """
+    return get_admin_stats(db)
+
+
+# ============================================================
+# POST: Reconstruir las tablas resumen
+# ============================================================
+@router.post("/reconstruir")
+def rebuild_admin_stats(db: Session = Depends(get_db)):
+    """
+    Recalcula las tablas resumen desde certificados, inscripciones y la bandeja
+    de correos. Solo hace falta en la carga inicial o si se editaron datos
+    directamente en la BD; la aplicación las mantiene al día en cada escritura.
+    """
+    return {"message": "Estadísticas reconstruidas.", "filas": reconstruir_estadisticas(db)}
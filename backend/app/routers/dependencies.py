@@ -1,4 +1,4 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError, jwt
@@ -9,6 +9,7 @@ from app.database import get_db
 # --- CORRECCIÓN AQUÍ ---
 # Se importa la función 'get_settings'
 from app.core.config import get_settings
+from app.core.security import decode_job_events_token
 
 # Se llama a la función para obtener la instancia de la configuración
 settings = get_settings()
@@ -30,7 +31,8 @@ def get_current_admin_user(token: str = Depends(oauth2_scheme), db: Session = De
         )
         email: str = payload.get("sub")
         role: str = payload.get("rol")
-        if email is None or role is None:
+        # Los tokens con alcance (p. ej. el del flujo SSE de un job) no son tokens de sesión
+        if email is None or role is None or payload.get("scope"):
             raise credentials_exception
         token_data = schemas_auth.TokenData(email=email, rol=role)
     except JWTError:
@@ -48,4 +50,28 @@ def get_current_admin_user(token: str = Depends(oauth2_scheme), db: Session = De
     if not user.activo:
          raise HTTPException(status_code=400, detail="Usuario inactivo")
          
-    return user
\ No newline at end of file
+    return user
+
+
+def get_job_events_admin(
+    job_id: str,
+    token: str = Query(...),
+    db: Session = Depends(get_db),
+) -> models.Administrador:
+    """
+    Para el flujo SSE de un job: EventSource del navegador no permite enviar el
+    encabezado Authorization, así que se recibe ?token= con el token de corta
+    duración de POST /admin/jobs/{job_id}/events-token (nunca el JWT de sesión).
+    """
+    email = decode_job_events_token(token, job_id)
+    if email is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de seguimiento inválido o vencido",
+        )
+
+    user = db.query(models.Administrador).filter(models.Administrador.email_institucional == email).first()
+    if user is None or not user.activo:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No se pudieron validar las credenciales")
+    return user
+
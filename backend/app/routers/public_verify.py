@@ -1,31 +1,75 @@
 # Ruta: backend/app/routers/public_verify.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session, joinedload
 from fastapi.responses import FileResponse
-from pathlib import Path 
+from typing import Dict, List, Optional, Set, Tuple
+import logging
 
 from app import models
-from app.schemas.certificado import CertificadoPublic
+from app.schemas.certificado import (
+    CertificadoPublic,
+    VerificacionFolio,
+    VerificacionMasivaRequest,
+    VerificacionMasivaResponse,
+)
 from app.database import get_db
+from app.core.config import get_settings
+from app.core.http_cache import cached_json_response
+from app.services.certificate_service import certificate_file_response
+from app.services.verification_cache import get_cached_verification, get_cached_verifications
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/public",
     tags=["Public"]
 )
 
-@router.get("/verificar/{folio}", response_model=CertificadoPublic)
-def verify_certificate_by_folio(folio: str, db: Session = Depends(get_db)):
-    certificado = db.query(models.Certificado).options(
+def _consulta_publica(db: Session):
+    """Certificados con su portador y producto (lo que muestra la verificación pública)."""
+    return db.query(models.Certificado).options(
         joinedload(models.Certificado.inscripcion)
             .joinedload(models.Inscripcion.participante),
         joinedload(models.Certificado.docente), 
         joinedload(models.Certificado.producto_educativo) 
             .joinedload(models.ProductoEducativo.docentes)
-    ).filter(models.Certificado.folio == folio).first()
+    )
+
+
+def _cargar_certificado_publico(db: Session, folio: str) -> Optional[dict]:
+    """
+    Consulta el certificado con su portador y producto y arma el payload público.
+    Devuelve None si el folio no existe; los errores de integridad se lanzan como 500
+    (y no se guardan en caché).
+    """
+    certificado = _consulta_publica(db).filter(models.Certificado.folio == folio).first()
     if not certificado:
-        raise HTTPException(status_code=404, detail="Certificado no encontrado")
+        return None
+    return _payload_publico(certificado)
 
+
+def _cargar_certificados_publicos(db: Session, folios: List[str]) -> Tuple[Dict[str, dict], Set[str]]:
+    """
+    Versión por lote: una sola consulta IN. Devuelve los payloads de los folios
+    encontrados y, aparte, los folios que existen pero tienen un error de integridad
+    (esos no se guardan en caché como inexistentes).
+    """
+    encontrados = {}
+    con_error = set()
+    for certificado in _consulta_publica(db).filter(models.Certificado.folio.in_(folios)).all():
+        try:
+            encontrados[certificado.folio] = _payload_publico(certificado)
+        except HTTPException as e:
+            # En el lote un registro inconsistente no tumba la respuesta: se marca con error
+            logger.error(e.detail)
+            con_error.add(certificado.folio)
+    return encontrados, con_error
+
+
+def _payload_publico(certificado: models.Certificado) -> dict:
+    folio = certificado.folio
     inscripcion = certificado.inscripcion
     docente_directo = certificado.docente
     
@@ -68,18 +112,69 @@ def verify_certificate_by_folio(folio: str, db: Session = Depends(get_db)):
         participante_nombre=nombre_del_portador or "Nombre Desconocido", 
         producto_educativo_nombre=producto.nombre or "Producto Desconocido",
         tipo_producto=producto.tipo_producto.value if producto.tipo_producto else "No especificado"
+    ).model_dump(mode="json")
+
+
+@router.post("/verificar", response_model=VerificacionMasivaResponse)
+def verify_certificates_bulk(body: VerificacionMasivaRequest, db: Session = Depends(get_db)):
+    """
+    Verificación de varios folios en una sola llamada (empleadores, auditorías).
+    Usa la misma caché que la verificación individual y resuelve los folios que
+    falten con una sola consulta IN. El esquema limita la solicitud a
+    VERIFY_BULK_MAX_FOLIOS folios. Un folio con error de integridad se reporta
+    con 'error' (no como inexistente) y no se guarda en caché.
+    """
+    folios = list(dict.fromkeys(f.strip() for f in body.folios if f and f.strip()))
+    if not folios:
+        raise HTTPException(status_code=400, detail="Se requiere al menos un folio.")
+
+    payloads, con_error = get_cached_verifications(
+        folios, lambda faltantes: _cargar_certificados_publicos(db, faltantes)
+    )
+
+    resultados = []
+    for folio in folios:
+        if folio in con_error:
+            resultados.append(VerificacionFolio(folio=folio, encontrado=False, error=True))
+        else:
+            payload = payloads[folio]
+            resultados.append(VerificacionFolio(folio=folio, encontrado=payload is not None, certificado=payload))
+    encontrados = sum(1 for r in resultados if r.encontrado)
+    return VerificacionMasivaResponse(
+        resultados=resultados,
+        encontrados=encontrados,
+        no_encontrados=len(resultados) - encontrados - len(con_error),
+        con_error=len(con_error),
     )
 
 
+@router.get("/verificar/{folio}", response_model=CertificadoPublic)
+def verify_certificate_by_folio(folio: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Verificación pública por folio (escaneo del QR). Los folios no cambian una vez
+    emitidos, así que el payload se sirve desde la caché (memoria + Redis) y la
+    sesión de BD solo se usa cuando el folio no está en caché.
+    La respuesta lleva ETag, así que una nueva consulta del navegador o del CDN
+    con If-None-Match recibe 304 sin cuerpo.
+    """
+    payload = get_cached_verification(folio, lambda: _cargar_certificado_publico(db, folio))
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Certificado no encontrado")
+    return cached_json_response(request, payload, max_age=settings.VERIFY_HTTP_MAX_AGE_SECONDS)
+
+
 # ----------------------------------------------------------------------
 # ENDPOINT PARA OBTENER EL PDF (CORREGIDO)
 # ----------------------------------------------------------------------
 @router.get("/certificado/{folio}/pdf", 
             response_class=FileResponse, 
             summary="Obtener PDF de Certificado por Folio para Visualización")
-def get_certificado_pdf(folio: str, db: Session = Depends(get_db)):
+def get_certificado_pdf(folio: str, request: Request, db: Session = Depends(get_db)):
     """
     Busca un certificado por su folio y devuelve el archivo PDF asociado.
+    El PDF emitido no cambia: se sirve con ETag fuerte (SHA-256 del archivo) y
+    Cache-Control immutable, y se responde 304 si el cliente ya lo tiene.
+    Acepta Range/If-Range (206) para que los visores móviles reanuden descargas.
     """
     
     # 1. Buscar el certificado por folio
@@ -88,26 +183,6 @@ def get_certificado_pdf(folio: str, db: Session = Depends(get_db)):
     if not certificado:
         raise HTTPException(status_code=404, detail="Certificado no encontrado o folio incorrecto")
     
-    # 2. OBTENER LA RUTA DEL PDF: Usando 'archivo_path' (la columna correcta del modelo)
-    pdf_path_str = certificado.archivo_path
-    
-    if not pdf_path_str:
-        # Esto indica un problema en la generación o almacenamiento de la ruta en la DB
-        raise HTTPException(
-            status_code=500, 
-            detail="Ruta del archivo PDF no especificada para este certificado. Columna 'archivo_path' vacía."
-        )
-
-    # 3. Validar y servir el archivo
-    file_path = Path(pdf_path_str)
-    
-    if not file_path.is_file():
-        # Esto indica que el archivo físico fue movido o eliminado
-        raise HTTPException(status_code=404, detail=f"Archivo PDF no encontrado en el servidor en la ruta: {pdf_path_str}")
-
-    # 4. Devolver el FileResponse
-    return FileResponse(
-        path=file_path, 
-        filename=f"Constancia-{folio}.pdf", 
-        media_type='application/pdf'
-    )
\ No newline at end of file
+    # 2. Servir el archivo desde el almacenamiento (o 304 si el cliente ya tiene esta versión).
+    #    Sin 'archivo_path' (CERT_RENDER_ON_READ) el PDF se regenera desde la BD.
+    return certificate_file_response(request, db, certificado, filename=f"Constancia-{folio}.pdf")
\ No newline at end of file
@@ -1,6 +1,10 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 from datetime import datetime
-from typing import Optional, TYPE_CHECKING
+from typing import Annotated, List, Optional, TYPE_CHECKING
+
+from app.core.config import get_settings
+
+settings = get_settings()
 
 if TYPE_CHECKING:
     from .inscripcion import InscripcionOut
@@ -51,6 +55,25 @@ class CertificadoPublic(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
     
+class VerificacionMasivaRequest(BaseModel):
+    # Acotado en el esquema: una solicitud más grande se rechaza (422) antes de procesarla
+    folios: List[Annotated[str, StringConstraints(max_length=settings.VERIFY_FOLIO_MAX_LENGTH)]] = Field(
+        ..., max_length=settings.VERIFY_BULK_MAX_FOLIOS
+    )
+
+class VerificacionFolio(BaseModel):
+    folio: str
+    encontrado: bool
+    # True si el folio existe pero el registro es inconsistente (no es lo mismo que no encontrado)
+    error: bool = False
+    certificado: Optional[CertificadoPublic] = None
+
+class VerificacionMasivaResponse(BaseModel):
+    resultados: List[VerificacionFolio]
+    encontrados: int
+    no_encontrados: int
+    con_error: int = 0
+
 class EmisionMasivaResponse(BaseModel):
     success: list[dict]
     errors: list[dict]
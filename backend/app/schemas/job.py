@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class JobProgreso(BaseModel):
+    total: int = 0
+    rendered: int = 0
+    committed: int = 0
+    resent: int = 0
+    emailed: int = 0
+    failed: int = 0
+
+class JobStatus(BaseModel):
+    job_id: str
+    # Estado de Celery: PENDING, STARTED, RETRY, SUCCESS, FAILURE...
+    estado: str
+    terminado: bool
+    progreso: JobProgreso
+    # Estadísticas consolidadas (solo cuando estado == SUCCESS)
+    resultado: Optional[dict] = None
+    error: Optional[str] = None
+
+class JobEventsToken(BaseModel):
+    # Token de corta duración válido solo para GET /admin/jobs/{job_id}/events
+    token: str
+    expires_in: int
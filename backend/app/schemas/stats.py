@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List
+
+class StatsTotales(BaseModel):
+    productos: int
+    participantes: int
+    docentes: int
+    administradores: int
+    inscripciones: int
+    certificados: int
+
+class CertificadosPorMes(BaseModel):
+    mes: str  # "YYYY-MM"
+    total: int
+
+class AdminStats(BaseModel):
+    totales: StatsTotales
+    certificados_por_destinatario: Dict[str, int]
+    certificados_por_competencias: Dict[str, int]
+    certificados_por_tipo_producto: Dict[str, int]
+    certificados_por_mes: List[CertificadosPorMes]
+    correos: Dict[str, int]
+    generado_en: datetime
@@ -0,0 +1,207 @@
+# backend/app/services/certificate_renderer.py
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+from app import models
+from app.core.config import get_settings
+from app.services.pdf_service import RENDER_VERSION, CertificateRenderRequest, render_certificate
+from app.services.template_registry import template_registry
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+# ============================================================
+# DATOS DE RENDER A PARTIR DE LA BD
+# ============================================================
+def issue_date_for(fecha_emision: datetime) -> date:
+    """
+    Fecha impresa en la constancia: el día local de fecha_emision. La emisión
+    y la regeneración usan esta misma regla para producir los mismos bytes.
+    """
+    if fecha_emision.tzinfo is not None:
+        fecha_emision = fecha_emision.astimezone()
+    return fecha_emision.date()
+
+
+def _competencias(producto: models.ProductoEducativo) -> list[str]:
+    if not producto.competencias:
+        return []
+    try:
+        raw = json.loads(producto.competencias)
+    except (TypeError, ValueError):
+        return []
+    return [str(x) for x in raw] if isinstance(raw, list) else []
+
+
+def render_request_for(certificado: models.Certificado) -> CertificateRenderRequest:
+    """
+    Reconstruye la solicitud de render con la que se emitió el certificado
+    (portador, producto, folio y fecha_emision guardados en la BD).
+    """
+    producto = certificado.producto_educativo
+    modalidad = producto.modalidad.value if producto.modalidad else "No especificada"
+    es_docente = certificado.docente_id is not None
+
+    if es_docente:
+        docente = certificado.docente
+        return CertificateRenderRequest(
+            serial=certificado.folio,
+            participant_name=docente.nombre_completo,
+            course_name=producto.nombre,
+            hours=producto.horas,
+            issue_date=issue_date_for(certificado.fecha_emision),
+            tipo_producto=producto.tipo_producto,
+            modalidad=modalidad,
+            entity_type="docente",
+            course_start_date=producto.fecha_inicio,
+            course_end_date=producto.fecha_fin,
+            docente_specialty=docente.especialidad,
+        )
+
+    competencias = _competencias(producto) if certificado.con_competencias else []
+    return CertificateRenderRequest(
+        serial=certificado.folio,
+        participant_name=certificado.inscripcion.participante.nombre_completo,
+        course_name=producto.nombre,
+        hours=producto.horas,
+        issue_date=issue_date_for(certificado.fecha_emision),
+        tipo_producto=producto.tipo_producto,
+        modalidad=modalidad,
+        entity_type="participante",
+        competencies=tuple(competencias) if competencias else None,
+    )
+
+
+def render_fingerprint(request: CertificateRenderRequest) -> str:
+    """
+    Huella de todo lo que determina los bytes del PDF: la solicitud, la
+    plantilla, la URL base del QR y la versión del generador. Si cambia un dato (p. ej. se corrige un
+    nombre) cambia la huella y el PDF se vuelve a generar.
+    """
+    partes = [
+        repr(request),
+        template_registry.get_sha256(),
+        settings.BASE_URL,
+        str(RENDER_VERSION),
+    ]
+    return hashlib.sha256("\x1f".join(partes).encode()).hexdigest()
+
+
+# ============================================================
+# CACHÉ EN DISCO (LRU ACOTADA POR TAMAÑO)
+# ============================================================
+class RenderCache:
+    """
+    PDF regenerados más usados, guardados en disco como <huella>.pdf.
+    Cada acierto actualiza el mtime del archivo; cuando el total supera
+    'max_bytes' se borran los de mtime más antiguo.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / fingerprint[:2] / f"{fingerprint}.pdf"
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        path = self._path(fingerprint)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return str(path)
+
+    def put(self, fingerprint: str, pdf_bytes: bytes) -> str:
+        path = self._path(fingerprint)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan_total()
+            else:
+                self._total += len(pdf_bytes)
+            if self._total > self.max_bytes:
+                self._evict(keep=path)
+        return str(path)
+
+    def _scan_total(self) -> int:
+        return sum(p.stat().st_size for p in self.directory.glob("*/*.pdf"))
+
+    def _evict(self, keep: Path) -> None:
+        archivos = []
+        for p in self.directory.glob("*/*.pdf"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            archivos.append((st.st_mtime, st.st_size, p))
+        archivos.sort()
+
+        total = sum(size for _, size, _ in archivos)
+        # Se libera hasta el 90 % para no barrer la carpeta en cada escritura
+        objetivo = int(self.max_bytes * 0.9)
+        for _, size, p in archivos:
+            if total <= objetivo:
+                break
+            if p == keep:
+                continue
+            p.unlink(missing_ok=True)
+            total -= size
+        self._total = total
+
+
+_render_cache = RenderCache(settings.CERT_RENDER_CACHE_DIR, settings.CERT_RENDER_CACHE_MAX_BYTES)
+
+
+def cache_rendered(request: CertificateRenderRequest, pdf_bytes: bytes) -> str:
+    """Guarda en la caché un PDF recién emitido (se envía por correo en seguida)."""
+    return _render_cache.put(render_fingerprint(request), pdf_bytes)
+
+
+def render_to_cache(certificado: models.Certificado) -> Tuple[str, str]:
+    """
+    Devuelve (ruta en la caché, sha256) del PDF del certificado, regenerándolo
+    desde la BD si no está en la caché.
+    """
+    request = render_request_for(certificado)
+    fingerprint = render_fingerprint(request)
+
+    path = _render_cache.get(fingerprint)
+    if path is None:
+        pdf_bytes = render_certificate(request)
+        path = _render_cache.put(fingerprint, pdf_bytes)
+        return path, hashlib.sha256(pdf_bytes).hexdigest()
+
+    with open(path, "rb") as f:
+        return path, hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def render_bytes(request: CertificateRenderRequest) -> bytes:
+    """Bytes del PDF de una solicitud, desde la caché si ya se generó."""
+    fingerprint = render_fingerprint(request)
+    path = _render_cache.get(fingerprint)
+    if path is not None:
+        return Path(path).read_bytes()
+    pdf_bytes = render_certificate(request)
+    _render_cache.put(fingerprint, pdf_bytes)
+    return pdf_bytes
@@ -1,23 +1,40 @@
 # backend/app/services/certificate_service.py
 
+import hashlib
+import os
+import re
 import uuid
 import json
-import re
-from datetime import date, datetime # Aseguramos la importación de 'date'
-from pathlib import Path
-from typing import Optional, List
+from datetime import date, datetime, timezone # Aseguramos la importación de 'date'
+from typing import Optional, List, Iterable, Iterator
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import RedirectResponse
+from sqlalchemy import insert, or_
 from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import get_settings
+from app.core.http_cache import cached_file_response, is_not_modified, strong_etag
+from app.services.certificate_renderer import (
+    cache_rendered,
+    issue_date_for,
+    render_bytes,
+    render_request_for,
+    render_to_cache,
+)
+from app.services.certificate_store import StoredFile, get_certificate_store
 from app import models
-from app.services.email_service import send_certificate_email
+from app.services.email_service import outbox_row
+from app.services.job_progress import JobProgress
+from app.services.stats_service import registrar_certificados
+from app.services.zip_stream import ZipEntry, stream_zip
 
-# Funciones de PDF (AHORA TODAS HTML+CSS+Pyppeteer)
+# Funciones de PDF (ReportLab + plantilla base)
 from app.services.pdf_service import (
-    generate_certificate_pdf,
-    generate_recognition_pdf,
+    CertificateRenderRequest,
+    render_batch,
+    render_certificate,
+    render_print_batch,
 )
 
 from app.models.producto_educativo import TipoProductoEnum
@@ -26,17 +43,102 @@ settings = get_settings()
 
 
 # ============================================================
-# LIMPIAR NOMBRE DE CARPETA
+# FOLIO Y ESCRITURA DEL ARCHIVO
 # ============================================================
-def sanitize_foldername(name: str) -> str:
-    name = re.sub(r"[^\w\s-]", "", name).strip()
-    name = re.sub(r"\s+", "_", name)
-    return name[:100]
+def new_folio() -> str:
+    return f"LANIA-{datetime.now().year}-{uuid.uuid4().hex[:8].upper()}"
+
+
+def write_certificate_file(
+    pdf_bytes: bytes, request: Optional[CertificateRenderRequest] = None
+) -> StoredFile:
+    """
+    Guarda el PDF en el almacenamiento configurado (CertificateStore) y
+    devuelve su llave (lo que se guarda en archivo_path) y su SHA-256.
+    El archivo se escribe antes del commit del certificado: si ese commit falla,
+    el llamador debe hacer rollback y llamar a discard_certificate_file con la
+    llave. Solo una caída del proceso entre ambos pasos deja un archivo sin
+    certificado (inofensivo: ninguna fila lo referencia).
+    Con CERT_RENDER_ON_READ el PDF no se guarda: la llave es None y el archivo
+    solo queda en la caché de render (se regenera desde la BD al descargarlo).
+    """
+    if not pdf_bytes:
+        raise HTTPException(
+            status_code=500, detail="El generador de PDF no devolvió contenido."
+        )
+
+    if settings.CERT_RENDER_ON_READ and request is not None:
+        cache_rendered(request, pdf_bytes)
+        return StoredFile(None, hashlib.sha256(pdf_bytes).hexdigest(), len(pdf_bytes))
+
+    try:
+        return get_certificate_store().save(pdf_bytes)
+    except Exception as e:
+        print(f"Error al guardar PDF: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error al guardar el archivo PDF: {e}"
+        )
+
+
+def discard_certificate_file(db: Session, key: Optional[str]) -> None:
+    """
+    Borra del almacenamiento un PDF que ya no referencia ningún certificado
+    (se eliminó el certificado o la transacción que lo iba a guardar falló).
+    Las llaves son por contenido: si otro certificado usa la misma, se conserva.
+    Se llama después del commit o del rollback.
+    """
+    if not key:
+        return
+    try:
+        compartido = db.query(models.Certificado.id).filter(
+            models.Certificado.archivo_path == key
+        ).first()
+        if not compartido:
+            get_certificate_store().delete(key)
+    except Exception as e:
+        print(f"Error eliminando archivo físico: {e}")
 
 
 # ============================================================
 # GENERADOR DE PDF (Constancia o Reconocimiento)
 # ============================================================
+def build_render_request(
+    folio: str,
+    participant_name: str,
+    course_name: str,
+    tipo_producto: TipoProductoEnum,
+    modalidad: str,
+    course_hours: int,
+    con_competencias: bool,
+    competencias_list: Optional[List[str]] = None,
+    instructor_name: Optional[str] = None,
+    is_docente: bool = False,
+    course_start_date: Optional[date] = None,
+    course_end_date: Optional[date] = None,
+    issue_date: Optional[date] = None,
+) -> CertificateRenderRequest:
+    """
+    Traduce los datos del producto/portador a una solicitud de pdf_service.
+    El reconocimiento de competencias solo aplica a participantes.
+    """
+    usar_competencias = not is_docente and con_competencias and competencias_list
+
+    return CertificateRenderRequest(
+        serial=folio,
+        participant_name=participant_name,
+        course_name=course_name,
+        hours=course_hours,
+        issue_date=issue_date or datetime.now().date(),
+        tipo_producto=tipo_producto,
+        modalidad=modalidad,
+        entity_type="docente" if is_docente else "participante",
+        course_start_date=course_start_date,
+        course_end_date=course_end_date,
+        docente_specialty=instructor_name if is_docente else None,
+        competencies=tuple(competencias_list) if usar_competencias else None,
+    )
+
+
 def generate_certificate(
     participant_name: str,
     course_name: str,
@@ -51,92 +153,280 @@ def generate_certificate(
     # CORRECCIÓN 1: Usar objetos date en lugar de str
     course_start_date: Optional[date] = None,
     course_end_date: Optional[date] = None,
-) -> tuple[str, str]:
+    issue_date: Optional[date] = None,
+) -> tuple[str, StoredFile]:
     """
     Genera el PDF (tradicional o con competencias) usando pdf_service
-    y devuelve (folio, ruta_archivo).
+    y devuelve (folio, archivo guardado).
+    'issue_date' debe ser issue_date_for(fecha_emision) del certificado que se
+    va a guardar, para que el PDF se pueda regenerar igual desde la BD.
     """
+    folio = new_folio()
+
+    request = build_render_request(
+        folio=folio,
+        participant_name=participant_name,
+        course_name=course_name,
+        tipo_producto=tipo_producto,
+        modalidad=modalidad,
+        course_hours=course_hours,
+        con_competencias=con_competencias,
+        competencias_list=competencias_list,
+        instructor_name=instructor_name,
+        is_docente=is_docente,
+        course_start_date=course_start_date,
+        course_end_date=course_end_date,
+        issue_date=issue_date,
+    )
 
-    base_output_dir = Path("certificates")
+    try:
+        pdf_bytes = render_certificate(request)
+    except Exception as e:
+        print(f"Error al generar PDF: {e}")
+        raise HTTPException(status_code=500, detail=f"Error al generar el PDF: {e}")
 
-    course_folder_name = sanitize_foldername(course_name)
-    output_dir = base_output_dir / course_folder_name
-    output_dir.mkdir(parents=True, exist_ok=True)
+    return folio, write_certificate_file(pdf_bytes, request)
 
-    folio = f"LANIA-{datetime.now().year}-{uuid.uuid4().hex[:8].upper()}"
-    file_path = output_dir / f"{folio}.pdf"
 
-    entity_type = "docente" if is_docente else "participante"
-    docente_specialty = instructor_name if is_docente else None
+def generate_certificates_batch(
+    course_name: str,
+    requests: Iterable[CertificateRenderRequest],
+    errors: Optional[list] = None,
+) -> Iterator[tuple[str, StoredFile]]:
+    """
+    Renderiza un lote de solicitudes con pdf_service.render_batch y guarda
+    cada PDF en cuanto se produce. Entrega pares (folio, archivo guardado).
+    El render se reparte en PDF_POOL_SIZE procesos; la escritura del archivo y
+    a la base de datos se queda en el proceso padre.
+    Los fallos de render o de escritura se agregan a 'errors' como (folio, excepción).
+    """
+    if errors is None:
+        errors = []
+
+    requests = list(requests)
+    por_folio = {r.serial: r for r in requests}
+    workers = settings.PDF_POOL_SIZE or os.cpu_count() or 1
+
+    for folio, pdf_bytes in render_batch(
+        requests,
+        errors=errors,
+        workers=workers,
+        chunk_size=settings.PDF_POOL_CHUNK_SIZE,
+    ):
+        try:
+            stored = write_certificate_file(pdf_bytes, por_folio[folio])
+        except Exception as e:
+            errors.append((folio, e))
+            continue
 
-    try:
-        # Fecha de emisión
-        issue_date = datetime.now().date()
-        pdf_bytes: bytes
-
-        # Reconocimiento de competencias (solo participantes, curso educativo y con lista de competencias)
-        if (
-            entity_type == "participante"
-            and con_competencias
-            and tipo_producto == TipoProductoEnum.CURSO_EDUCATIVO
-            and competencias_list
-        ):
-            pdf_bytes = generate_recognition_pdf(
-                participant_name=participant_name,
-                course_name=course_name,
-                hours=course_hours,
-                issue_date=issue_date,
-                serial=folio,
-                qr_token=folio,
-                competencies=competencias_list,
-            )
-        else:
-            # Constancia tradicional (participante o docente)
-            pdf_bytes = generate_certificate_pdf(
-                participant_name=participant_name,
-                course_name=course_name,
-                hours=course_hours,
-                issue_date=issue_date,
-                serial=folio,
-                qr_token=folio,
-                entity_type=entity_type,
-                tipo_producto=tipo_producto,
-                modalidad=modalidad,
-                # CORRECCIÓN 2: Pasar las nuevas fechas como argumentos
-                course_start_date=course_start_date, 
-                course_end_date=course_end_date,
-                # La posición de entity_type, tipo_producto y modalidad se respeta
-                # según la corrección de orden de argumentos hecha en pdf_service.py
-                docente_specialty=docente_specialty,
-            )
+        yield folio, stored
 
-    except Exception as e:
-        print(f"Error al generar PDF: {e}")
-        raise HTTPException(status_code=500, detail=f"Error al generar el PDF: {e}")
 
-    if not pdf_bytes:
-        raise HTTPException(
-            status_code=500, detail="El generador de PDF no devolvió contenido."
+# ============================================================
+# CONSOLIDAR ESTADÍSTICAS DE VARIOS LOTES
+# ============================================================
+def merge_bulk_stats(resultados: Iterable[dict]) -> dict:
+    """
+    Suma los diccionarios de estadísticas que devuelve emitir_y_enviar_masivamente
+    para cada lote de un mismo producto (mismo formato que una corrida completa).
+    """
+    merged: dict = {}
+    for parcial in resultados:
+        if not merged:
+            merged = {
+                "producto_id": parcial["producto_id"],
+                "producto_nombre": parcial["producto_nombre"],
+                "con_competencias": parcial["con_competencias"],
+                "participantes": {"total": 0, "emitidos_nuevos": 0, "reenviados": 0, "ya_procesados": 0, "errores": []},
+                "docentes": {"total": 0, "emitidos_nuevos": 0, "reenviados": 0, "ya_procesados": 0, "errores": []},
+            }
+        for grupo in ("participantes", "docentes"):
+            for clave in ("total", "emitidos_nuevos", "reenviados", "ya_procesados"):
+                merged[grupo][clave] += parcial[grupo].get(clave, 0)
+            merged[grupo]["errores"].extend(parcial[grupo]["errores"])
+    return merged
+
+
+# ============================================================
+# HASH Y ENTREGA DEL PDF
+# ============================================================
+def ensure_archivo_sha256(db: Session, certificado: models.Certificado) -> str:
+    """
+    Devuelve el SHA-256 del PDF del certificado. Los emitidos antes de existir
+    la columna lo calculan y guardan la primera vez que se sirven.
+    """
+    digest = certificado.archivo_sha256
+    if not digest:
+        digest = get_certificate_store().sha256(certificado.archivo_path)
+        certificado.archivo_sha256 = digest
+        db.commit()
+    return digest
+
+
+def certificate_file_response(
+    request: Request,
+    db: Session,
+    certificado: models.Certificado,
+    filename: str,
+    public: bool = True,
+) -> Response:
+    """
+    Respuesta HTTP con el PDF del certificado, sea cual sea el almacenamiento.
+    En disco se sirve con cached_file_response (ETag, 304, Range); en S3 se
+    responde 304 aquí o se redirige a una URL firmada del bucket.
+    Sin archivo_path (emitido con CERT_RENDER_ON_READ) el PDF se regenera desde
+    la BD y se sirve desde la caché de render. Sus bytes cambian si se corrige
+    un dato, así que se sirve con un max-age corto y solo con ETag: sin
+    Last-Modified, un If-Modified-Since no puede validar una versión anterior.
+    """
+    if not certificado.archivo_path:
+        path, digest = render_to_cache(certificado)
+        return cached_file_response(
+            request, path, digest, filename=filename, public=public,
+            max_age=settings.CERT_RENDER_HTTP_MAX_AGE_SECONDS,
         )
 
-    try:
-        with open(file_path, "wb") as f:
-            f.write(pdf_bytes)
-    except Exception as e:
-        print(f"Error al guardar PDF: {e}")
-        raise HTTPException(
-            status_code=500, detail=f"Error al guardar el archivo PDF: {e}"
+    store = get_certificate_store()
+    key = certificado.archivo_path
+    if not store.exists(key):
+        raise HTTPException(status_code=404, detail="Archivo PDF no encontrado")
+
+    digest = ensure_archivo_sha256(db, certificado)
+    last_modified = certificado.fecha_emision
+
+    path = store.local_path(key)
+    if path:
+        return cached_file_response(
+            request, path, digest, filename=filename, last_modified=last_modified, public=public,
         )
 
-    return folio, str(file_path)
+    etag = strong_etag(digest)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers={"ETag": etag})
+    # La URL firmada caduca: la redirección no se guarda en caché
+    return RedirectResponse(
+        store.url(key, filename), status_code=307, headers={"Cache-Control": "no-store"},
+    )
+
+
+def certificate_pdf_bytes(certificado: models.Certificado) -> bytes:
+    """Contenido del PDF del certificado (guardado o regenerado desde la BD)."""
+    if not certificado.archivo_path:
+        path, _ = render_to_cache(certificado)
+        with open(path, "rb") as f:
+            return f.read()
+
+    store = get_certificate_store()
+    if not store.exists(certificado.archivo_path):
+        raise HTTPException(404, "PDF no encontrado en el servidor")
+    return store.read_bytes(certificado.archivo_path)
+
+
+# ============================================================
+# EXPORTACIÓN ZIP DE LOS CERTIFICADOS DE UN PRODUCTO
+# ============================================================
+ZIP_READ_CHUNK_SIZE = 64 * 1024
+
+
+def _nombre_en_zip(certificado: models.Certificado) -> str:
+    carpeta = "docentes" if certificado.docente_id is not None else "participantes"
+    nombre = re.sub(r"[^\w\-]+", "_", _nombre_portador(certificado)).strip("_") or "certificado"
+    return f"{carpeta}/{nombre}_{certificado.folio}.pdf"
+
+
+def _fecha_zip(fecha: Optional[datetime]) -> tuple:
+    # El formato ZIP no admite fechas anteriores a 1980
+    if fecha is None:
+        return (1980, 1, 1, 0, 0, 0)
+    if fecha.tzinfo is not None:
+        fecha = fecha.astimezone()
+    return tuple(fecha.timetuple()[:6])
+
+
+def _leer_por_bloques(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        for bloque in iter(lambda: f.read(ZIP_READ_CHUNK_SIZE), b""):
+            yield bloque
+
+
+def certificate_zip_stream(
+    certificados: List[models.Certificado], render_missing: bool = True
+) -> Iterator[bytes]:
+    """
+    ZIP (STORED) con los PDF de los certificados, generado mientras se envía.
+    Los datos de la BD se leen aquí, antes de empezar a transmitir; el
+    generador solo lee del almacenamiento, así que no depende de la sesión.
+    Los certificados sin archivo (o cuyo archivo ya no existe) se regeneran
+    desde la BD con 'render_missing'; los que no se pudieron incluir se
+    listan en FALTANTES.txt al final del ZIP.
+    """
+    plan = [
+        (
+            _nombre_en_zip(c),
+            _fecha_zip(c.fecha_emision),
+            c.folio,
+            c.archivo_path,
+            render_request_for(c),
+        )
+        for c in certificados
+    ]
+    return stream_zip(_entradas_zip(plan, render_missing))
+
+
+def _entradas_zip(plan: list, render_missing: bool) -> Iterator[ZipEntry]:
+    store = get_certificate_store()
+    faltantes: list[str] = []
+
+    for nombre, fecha, folio, key, request in plan:
+        try:
+            if key and store.exists(key):
+                path = store.local_path(key)
+                chunks = _leer_por_bloques(path) if path else [store.read_bytes(key)]
+            elif render_missing:
+                chunks = [render_bytes(request)]
+            else:
+                faltantes.append(f"{folio}\tarchivo no encontrado")
+                continue
+        except Exception as e:
+            faltantes.append(f"{folio}\t{e}")
+            continue
+        yield ZipEntry(nombre, fecha, chunks)
+
+    if faltantes:
+        contenido = "\n".join(faltantes) + "\n"
+        yield ZipEntry("FALTANTES.txt", _fecha_zip(datetime.now()), [contenido.encode()])
+
+
+# ============================================================
+# PDF DE IMPRESIÓN (TODAS LAS CONSTANCIAS DEL PRODUCTO)
+# ============================================================
+def _nombre_portador(certificado: models.Certificado) -> str:
+    if certificado.docente_id is not None:
+        return certificado.docente.nombre_completo
+    return certificado.inscripcion.participante.nombre_completo
+
+
+def certificate_print_batch(certificados: List[models.Certificado]) -> bytes:
+    """
+    Un solo PDF con una página por certificado, regenerado desde la BD con la
+    plantilla compartida (render_print_batch). Primero participantes y luego
+    docentes, cada grupo en orden alfabético, para la entrega en ceremonia.
+    """
+    ordenados = sorted(
+        certificados,
+        key=lambda c: (c.docente_id is not None, _nombre_portador(c).casefold(), c.folio),
+    )
+    return render_print_batch(render_request_for(c) for c in ordenados)
 
 
 # ============================================================
 # SERVICIO PRINCIPAL DE CERTIFICADOS
 # ============================================================
 class CertificateService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, progress: Optional[JobProgress] = None):
         self.db = db
+        # Contadores de avance publicados en Redis (no-op fuera de un job de Celery)
+        self.progress = progress or JobProgress(None)
 
     # ------------------------------------------------------------
     # Extraer lista de competencias desde DB
@@ -159,18 +449,29 @@ class CertificateService:
         self,
         producto_id: int,
         con_competencias: bool = False,
+        inscripcion_ids: Optional[List[int]] = None,
+        incluir_docentes: bool = True,
     ) -> dict:
+        """
+        Emite y encola el correo de las constancias del producto.
+        Con 'inscripcion_ids' solo se procesan esas inscripciones y con
+        incluir_docentes=False se omiten los docentes; así la tarea de Celery
+        reparte un producto grande en lotes independientes.
+        """
         # ============================================================
         # 1. Cargar producto
         # ============================================================
-        producto: models.ProductoEducativo | None = (
-            self.db.query(models.ProductoEducativo)
-            .options(
+        opciones = [selectinload(models.ProductoEducativo.docentes)] if incluir_docentes else []
+        if inscripcion_ids is None:
+            opciones.append(
                 selectinload(models.ProductoEducativo.inscripciones).selectinload(
                     models.Inscripcion.participante
-                ),
-                selectinload(models.ProductoEducativo.docentes),
+                )
             )
+
+        producto: models.ProductoEducativo | None = (
+            self.db.query(models.ProductoEducativo)
+            .options(*opciones)
             .filter(models.ProductoEducativo.id == producto_id)
             .first()
         )
@@ -178,35 +479,183 @@ class CertificateService:
         if not producto:
             raise RuntimeError(f"ProductoEducativo id={producto_id} no encontrado")
 
+        if inscripcion_ids is None:
+            inscripciones = list(producto.inscripciones or [])
+        elif inscripcion_ids:
+            inscripciones = (
+                self.db.query(models.Inscripcion)
+                .options(selectinload(models.Inscripcion.participante))
+                .filter(
+                    models.Inscripcion.producto_educativo_id == producto_id,
+                    models.Inscripcion.id.in_(inscripcion_ids),
+                )
+                .order_by(models.Inscripcion.id)
+                .all()
+            )
+        else:
+            inscripciones = []
+
+        docentes = list(producto.docentes or []) if incluir_docentes else []
+
         competencias_list = (
             self._parse_competencias(producto) if con_competencias else []
         )
 
+        modalidad = (
+            producto.modalidad.value if producto.modalidad else "No especificada"
+        )
+        # Un solo instante para todo el lote (UTC, como la emisión individual):
+        # la fecha impresa sale de fecha_emision
+        emitido_en = datetime.now(timezone.utc)
+
         stats = {
             "producto_id": producto_id,
             "producto_nombre": producto.nombre,
             "con_competencias": con_competencias,
             "participantes": {
-                "total": len(producto.inscripciones or []),
+                "total": len(inscripciones),
                 "emitidos_nuevos": 0,
                 "reenviados": 0,
+                # Ya resueltos por un intento anterior del mismo job (checkpoint)
+                "ya_procesados": 0,
                 "errores": [],
             },
             "docentes": {
-                "total": len(producto.docentes or []),
+                "total": len(docentes),
                 "emitidos_nuevos": 0,
                 "reenviados": 0,
+                # Ya resueltos por un intento anterior del mismo job (checkpoint)
+                "ya_procesados": 0,
                 "errores": [],
             },
         }
 
+        # Los correos no se envían aquí: cada certificado deja su correo en la
+        # bandeja de salida (email_outbox) dentro de la misma transacción, y el
+        # worker de correos los envía con reintentos sin frenar la emisión.
+        existentes = self._indexar_certificados_existentes(
+            producto.id, inscripcion_ids, incluir_docentes
+        )
+        completados = self._cargar_checkpoints()
+
+        self._emitir_participantes(
+            producto, inscripciones, con_competencias, competencias_list, modalidad,
+            emitido_en, stats, existentes, completados,
+        )
+        self._emitir_docentes(
+            producto, docentes, modalidad, emitido_en, stats, existentes, completados
+        )
+
+        return stats
+
+    # ------------------------------------------------------------
+    # Certificados ya emitidos del producto (una sola consulta)
+    # ------------------------------------------------------------
+    def _indexar_certificados_existentes(
+        self,
+        producto_id: int,
+        inscripcion_ids: Optional[List[int]] = None,
+        incluir_docentes: bool = True,
+    ) -> dict:
+        """
+        Carga de una vez los certificados del producto que puede usar esta
+        corrida y los indexa por ("inscripcion", inscripcion_id, con_competencias)
+        y ("docente", docente_id), en lugar de consultar la BD por cada
+        participante y docente. En un lote del chord solo se cargan los de sus
+        inscripciones (y los de docentes si el lote los incluye).
+        """
+        condiciones = []
+        if inscripcion_ids is None:
+            condiciones.append(models.Certificado.inscripcion_id.isnot(None))
+        elif inscripcion_ids:
+            condiciones.append(models.Certificado.inscripcion_id.in_(inscripcion_ids))
+        if incluir_docentes:
+            condiciones.append(models.Certificado.docente_id.isnot(None))
+        if not condiciones:
+            return {}
+
+        indice: dict = {}
+        certificados = (
+            self.db.query(models.Certificado)
+            .filter(
+                models.Certificado.producto_educativo_id == producto_id,
+                or_(*condiciones),
+            )
+            .order_by(models.Certificado.id)
+            .all()
+        )
+        for cert in certificados:
+            if cert.inscripcion_id is not None:
+                indice.setdefault(
+                    ("inscripcion", cert.inscripcion_id, bool(cert.con_competencias)), cert
+                )
+            # Los docentes solo reciben constancia tradicional
+            if cert.docente_id is not None and not cert.con_competencias:
+                indice.setdefault(("docente", cert.docente_id), cert)
+        return indice
+
+    # ------------------------------------------------------------
+    # Checkpoints del job (reanudar sin repetir trabajo)
+    # ------------------------------------------------------------
+    def _cargar_checkpoints(self) -> set:
+        """
+        Destinatarios que este mismo job ya resolvió en un intento anterior.
+        El checkpoint es la fila de email_outbox con el job_id: se guarda en la
+        misma transacción que el certificado, así que su existencia garantiza
+        que el certificado quedó emitido y su correo encolado (el envío y su
+        fecha quedan en estado/fecha_envio de la misma fila).
+        Devuelve {("inscripcion", id), ("docente", id)}.
+        """
+        job_id = self.progress.job_id
+        if not job_id:
+            return set()
+
+        filas = (
+            self.db.query(models.Certificado.inscripcion_id, models.Certificado.docente_id)
+            .join(models.EmailOutbox, models.EmailOutbox.certificado_id == models.Certificado.id)
+            .filter(models.EmailOutbox.job_id == job_id)
+            .all()
+        )
+        completados = set()
+        for inscripcion_id, docente_id in filas:
+            if inscripcion_id is not None:
+                completados.add(("inscripcion", inscripcion_id))
+            if docente_id is not None:
+                completados.add(("docente", docente_id))
+        return completados
+
+    def _emitir_participantes(
+        self,
+        producto: models.ProductoEducativo,
+        inscripciones: list[models.Inscripcion],
+        con_competencias: bool,
+        competencias_list: list[str],
+        modalidad: str,
+        emitido_en: datetime,
+        stats: dict,
+        existentes: dict,
+        completados: set,
+    ) -> None:
         # ============================================================
         # 2. PROCESAR PARTICIPANTES
         # ============================================================
-        for inscripcion in producto.inscripciones or []:
+        # folio -> (inscripcion, participante, email) de los que hay que emitir
+        pendientes: dict[str, tuple] = {}
+        solicitudes: list[CertificateRenderRequest] = []
+        reenvios: list[dict] = []
+        # Destinatarios con error, para el conjunto de fallos del job
+        fallidos: list[str] = []
+
+        for inscripcion in inscripciones:
+            if ("inscripcion", inscripcion.id) in completados:
+                stats["participantes"]["ya_procesados"] += 1
+                continue
+
+            destinatario = f"inscripcion:{inscripcion.id}"
             participante = inscripcion.participante
             if not participante:
                 stats["participantes"]["errores"].append("Inscripción sin participante.")
+                fallidos.append(destinatario)
                 continue
 
             email = participante.email_personal
@@ -214,185 +663,294 @@ class CertificateService:
                 stats["participantes"]["errores"].append(
                     f"Participante {participante.id} sin correo personal."
                 )
+                fallidos.append(destinatario)
                 continue
 
-            existing = (
-                self.db.query(models.Certificado)
-                .filter(
-                    models.Certificado.inscripcion_id == inscripcion.id,
-                    models.Certificado.con_competencias == con_competencias,
-                )
-                .first()
-            )
-
-            certificado = existing
+            existing = existentes.get(("inscripcion", inscripcion.id, con_competencias))
 
             # ---------------------------------------------------------
-            # 2.1 Emitir si no existe
+            # 2.1 Ya emitido: solo se vuelve a encolar el correo
             # ---------------------------------------------------------
-            if not existing:
-                try:
-                    instructor_name = (
-                        producto.docentes[0].nombre_completo
-                        if producto.docentes
-                        else "Equipo LANIA"
-                    )
-
-                    folio, path = generate_certificate(
-                        participant_name=participante.nombre_completo,
-                        course_name=producto.nombre,
-                        tipo_producto=producto.tipo_producto,
-                        modalidad=producto.modalidad.value
-                        if producto.modalidad
-                        else "No especificada",
-                        course_hours=producto.horas,
-                        con_competencias=con_competencias,
-                        competencias_list=competencias_list
-                        if con_competencias
-                        else None,
-                        instructor_name=instructor_name,
-                        is_docente=False,
-                        # No se pasan fechas aquí para participantes
-                        # course_start_date=None, 
-                        # course_end_date=None,
-                    )
-
-                    certificado = models.Certificado(
-                        inscripcion_id=inscripcion.id,
-                        producto_educativo_id=producto.id,
-                        archivo_path=path,
-                        folio=folio,
-                        fecha_emision=datetime.now(),
-                        con_competencias=con_competencias,
-                    )
-
-                    self.db.add(certificado)
-                    self.db.commit()
-                    self.db.refresh(certificado)
-
-                    stats["participantes"]["emitidos_nuevos"] += 1
-
-                except Exception as e:
-                    self.db.rollback()
-                    stats["participantes"]["errores"].append(
-                        f"Error emitiendo para {participante.nombre_completo}: {e}"
-                    )
-                    continue
-
-            # ---------------------------------------------------------
-            # 2.2 Enviar correo
-            # ---------------------------------------------------------
-            try:
-                pdf_bytes = Path(certificado.archivo_path).read_bytes()
+            if existing:
+                reenvios.append({
+                    "nombre": participante.nombre_completo,
+                    "destinatario": destinatario,
+                    "correo": outbox_row(
+                        existing.id, email, participante.nombre_completo, producto.nombre,
+                        job_id=self.progress.job_id,
+                    ),
+                })
+                continue
 
-                send_certificate_email(
-                    recipient_email=email,
-                    recipient_name=participante.nombre_completo,
+            folio = new_folio()
+            pendientes[folio] = (inscripcion, participante, email)
+            solicitudes.append(
+                build_render_request(
+                    folio=folio,
+                    participant_name=participante.nombre_completo,
                     course_name=producto.nombre,
-                    pdf_content=pdf_bytes,
-                    serial=certificado.folio,
+                    tipo_producto=producto.tipo_producto,
+                    modalidad=modalidad,
+                    course_hours=producto.horas,
+                    con_competencias=con_competencias,
+                    competencias_list=competencias_list if con_competencias else None,
+                    is_docente=False,
+                    issue_date=issue_date_for(emitido_en),
                 )
+            )
 
-                if existing:
-                    stats["participantes"]["reenviados"] += 1
+        self.progress.fail(fallidos)
 
-            except Exception as e:
-                stats["participantes"]["errores"].append(
-                    f"Error enviando correo a {participante.nombre_completo}: {e}"
+        self._guardar_filas(
+            reenvios, stats["participantes"], "reenviados",
+            "Error enviando correo a {nombre}: {error}",
+        )
+
+        # ---------------------------------------------------------
+        # 2.2 Emitir en lote los que no existen y encolar su correo
+        # ---------------------------------------------------------
+        errores_render: list = []
+        filas: list[dict] = []
+
+        for folio, stored in generate_certificates_batch(
+            producto.nombre, solicitudes, errores_render
+        ):
+            inscripcion, participante, email = pendientes[folio]
+
+            filas.append({
+                "nombre": participante.nombre_completo,
+                "destinatario": f"inscripcion:{inscripcion.id}",
+                "certificado": {
+                    "inscripcion_id": inscripcion.id,
+                    "producto_educativo_id": producto.id,
+                    "archivo_path": stored.key,
+                    "archivo_sha256": stored.sha256,
+                    "folio": folio,
+                    "fecha_emision": emitido_en,
+                    "con_competencias": con_competencias,
+                },
+                "correo": outbox_row(
+                    None, email, participante.nombre_completo, producto.nombre,
+                    job_id=self.progress.job_id,
+                ),
+            })
+
+            if len(filas) >= settings.CERT_COMMIT_BATCH_SIZE:
+                self._guardar_filas(
+                    filas, stats["participantes"], "emitidos_nuevos",
+                    "Error emitiendo para {nombre}: {error}",
                 )
+                filas = []
+
+        self._guardar_filas(
+            filas, stats["participantes"], "emitidos_nuevos",
+            "Error emitiendo para {nombre}: {error}",
+        )
 
+        self.progress.fail(f"inscripcion:{pendientes[folio][0].id}" for folio, _ in errores_render)
+        for folio, e in errores_render:
+            participante = pendientes[folio][1]
+            stats["participantes"]["errores"].append(
+                f"Error emitiendo para {participante.nombre_completo}: {e}"
+            )
+
+    def _emitir_docentes(
+        self,
+        producto: models.ProductoEducativo,
+        docentes: list[models.Docente],
+        modalidad: str,
+        emitido_en: datetime,
+        stats: dict,
+        existentes: dict,
+        completados: set,
+    ) -> None:
         # ============================================================
         # 3. PROCESAR DOCENTES (solo constancia tradicional)
         # ============================================================
-        for docente in producto.docentes or []:
+        pendientes_doc: dict[str, tuple] = {}
+        solicitudes_doc: list[CertificateRenderRequest] = []
+        reenvios: list[dict] = []
+        fallidos: list[str] = []
+
+        for docente in docentes:
+            if ("docente", docente.id) in completados:
+                stats["docentes"]["ya_procesados"] += 1
+                continue
+
             email = docente.email_institucional or docente.email_personal
             if not email:
                 stats["docentes"]["errores"].append(
                     f"Docente {docente.nombre_completo} sin email."
                 )
+                fallidos.append(f"docente:{docente.id}")
                 continue
 
-            existing = (
-                self.db.query(models.Certificado)
-                .filter(
-                    models.Certificado.docente_id == docente.id,
-                    models.Certificado.producto_educativo_id == producto.id,
-                    models.Certificado.con_competencias == False,
-                )
-                .first()
-            )
-
-            certificado_doc = existing
+            existing = existentes.get(("docente", docente.id))
 
             # ---------------------------------------------------------
-            # 3.1 Emitir si no existe
+            # 3.1 Ya emitido: solo se vuelve a encolar el correo
             # ---------------------------------------------------------
-            if not existing:
-                try:
-                    # CORRECCIÓN 3: Eliminada la lógica de 'course_date_str'
-
-                    folio, path = generate_certificate(
-                        participant_name=docente.nombre_completo,
-                        course_name=producto.nombre,
-                        tipo_producto=producto.tipo_producto,
-                        modalidad=producto.modalidad.value
-                        if producto.modalidad
-                        else "No especificada",
-                        course_hours=producto.horas,
-                        con_competencias=False,
-                        competencias_list=None,
-                        instructor_name=docente.especialidad,
-                        is_docente=True,
-                        # CORRECCIÓN 4: Pasar directamente los objetos date (o None)
-                        course_start_date=producto.fecha_inicio,
-                        course_end_date=producto.fecha_fin,
-                    )
-
-                    certificado_doc = models.Certificado(
-                        docente_id=docente.id,
-                        producto_educativo_id=producto.id,
-                        archivo_path=path,
-                        folio=folio,
-                        fecha_emision=datetime.now(),
-                        con_competencias=False,
-                    )
-
-                    self.db.add(certificado_doc)
-                    self.db.commit()
-                    self.db.refresh(certificado_doc)
-
-                    stats["docentes"]["emitidos_nuevos"] += 1
-
-                except Exception as e:
-                    self.db.rollback()
-                    stats["docentes"]["errores"].append(
-                        f"Error emitiendo constancia a {docente.nombre_completo}: {e}"
-                    )
-                    continue
-
-            # ---------------------------------------------------------
-            # 3.2 Enviar correo
-            # ---------------------------------------------------------
-            try:
-                pdf_bytes = Path(certificado_doc.archivo_path).read_bytes()
+            if existing:
+                reenvios.append({
+                    "nombre": docente.nombre_completo,
+                    "destinatario": f"docente:{docente.id}",
+                    "correo": outbox_row(
+                        existing.id, email, docente.nombre_completo, producto.nombre,
+                        job_id=self.progress.job_id,
+                    ),
+                })
+                continue
 
-                send_certificate_email(
-                    recipient_email=email,
-                    recipient_name=docente.nombre_completo,
+            folio = new_folio()
+            pendientes_doc[folio] = (docente, email)
+            solicitudes_doc.append(
+                build_render_request(
+                    folio=folio,
+                    participant_name=docente.nombre_completo,
                     course_name=producto.nombre,
-                    pdf_content=pdf_bytes,
-                    serial=certificado_doc.folio,
+                    tipo_producto=producto.tipo_producto,
+                    modalidad=modalidad,
+                    course_hours=producto.horas,
+                    con_competencias=False,
+                    competencias_list=None,
+                    instructor_name=docente.especialidad,
+                    is_docente=True,
+                    course_start_date=producto.fecha_inicio,
+                    course_end_date=producto.fecha_fin,
+                    issue_date=issue_date_for(emitido_en),
                 )
+            )
 
-                if existing:
-                    stats["docentes"]["reenviados"] += 1
+        self.progress.fail(fallidos)
 
-            except Exception as e:
-                stats["docentes"]["errores"].append(
-                    f"Error enviando email a docente {docente.nombre_completo}: {e}"
+        self._guardar_filas(
+            reenvios, stats["docentes"], "reenviados",
+            "Error enviando email a docente {nombre}: {error}",
+        )
+
+        # ---------------------------------------------------------
+        # 3.2 Emitir en lote los que no existen y encolar su correo
+        # ---------------------------------------------------------
+        errores_render_doc: list = []
+        filas: list[dict] = []
+
+        for folio, stored in generate_certificates_batch(
+            producto.nombre, solicitudes_doc, errores_render_doc
+        ):
+            docente, email = pendientes_doc[folio]
+
+            filas.append({
+                "nombre": docente.nombre_completo,
+                "destinatario": f"docente:{docente.id}",
+                "certificado": {
+                    "docente_id": docente.id,
+                    "producto_educativo_id": producto.id,
+                    "archivo_path": stored.key,
+                    "archivo_sha256": stored.sha256,
+                    "folio": folio,
+                    "fecha_emision": emitido_en,
+                    "con_competencias": False,
+                },
+                "correo": outbox_row(
+                    None, email, docente.nombre_completo, producto.nombre,
+                    job_id=self.progress.job_id,
+                ),
+            })
+
+            if len(filas) >= settings.CERT_COMMIT_BATCH_SIZE:
+                self._guardar_filas(
+                    filas, stats["docentes"], "emitidos_nuevos",
+                    "Error emitiendo constancia a {nombre}: {error}",
                 )
+                filas = []
 
-        # ============================================================
-        # 4. RETORNAR RESULTADOS
-        # ============================================================
-        return stats
\ No newline at end of file
+        self._guardar_filas(
+            filas, stats["docentes"], "emitidos_nuevos",
+            "Error emitiendo constancia a {nombre}: {error}",
+        )
+
+        self.progress.fail(f"docente:{pendientes_doc[folio][0].id}" for folio, _ in errores_render_doc)
+        for folio, e in errores_render_doc:
+            docente = pendientes_doc[folio][0]
+            stats["docentes"]["errores"].append(
+                f"Error emitiendo constancia a {docente.nombre_completo}: {e}"
+            )
+
+    # ------------------------------------------------------------
+    # Inserción por lotes de certificados y correos
+    # ------------------------------------------------------------
+    def _insertar_filas(self, filas: list[dict]) -> None:
+        """
+        Inserta con un solo INSERT ... RETURNING los certificados del lote y
+        después sus filas de email_outbox. Las filas sin "certificado" (reenvíos)
+        ya traen el certificado_id.
+        """
+        nuevos = [f["certificado"] for f in filas if "certificado" in f]
+        ids_por_folio = {}
+        if nuevos:
+            ids_por_folio = dict(
+                self.db.execute(
+                    insert(models.Certificado).returning(
+                        models.Certificado.folio, models.Certificado.id
+                    ),
+                    nuevos,
+                ).all()
+            )
+            registrar_certificados(self.db, nuevos)
+
+        correos = []
+        for fila in filas:
+            correo = dict(fila["correo"])
+            if "certificado" in fila:
+                correo["certificado_id"] = ids_por_folio[fila["certificado"]["folio"]]
+            correos.append(correo)
+        self.db.execute(insert(models.EmailOutbox), correos)
+
+    def _guardar_filas(
+        self,
+        filas: list[dict],
+        grupo: dict,
+        contador: str,
+        mensaje_error: str,
+    ) -> None:
+        """
+        Guarda el lote en una sola transacción. Si algo falla, se reintenta fila
+        por fila con un SAVEPOINT cada una, para que un registro inválido no
+        deshaga a los demás; las estadísticas se actualizan solo con lo guardado.
+        """
+        if not filas:
+            return
+
+        # Progreso: los certificados nuevos cuentan como 'committed', los reenvíos como 'resent'
+        campo = "committed" if contador == "emitidos_nuevos" else "resent"
+        renderizados = sum(1 for f in filas if "certificado" in f)
+
+        try:
+            self._insertar_filas(filas)
+            self.db.commit()
+            grupo[contador] += len(filas)
+            self.progress.incr(rendered=renderizados, **{campo: len(filas)})
+            self.progress.resolve(f["destinatario"] for f in filas)
+            return
+        except Exception:
+            self.db.rollback()
+
+        guardados, fallidos, descartados = [], [], []
+        for fila in filas:
+            try:
+                with self.db.begin_nested():
+                    self._insertar_filas([fila])
+                grupo[contador] += 1
+                guardados.append(fila["destinatario"])
+            except Exception as e:
+                grupo["errores"].append(mensaje_error.format(nombre=fila["nombre"], error=e))
+                fallidos.append(fila["destinatario"])
+                if "certificado" in fila:
+                    descartados.append(fila["certificado"]["archivo_path"])
+        self.db.commit()
+        # El PDF de un certificado que no se guardó no debe quedar huérfano
+        for key in descartados:
+            discard_certificate_file(self.db, key)
+        self.progress.incr(rendered=renderizados, **{campo: len(guardados)})
+        self.progress.resolve(guardados)
+        self.progress.fail(fallidos)
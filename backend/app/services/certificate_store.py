@@ -0,0 +1,235 @@
+# backend/app/services/certificate_store.py
+
+import hashlib
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Las llaves nuevas se derivan del contenido: sha256/ab/cd/<sha256>.pdf
+# (dos niveles de 256 carpetas; renombrar un curso ya no mueve archivos).
+# Cualquier otra llave es una ruta heredada: certificates/<curso>/<folio>.pdf
+CONTENT_PREFIX = "sha256/"
+
+
+class StoredFile(NamedTuple):
+    # None si el PDF no se guardó (CERT_RENDER_ON_READ: se regenera al leerlo)
+    key: Optional[str]
+    sha256: str
+    size: int
+
+
+def content_key(digest: str) -> str:
+    return f"{CONTENT_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}.pdf"
+
+
+def is_content_key(key: str) -> bool:
+    return key.startswith(CONTENT_PREFIX)
+
+
+# ============================================================
+# INTERFAZ
+# ============================================================
+class CertificateStore(ABC):
+    """
+    Almacenamiento de los PDF emitidos. El valor de Certificado.archivo_path es
+    la llave que devuelve save(); todo acceso al archivo pasa por aquí.
+    """
+
+    @abstractmethod
+    def save(self, pdf_bytes: bytes) -> StoredFile:
+        """Guarda el PDF de forma atómica y devuelve su llave y SHA-256."""
+
+    @abstractmethod
+    def read_bytes(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Ruta en disco si el archivo es local (se sirve con FileResponse/sendfile)."""
+        return None
+
+    def url(self, key: str, filename: str) -> Optional[str]:
+        """URL temporal de descarga directa, para almacenamientos remotos."""
+        return None
+
+    def sha256(self, key: str) -> str:
+        # En las llaves nuevas el hash es parte del nombre
+        if is_content_key(key):
+            return Path(key).stem
+        return hashlib.sha256(self.read_bytes(key)).hexdigest()
+
+
+# ============================================================
+# DISCO LOCAL
+# ============================================================
+class LocalCertificateStore(CertificateStore):
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        if is_content_key(key):
+            return self.root / key
+        # Ruta heredada, relativa al directorio de trabajo como antes
+        return Path(key)
+
+    def save(self, pdf_bytes: bytes) -> StoredFile:
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        key = content_key(digest)
+        path = self._path(key)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Se escribe a un temporal en la misma carpeta y se renombra:
+            # un lector nunca ve un PDF a medio escribir
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(pdf_bytes)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+
+        return StoredFile(key, digest, len(pdf_bytes))
+
+    def read_bytes(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return str(self._path(key))
+
+
+# ============================================================
+# S3 / COMPATIBLE (MinIO, etc.)
+# ============================================================
+def _is_not_found(error: Exception) -> bool:
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+class S3CertificateStore(CertificateStore):
+    """
+    Bucket S3 o compatible. 'client' permite inyectar un cliente con la misma
+    API de boto3 (por ejemplo un MinIO local o un doble en memoria); si no se
+    pasa, se crea uno con boto3 (dependencia opcional).
+    Las rutas heredadas siguen leyéndose del disco local.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client=None,
+        legacy: Optional[LocalCertificateStore] = None,
+        **client_kwargs,
+    ):
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise RuntimeError(
+                    "CERT_STORAGE_BACKEND='s3' requiere el paquete 'boto3'."
+                ) from e
+            client = boto3.client("s3", **{k: v for k, v in client_kwargs.items() if v})
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.legacy = legacy or LocalCertificateStore(settings.CERT_STORAGE_ROOT)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def save(self, pdf_bytes: bytes) -> StoredFile:
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        key = content_key(digest)
+        # PUT es atómico en S3: el objeto aparece completo o no aparece
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Body=pdf_bytes,
+            ContentType="application/pdf",
+            Metadata={"sha256": digest},
+        )
+        return StoredFile(key, digest, len(pdf_bytes))
+
+    def read_bytes(self, key: str) -> bytes:
+        if not is_content_key(key):
+            return self.legacy.read_bytes(key)
+        return self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))["Body"].read()
+
+    def exists(self, key: str) -> bool:
+        if not is_content_key(key):
+            return self.legacy.exists(key)
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except Exception as e:
+            if _is_not_found(e):
+                return False
+            raise
+
+    def delete(self, key: str) -> None:
+        if not is_content_key(key):
+            self.legacy.delete(key)
+            return
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None if is_content_key(key) else self.legacy.local_path(key)
+
+    def url(self, key: str, filename: str) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._object_key(key),
+                "ResponseContentType": "application/pdf",
+                "ResponseContentDisposition": f'attachment; filename="{filename}"',
+            },
+            ExpiresIn=settings.S3_PRESIGNED_URL_SECONDS,
+        )
+
+
+# ============================================================
+# INSTANCIA SEGÚN CONFIGURACIÓN
+# ============================================================
+@lru_cache()
+def get_certificate_store() -> CertificateStore:
+    if settings.CERT_STORAGE_BACKEND == "s3":
+        return S3CertificateStore(
+            bucket=settings.S3_BUCKET,
+            prefix=settings.S3_PREFIX,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=(
+                settings.S3_SECRET_ACCESS_KEY.get_secret_value()
+                if settings.S3_SECRET_ACCESS_KEY else None
+            ),
+        )
+    return LocalCertificateStore(settings.CERT_STORAGE_ROOT)
@@ -1,51 +1,265 @@
 import smtplib
+import threading
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
 import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, List, Optional, Tuple
 
+from sqlalchemy.orm import Session, selectinload
+
+from app import models
 from app.core.config import get_settings
+from app.models.enums import EstadoCorreoEnum
+from app.services.certificate_renderer import render_bytes, render_request_for
+from app.services.certificate_store import get_certificate_store
+from app.services.pdf_service import CertificateRenderRequest
+from app.services.job_progress import JobProgress
+from app.services.stats_service import registrar_correos
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
-def _send_message_via_smtp(msg: MIMEMultipart, recipient_email: str, subject: str):
-    """Función helper para manejar la conexión y el envío SMTP."""
+
+def _check_smtp_settings():
     if not all([settings.SMTP_SERVER, settings.SMTP_PORT, settings.SMTP_LOGIN, settings.SMTP_PASSWORD, settings.SMTP_SENDER_EMAIL]):
         logger.error("Faltan variables de entorno SMTP. No se puede enviar el correo.")
         raise ValueError("Configuración de SMTP incompleta.")
-    try:
-        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT)
-        server.starttls()  
+
+
+# ----------------------------------------------------------------------------------
+# POOL DE SESIONES SMTP
+# ----------------------------------------------------------------------------------
+
+# Errores que indican que la sesión se cayó: se reconecta y se reintenta una vez
+_SMTP_CONNECTION_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    TimeoutError,
+)
+# Errores del mensaje/destinatario: la sesión sigue siendo válida y vuelve al pool
+_SMTP_MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+class SMTPConnectionPool:
+    """
+    Mantiene hasta 'size' sesiones SMTP ya autenticadas (STARTTLS + login) y
+    las reutiliza entre mensajes, para no repetir el handshake TLS por correo.
+    Las sesiones inactivas por más de 'idle_seconds' se descartan, y una sesión
+    que falla se cierra y se reemplaza por una nueva.
+    """
+
+    def __init__(self, size: int, idle_seconds: int, timeout: int):
+        self.size = max(1, size)
+        self.idle_seconds = idle_seconds
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[Tuple[smtplib.SMTP, float]]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _connect(self) -> smtplib.SMTP:
+        _check_smtp_settings()
+        server = smtplib.SMTP(settings.SMTP_SERVER, settings.SMTP_PORT, timeout=self.timeout)
+        server.starttls()
         server.login(
             settings.SMTP_LOGIN,
             settings.SMTP_PASSWORD.get_secret_value() # ✅ Corregido
             )
-        server.sendmail(
-            settings.SMTP_SENDER_EMAIL, 
-            recipient_email, 
-            msg.as_string()
-        )
-        server.quit()
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used <= self.idle_seconds:
+                return server
+            self._close(server)
+
+    @contextmanager
+    def connection(self):
+        """Presta una sesión autenticada; si el bloque falla, la sesión se descarta."""
+        self._slots.acquire()
+        server = None
+        try:
+            server = self._acquire()
+            yield server
+        except _SMTP_MESSAGE_ERRORS:
+            raise
+        except Exception:
+            if server is not None:
+                self._close(server)
+            server = None
+            raise
+        finally:
+            if server is not None:
+                self._idle.put((server, time.monotonic()))
+            self._slots.release()
+
+    def sendmail(self, recipient_email: str, msg: MIMEMultipart):
+        """Envía el mensaje y, si la sesión estaba caída, reconecta y reintenta una vez."""
+        payload = msg.as_string()
+        for attempt in (1, 2):
+            try:
+                with self.connection() as server:
+                    server.sendmail(settings.SMTP_SENDER_EMAIL, recipient_email, payload)
+                return
+            except _SMTP_CONNECTION_ERRORS:
+                if attempt == 2:
+                    raise
+                logger.warning(f"Sesión SMTP perdida al enviar a {recipient_email}; reconectando.")
+
+    def close_all(self):
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+
+_smtp_pool: Optional[SMTPConnectionPool] = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _smtp_pool
+    if _smtp_pool is None:
+        with _smtp_pool_lock:
+            if _smtp_pool is None:
+                _smtp_pool = SMTPConnectionPool(
+                    size=settings.SMTP_POOL_SIZE,
+                    idle_seconds=settings.SMTP_POOL_IDLE_SECONDS,
+                    timeout=settings.SMTP_TIMEOUT_SECONDS,
+                )
+    return _smtp_pool
+
+
+def _send_message_via_smtp(msg: MIMEMultipart, recipient_email: str, subject: str):
+    """Función helper para el envío SMTP usando una sesión del pool."""
+    _check_smtp_settings()
+    try:
+        get_smtp_pool().sendmail(recipient_email, msg)
         logger.info(f"Correo '{subject}' enviado exitosamente a {recipient_email}.")
     except Exception as e:
         logger.error(f"Error al enviar correo vía SMTP a {recipient_email}: {e}")
         raise e
 
+
+# ----------------------------------------------------------------------------------
+# DESPACHO CONCURRENTE (PROCESOS MASIVOS)
+# ----------------------------------------------------------------------------------
+
+class _RateLimiter:
+    """Espacia los envíos para no superar 'rate' correos por segundo (0 = sin límite)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class EmailDispatcher:
+    """
+    Envía correos en segundo plano con concurrencia acotada y límite de tasa,
+    reutilizando las sesiones del pool SMTP.
+
+    Uso:
+        with EmailDispatcher() as mailer:
+            mailer.submit(clave, send_certificate_email, recipient_email=..., ...)
+        for clave, error in mailer.results: ...
+
+    'results' contiene (clave, None) si el envío fue exitoso o (clave, excepción).
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, rate_per_second: Optional[float] = None):
+        self.concurrency = max(1, concurrency or settings.SMTP_MAX_CONCURRENCY)
+        self._limiter = _RateLimiter(
+            settings.SMTP_RATE_LIMIT_PER_SECOND if rate_per_second is None else rate_per_second
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="smtp")
+        # Acota los mensajes en cola para no retener todos los adjuntos en memoria
+        self._in_flight = threading.BoundedSemaphore(self.concurrency * 2)
+        self._lock = threading.Lock()
+        self.results: List[Tuple[Any, Optional[Exception]]] = []
+
+    def submit(self, key: Any, send_fn: Callable[..., None], **kwargs):
+        self._in_flight.acquire()
+        try:
+            self._executor.submit(self._run, key, send_fn, kwargs)
+        except BaseException:
+            # Si la tarea no llegó a encolarse (p. ej. executor cerrado), _run no liberará el permiso
+            self._in_flight.release()
+            raise
+
+    def _run(self, key, send_fn, kwargs):
+        error = None
+        try:
+            self._limiter.wait()
+            send_fn(**kwargs)
+        except Exception as e:
+            error = e
+        finally:
+            with self._lock:
+                self.results.append((key, error))
+            self._in_flight.release()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
 # ----------------------------------------------------------------------------------
 # FUNCIONES PRINCIPALES (No necesitan cambios)
 # ----------------------------------------------------------------------------------
 
-def send_certificate_email(
+def build_certificate_message(
     recipient_email: str,
     recipient_name: str,
     course_name: str,
     pdf_content: bytes,
     serial: str
-):
+) -> MIMEMultipart:
     """
-    Envía un correo electrónico con el certificado adjunto.
+    Construye el correo con el certificado adjunto (sin enviarlo).
     """
     msg = MIMEMultipart()
     msg['From'] = f"{settings.SMTP_SENDER_NAME} <{settings.SMTP_SENDER_EMAIL}>"
@@ -71,7 +285,20 @@ def send_certificate_email(
     encoders.encode_base64(part)
     part.add_header('Content-Disposition', f'attachment; filename="constancia-{serial}.pdf"')
     msg.attach(part)
+    return msg
+
 
+def send_certificate_email(
+    recipient_email: str,
+    recipient_name: str,
+    course_name: str,
+    pdf_content: bytes,
+    serial: str
+):
+    """
+    Envía un correo electrónico con el certificado adjunto.
+    """
+    msg = build_certificate_message(recipient_email, recipient_name, course_name, pdf_content, serial)
     _send_message_via_smtp(msg, recipient_email, msg['Subject'])
     
     
@@ -109,4 +336,176 @@ def send_password_reset_email(
     msg['Subject'] = subject
     msg.attach(MIMEText(html_body, 'html'))
 
-    _send_message_via_smtp(msg, email, subject)
\ No newline at end of file
+    _send_message_via_smtp(msg, email, subject)
+
+
+# ----------------------------------------------------------------------------------
+# BANDEJA DE SALIDA (email_outbox)
+# ----------------------------------------------------------------------------------
+
+def outbox_row(
+    certificado_id: Optional[int],
+    recipient_email: str,
+    recipient_name: str,
+    course_name: str,
+    job_id: Optional[str] = None,
+) -> dict:
+    """Valores de una fila de email_outbox, para inserciones masivas (insert().values)."""
+    return {
+        "certificado_id": certificado_id,
+        "recipient_email": recipient_email,
+        "recipient_name": recipient_name,
+        "course_name": course_name,
+        "job_id": job_id,
+        "estado": EstadoCorreoEnum.PENDIENTE,
+        "intentos": 0,
+        "proximo_intento": datetime.now(timezone.utc),
+    }
+
+
+def send_certificate_file(
+    archivo_path: Optional[str],
+    folio: str,
+    recipient_email: str,
+    recipient_name: str,
+    course_name: str,
+    render_request: Optional[CertificateRenderRequest] = None,
+):
+    """
+    Lee la constancia del almacenamiento (CertificateStore) y la envía por correo.
+    Sin archivo_path (CERT_RENDER_ON_READ) el PDF se toma de la caché de render
+    o se regenera con 'render_request'.
+    """
+    if archivo_path:
+        pdf_content = get_certificate_store().read_bytes(archivo_path)
+    else:
+        pdf_content = render_bytes(render_request)
+
+    send_certificate_email(
+        recipient_email=recipient_email,
+        recipient_name=recipient_name,
+        course_name=course_name,
+        pdf_content=pdf_content,
+        serial=folio,
+    )
+
+
+def _claim_outbox_batch(db: Session, batch_size: int) -> List[dict]:
+    """
+    Toma hasta 'batch_size' correos listos para enviarse y los marca como
+    ENVIANDO con un plazo (lease). Si el worker cae a mitad del envío, al
+    vencer el plazo otro worker los vuelve a tomar.
+    """
+    now = datetime.now(timezone.utc)
+
+    envios = (
+        db.query(models.EmailOutbox)
+        .filter(
+            models.EmailOutbox.estado.in_([EstadoCorreoEnum.PENDIENTE, EstadoCorreoEnum.ENVIANDO]),
+            models.EmailOutbox.proximo_intento <= now,
+        )
+        .order_by(models.EmailOutbox.proximo_intento, models.EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not envios:
+        db.commit()
+        return []
+
+    certificados = {
+        c.id: c
+        for c in db.query(models.Certificado)
+        .options(
+            selectinload(models.Certificado.producto_educativo),
+            selectinload(models.Certificado.inscripcion).selectinload(models.Inscripcion.participante),
+            selectinload(models.Certificado.docente),
+        )
+        .filter(models.Certificado.id.in_({e.certificado_id for e in envios}))
+        .all()
+    }
+
+    lease = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    tomados = []
+    for envio in envios:
+        certificado = certificados[envio.certificado_id]
+        envio.estado = EstadoCorreoEnum.ENVIANDO
+        envio.intentos += 1
+        envio.proximo_intento = lease
+        tomados.append({
+            "id": envio.id,
+            "archivo_path": certificado.archivo_path,
+            "folio": certificado.folio,
+            # Los datos para regenerar el PDF se leen ahora, dentro de la sesión
+            "render_request": None if certificado.archivo_path else render_request_for(certificado),
+            "recipient_email": envio.recipient_email,
+            "recipient_name": envio.recipient_name,
+            "course_name": envio.course_name,
+        })
+
+    db.commit()
+    return tomados
+
+
+def process_outbox_batch(db: Session, batch_size: Optional[int] = None) -> dict:
+    """
+    Envía un lote de la bandeja de salida y registra el resultado de cada correo.
+    Los fallos se reprograman con backoff exponencial hasta EMAIL_OUTBOX_MAX_INTENTOS;
+    después el correo queda como FALLIDO con su último error.
+    """
+    tomados = _claim_outbox_batch(db, batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE)
+    resumen = {"tomados": len(tomados), "enviados": 0, "reintentos": 0, "fallidos": 0}
+    if not tomados:
+        return resumen
+
+    with EmailDispatcher() as mailer:
+        for item in tomados:
+            envio_id = item.pop("id")
+            mailer.submit(envio_id, send_certificate_file, **item)
+
+    resultados = dict(mailer.results)
+    now = datetime.now(timezone.utc)
+    # job_id -> {"emailed": n, "failed": n} para los contadores de avance
+    por_job: dict = {}
+    # Fechas para el resumen mensual de correos (estadisticas_correos_mes)
+    fechas_enviados, fechas_fallidos = [], []
+
+    for envio in (
+        db.query(models.EmailOutbox)
+        .filter(models.EmailOutbox.id.in_(resultados.keys()))
+        .all()
+    ):
+        error = resultados[envio.id]
+        if error is None:
+            envio.estado = EstadoCorreoEnum.ENVIADO
+            envio.fecha_envio = now
+            envio.ultimo_error = None
+            resumen["enviados"] += 1
+            fechas_enviados.append(now)
+            campo = "emailed"
+        elif envio.intentos >= settings.EMAIL_OUTBOX_MAX_INTENTOS:
+            envio.estado = EstadoCorreoEnum.FALLIDO
+            envio.ultimo_error = str(error)
+            resumen["fallidos"] += 1
+            fechas_fallidos.append(envio.fecha_creacion or now)
+            campo = "failed"
+        else:
+            backoff = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** (envio.intentos - 1)
+            envio.estado = EstadoCorreoEnum.PENDIENTE
+            envio.proximo_intento = now + timedelta(seconds=backoff)
+            envio.ultimo_error = str(error)
+            resumen["reintentos"] += 1
+            continue
+
+        if envio.job_id:
+            contadores = por_job.setdefault(envio.job_id, {})
+            contadores[campo] = contadores.get(campo, 0) + 1
+
+    registrar_correos(db, fechas_enviados, fechas_fallidos)
+    db.commit()
+
+    for job_id, contadores in por_job.items():
+        JobProgress(job_id).incr(**contadores)
+
+    return resumen
+
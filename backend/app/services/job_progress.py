@@ -0,0 +1,135 @@
+# backend/app/services/job_progress.py
+
+import json
+import logging
+from typing import Dict, Iterable, Optional
+
+import redis
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Contadores que publica la emisión masiva mientras avanza
+# (resent = certificados ya existentes cuyo correo se volvió a encolar)
+PROGRESS_FIELDS = ("total", "rendered", "committed", "resent", "emailed", "failed")
+
+_redis_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Cliente Redis compartido (el mismo servidor que usa Celery como backend)."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _redis_client
+
+
+def _progress_key(job_id: str) -> str:
+    return f"lania:jobs:{job_id}:progress"
+
+
+def _failed_key(job_id: str) -> str:
+    return f"lania:jobs:{job_id}:failed"
+
+
+def events_channel(job_id: str) -> str:
+    """Canal pub/sub donde se anuncian los cambios de avance del job (SSE)."""
+    return f"lania:jobs:{job_id}:events"
+
+
+class JobProgress:
+    """
+    Contadores de avance de una tarea masiva, guardados en un hash de Redis
+    (HINCRBY es atómico, así que varios lotes del chord pueden sumar a la vez).
+    Los destinatarios que fallan en la emisión se guardan en un conjunto
+    (SADD), no en un contador: si un lote se reintenta y vuelve a fallar en
+    el mismo destinatario no se cuenta dos veces.
+    Sin job_id todas las operaciones son no-op, para poder llamar al servicio
+    fuera de Celery sin condicionales.
+    Un fallo de Redis nunca interrumpe la emisión: solo se registra en el log.
+    """
+
+    def __init__(self, job_id: Optional[str]):
+        self.job_id = job_id
+
+    def incr(self, **counts: int) -> None:
+        if not self.job_id:
+            return
+        counts = {k: v for k, v in counts.items() if v}
+        if not counts:
+            return
+        try:
+            key = _progress_key(self.job_id)
+            pipe = get_redis().pipeline()
+            for field, amount in counts.items():
+                pipe.hincrby(key, field, amount)
+            pipe.expire(key, settings.JOB_PROGRESS_TTL_SECONDS)
+            pipe.publish(events_channel(self.job_id), json.dumps({"evento": "progreso"}))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo actualizar el progreso del job {self.job_id}: {e}")
+
+    def fail(self, destinatarios: Iterable[str]) -> None:
+        """Registra destinatarios ('inscripcion:<id>', 'docente:<id>') que no se pudieron emitir."""
+        self._update_failed(destinatarios, agregar=True)
+
+    def resolve(self, destinatarios: Iterable[str]) -> None:
+        """Quita de los fallos a los destinatarios que un reintento sí emitió."""
+        self._update_failed(destinatarios, agregar=False)
+
+    def _update_failed(self, destinatarios: Iterable[str], agregar: bool) -> None:
+        if not self.job_id:
+            return
+        destinatarios = list(destinatarios)
+        if not destinatarios:
+            return
+        try:
+            key = _failed_key(self.job_id)
+            pipe = get_redis().pipeline()
+            if agregar:
+                pipe.sadd(key, *destinatarios)
+                pipe.expire(key, settings.JOB_PROGRESS_TTL_SECONDS)
+                pipe.publish(events_channel(self.job_id), json.dumps({"evento": "progreso"}))
+            else:
+                pipe.srem(key, *destinatarios)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo registrar los fallos del job {self.job_id}: {e}")
+
+    def set_total(self, total: int) -> None:
+        if not self.job_id:
+            return
+        try:
+            key = _progress_key(self.job_id)
+            pipe = get_redis().pipeline()
+            pipe.hset(key, "total", total)
+            pipe.expire(key, settings.JOB_PROGRESS_TTL_SECONDS)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo registrar el total del job {self.job_id}: {e}")
+
+    def finish(self) -> None:
+        """Anuncia a los suscriptores que el job terminó (el resultado está en Celery)."""
+        if not self.job_id:
+            return
+        try:
+            get_redis().publish(events_channel(self.job_id), json.dumps({"evento": "terminado"}))
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo anunciar el fin del job {self.job_id}: {e}")
+
+
+def read_progress(job_id: str) -> Dict[str, int]:
+    """
+    Devuelve los contadores del job (0 en los que aún no se publican).
+    'failed' suma los destinatarios que fallaron en la emisión y los correos
+    que agotaron sus intentos.
+    """
+    pipe = get_redis().pipeline()
+    pipe.hgetall(_progress_key(job_id))
+    pipe.scard(_failed_key(job_id))
+    raw, fallidos = pipe.execute()
+    values = {k.decode(): int(v) for k, v in raw.items()}
+    values["failed"] = values.get("failed", 0) + fallidos
+    return {field: values.get(field, 0) for field in PROGRESS_FIELDS}
@@ -1,23 +1,47 @@
 from io import BytesIO
 from PyPDF2 import PdfWriter, PdfReader
+from PyPDF2._page import PageObject
+from PyPDF2.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    IndirectObject,
+    NameObject,
+)
+from reportlab import rl_config
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import cm
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.utils import ImageReader
 from reportlab.platypus import Paragraph
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from reportlab.pdfbase.pdfmetrics import stringWidth
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 import locale
-from typing import Optional, List
+import logging
+import multiprocessing
+from typing import Optional, List, Iterable, Iterator, Tuple
 
-from app.services.qr_service import generate_qr_png
+from app.services.qr_service import draw_qr
+from app.services.template_registry import template_registry
 from app.models.producto_educativo import TipoProductoEnum
 from app.core.config import settings as app_settings
 
+logger = logging.getLogger(__name__)
+
+# Los streams de ReportLab se guardan solo con Flate (ASCII85 los agranda ~25 %)
+rl_config.useA85 = 0
+
+# Versión de la salida: se incrementa cuando una misma solicitud pasa a producir
+# otros bytes (forma parte de la huella de la caché de render)
+RENDER_VERSION = 2
+
 # ---------------------------------------
 # Registro de fuentes (CORREGIDO)
 # ---------------------------------------
@@ -64,6 +88,75 @@ try:
 except Exception as e:
     FUENTE_COMPETENCIAS = "Helvetica-Oblique" # Fallback a cursiva estándar
     print(f">>> [ERROR] No se pudo cargar Myriad Pro: {e}")
+
+# ---------------------------------------
+# Estilos de párrafo compartidos
+# (se crean una sola vez y se reutilizan en todas las constancias)
+# ---------------------------------------
+
+# Nombre del participante/docente (BrittanySignature, multilínea)
+STYLE_PARTICIPANT_NAME = ParagraphStyle(
+    name='ParticipantInyeccion',
+    fontName='BrittanySignature',
+    fontSize=30,
+    leading=42,
+    alignment=TA_CENTER
+)
+
+# Píldora educativa
+STYLE_PILDORA_NORMAL = ParagraphStyle(
+    name='NormalCourse',
+    fontName='Helvetica',
+    fontSize=20,
+    leading=22, # Se mantiene para el texto normal
+    alignment=TA_CENTER
+)
+STYLE_PILDORA_BOLD = ParagraphStyle(
+    name='BoldCourse',
+    fontName='Helvetica-Bold',
+    fontSize=30,
+    leading=35, # Interlineado limpio y formal para el nombre del curso
+    alignment=TA_CENTER,
+    leftIndent=50,  # Sangría de 50 puntos a la izquierda
+    rightIndent=50  # Sangría de 50 puntos a la derecha
+)
+
+# Inyección educativa, curso educativo y docentes
+STYLE_NORMAL_COURSE = ParagraphStyle(
+    name='NormalCourse',
+    fontName='Helvetica',
+    fontSize=16,
+    leading=22, # Interlineado interno ajustado: 16pt + 6pt de espacio
+    alignment=TA_CENTER
+)
+STYLE_BOLD_COURSE = ParagraphStyle(
+    name='BoldCourse',
+    fontName='Helvetica-Bold',
+    fontSize=22,
+    leading=28, # Interlineado interno ajustado: 22pt + 6pt de espacio
+    alignment=TA_CENTER
+)
+STYLE_DOCENTE_BOLD_COURSE = ParagraphStyle(
+    name='BoldCourse',
+    fontName='Helvetica-Bold',
+    fontSize=28,
+    leading=28,
+    alignment=TA_CENTER
+)
+
+# Reconocimiento de competencias
+STYLE_RECOGNITION_NAME = ParagraphStyle(
+    name='ParticipantRecognition',
+    fontName='BrittanySignature',
+    fontSize=20, leading=38, alignment=TA_CENTER
+)
+STYLE_RECOGNITION_COURSE_INFO = ParagraphStyle(
+    name='CourseInfo',
+    fontName='Helvetica',
+    fontSize=15, leading=20, alignment=TA_CENTER,
+    leftIndent=30, rightIndent=30
+)
+
 # ---------------------------------------
 # Funciones Auxiliares
 # ---------------------------------------
@@ -78,21 +171,124 @@ def draw_multiline_text(c, text, x, y, max_width, style):
         p.drawOn(c, x - (max_width / 2), y - p_height)
     return p_height
 
-def calculate_text_lines(text: str, font_name: str, font_size: int, max_width: float) -> int:
+TEMPLATE_XOBJECT_NAME = "/LaniaPlantilla"
+
+
+def template_xobject(writer: PdfWriter, template_path: Optional[str] = None) -> IndirectObject:
+    """
+    Agrega al documento la página base de la plantilla como un Form XObject
+    (contenido + recursos) y devuelve su referencia, para que las páginas la
+    dibujen con 'Do' en lugar de copiar y reescribir su contenido.
+    """
+    base = template_registry.get_page(template_path)
+
+    form = DecodedStreamObject()
+    form.set_data(base.get_contents().get_data())
+    form = form.flate_encode()
+    form.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): ArrayObject(base.mediabox),
+        NameObject("/Resources"): base[NameObject("/Resources")].get_object().clone(writer),
+    })
+    return writer._add_object(form)
+
+
+def add_overlay_page(
+    writer: PdfWriter,
+    capa: PageObject,
+    template: IndirectObject,
+    template_path: Optional[str] = None
+) -> PageObject:
+    """
+    Agrega a 'writer' una página de la capa de ReportLab con la plantilla
+    compartida dibujada debajo. Los recursos de la plantilla quedan dentro del
+    XObject, así que no chocan con los nombres de fuentes de la capa.
+    """
+    base = template_registry.get_page(template_path)
+    # El contenido de la capa no se clona: se reescribe abajo con la plantilla
+    page = writer.add_page(capa, excluded_keys=("/Contents",))
+    page[NameObject("/MediaBox")] = ArrayObject(base.mediabox)
+
+    recursos = DictionaryObject(page[NameObject("/Resources")].get_object())
+    xobjects = DictionaryObject(recursos.get("/XObject", DictionaryObject()).get_object())
+    xobjects[NameObject(TEMPLATE_XOBJECT_NAME)] = template
+    recursos[NameObject("/XObject")] = xobjects
+    page[NameObject("/Resources")] = recursos
+
+    contenido = DecodedStreamObject()
+    contenido.set_data(
+        f"q {TEMPLATE_XOBJECT_NAME} Do Q\n".encode() + capa.get_contents().get_data()
+    )
+    page[NameObject("/Contents")] = writer._add_object(contenido.flate_encode())
+    return page
+
+
+def merge_with_template(packet: BytesIO, template_path: Optional[str] = None) -> bytes:
+    """
+    Combina la capa generada con ReportLab (una o varias páginas) sobre la
+    plantilla base. La plantilla se obtiene ya analizada del registro y se
+    incluye una sola vez por documento como Form XObject.
+    """
+    capas = PdfReader(packet)
+    output = PdfWriter()
+    plantilla = template_xobject(output, template_path)
+    for capa in capas.pages:
+        add_overlay_page(output, capa, plantilla, template_path)
+
+    with BytesIO() as buffer:
+        output.write(buffer)
+        return buffer.getvalue()
+
+# ---------------------------------------
+# Motor de maquetación de competencias (con memoización)
+# Para un mismo producto todos los reconocimientos tienen la misma lista de
+# competencias, así que el ajuste de líneas y el tamaño de fuente se calculan
+# una sola vez por proceso y se reutilizan en todo el lote.
+# ---------------------------------------
+
+@lru_cache(maxsize=8192)
+def measure_text(text: str, font_name: str, font_size: float) -> float:
+    """Ancho de un texto (normalmente una palabra) medido una sola vez."""
+    return stringWidth(text, font_name, font_size)
+
+@lru_cache(maxsize=4096)
+def wrap_text_lines(text: str, font_name: str, font_size: float, max_width: float) -> Tuple[str, ...]:
+    """
+    Divide el texto en líneas de a lo más max_width, palabra por palabra.
+    Cada palabra se mide una vez y el ancho de la línea se acumula, en lugar de
+    volver a medir el prefijo completo en cada paso.
+    Conserva el comportamiento original: si una palabra no cabe ni sola, la
+    línea previa (aunque esté vacía) se cierra igualmente.
+    """
     words = text.split()
-    if not words: return 0
-    lines, current_line = 0, ""
+    if not words:
+        return ()
+
+    space_width = measure_text(" ", font_name, font_size)
+    lines = []
+    current_words: List[str] = []
+    current_width = 0.0
+
     for word in words:
-        test_line = f"{current_line} {word}".strip()
-        if stringWidth(test_line, font_name, font_size) <= max_width:
-            current_line = test_line
+        word_width = measure_text(word, font_name, font_size)
+        test_width = current_width + space_width + word_width if current_words else word_width
+
+        if test_width <= max_width:
+            current_words.append(word)
+            current_width = test_width
         else:
-            lines += 1
-            current_line = word
-    return lines + 1 if current_line else lines
+            lines.append(" ".join(current_words))
+            current_words, current_width = [word], word_width
 
-def calculate_optimal_font_size(competencies, max_width, available_height, max_font_size=12, min_font_size=9):
-    # Forzamos el uso del nombre registrado para el cálculo de medidas
+    lines.append(" ".join(current_words))
+    return tuple(lines)
+
+def calculate_text_lines(text: str, font_name: str, font_size: int, max_width: float) -> int:
+    return len(wrap_text_lines(text, font_name, font_size, max_width))
+
+@lru_cache(maxsize=1024)
+def _optimal_font_size(competencies: Tuple[str, ...], max_width, available_height, max_font_size, min_font_size):
     for font_size in range(max_font_size, min_font_size - 1, -1):
         total_height = 0
         line_height = font_size * 1.4
@@ -104,6 +300,10 @@ def calculate_optimal_font_size(competencies, max_width, available_height, max_f
             return font_size
     return min_font_size
 
+def calculate_optimal_font_size(competencies, max_width, available_height, max_font_size=12, min_font_size=9):
+    # Forzamos el uso del nombre registrado para el cálculo de medidas
+    return _optimal_font_size(tuple(competencies), max_width, available_height, max_font_size, min_font_size)
+
 def draw_competencies(c, competencies, x, y_start, max_width, font_name, font_size, line_spacing=1.4):
     y = y_start
     line_height = font_size * line_spacing
@@ -123,31 +323,11 @@ def draw_competencies(c, competencies, x, y_start, max_width, font_name, font_si
     c.setFont(target_font, font_size)
     
     for comp in competencies:
-        words = comp.split()
-        current_line = ""
-        is_first_line = True
-        
-        for word in words:
-            test_line = f"{current_line} {word}".strip()
-            
-            # Usamos ancho_efectivo para el salto de línea automático
-            if stringWidth(test_line, target_font, font_size) <= ancho_efectivo:
-                current_line = test_line
-            else:
-                c.setFont(target_font, font_size)
-                # Si es la primera línea ponemos punto, si no, espacios de alineación
-                bullet = f"•{espacio_entre_punto_y_texto}" if is_first_line else f" {espacio_entre_punto_y_texto} "
-                
-                c.drawString(x_dibujo, y, f"{bullet}{current_line}")
-                
-                y -= line_height
-                is_first_line, current_line = False, word
-        
-        # Dibujar la última línea de la competencia actual
-        if current_line:
-            c.setFont(target_font, font_size)
-            bullet = f"•{espacio_entre_punto_y_texto}" if is_first_line else f" {espacio_entre_punto_y_texto} "
-            c.drawString(x_dibujo, y, f"{bullet}{current_line}")
+        # Las líneas ya ajustadas se obtienen de la caché de maquetación
+        for i, line in enumerate(wrap_text_lines(comp, target_font, font_size, ancho_efectivo)):
+            # Si es la primera línea ponemos punto, si no, espacios de alineación
+            bullet = f"•{espacio_entre_punto_y_texto}" if i == 0 else f" {espacio_entre_punto_y_texto} "
+            c.drawString(x_dibujo, y, f"{bullet}{line}")
             y -= line_height
             
         # Espacio pequeño entre un bloque de competencia y el siguiente
@@ -158,37 +338,25 @@ def draw_competencies(c, competencies, x, y_start, max_width, font_name, font_si
 # -------------------------------------------------------------------
 # ✔ CONSTANCIA PILDORA EDUCATIVA (participantes) 
 # -------------------------------------------------------------------
-def generate_pildora_participante_pdf(
+def draw_pildora_participante(
+    c: canvas.Canvas,
     participant_name: str,
     course_name: str,
     hours: int,
     issue_date: date,
     serial: str,
-    modalidad: str,
-    template_path: Optional[str] = None
-) -> bytes:
+    modalidad: str
+) -> None:
     """
-    Genera constancia específica para PILDORA EDUCATIVA (participantes).
+    Dibuja en 'c' la constancia de PILDORA EDUCATIVA (participantes).
     """
     
-    if template_path is None:
-        template_path = "app/static/Formato constancias.pdf"
-    
-    packet = BytesIO()
-    c = canvas.Canvas(packet, pagesize=letter)
-    
     page_width, page_height = letter
     center_x = page_width / 2
     text_width = 18 * cm
     
    # ----------- Estilo para el nombre (Fuente BrittanySignature, 38pt, multilínea) -------------------
-    style_participant_name = ParagraphStyle(
-        name='ParticipantInyeccion',
-        fontName='BrittanySignature', # Fuente Actualizada
-        fontSize=30, 
-        leading=42,
-        alignment=TA_CENTER
-    )
+    style_participant_name = STYLE_PARTICIPANT_NAME
     
     # ----------- ENCABEZADO "Otorga la presente" -------------------
     c.setFont("Helvetica", 27)
@@ -241,22 +409,8 @@ def generate_pildora_participante_pdf(
     y_text = y_position - (participant_height + 0.8 * cm) 
 
 # ----------- ESTILOS TEXTO CURSO (Interlineado dinámico) -------------------
-    style_normal_course = ParagraphStyle(
-        name='NormalCourse',
-        fontName='Helvetica',
-        fontSize=20,
-        leading=22, # Se mantiene para el texto normal
-        alignment=TA_CENTER
-    )
-    style_bold_course = ParagraphStyle(
-        name='BoldCourse',
-        fontName='Helvetica-Bold',
-        fontSize=30,
-        leading=35, # <-- CORRECCIÓN CLAVE: Aumentado a 35pt (de 22pt) para un interlineado limpio y formal.
-        alignment=TA_CENTER,
-        leftIndent=50,  # Sangría de 50 puntos a la izquierda
-        rightIndent=50  # Sangría de 50 puntos a la derecha
-    )
+    style_normal_course = STYLE_PILDORA_NORMAL
+    style_bold_course = STYLE_PILDORA_BOLD
     
     # ----------- TEXTO "Por su participación..." -------------------
     line1 = "Por su asistencia a la píldora educativa"
@@ -296,68 +450,35 @@ def generate_pildora_participante_pdf(
     
     # ----------- QR CODE (abajo izquierda) -------------------
     qr_url = f"{app_settings.BASE_URL}/verificacion/{serial}"
-    qr_png_bytes = generate_qr_png(qr_url)
-    qr_image = ImageReader(BytesIO(qr_png_bytes))
-    
-    c.drawImage(qr_image, 1.5 * cm, 1.2 * cm, width=50, height=50, mask="auto")
+    draw_qr(c, qr_url, 1.5 * cm, 1.2 * cm, 50)
     
     c.setFont("Helvetica", 7)
     c.drawString(1.5 * cm, 0.8 * cm, f"Folio: {serial}")
-    
-    # ----------- GUARDAR -------------------
-    c.save()
-    packet.seek(0)
-    
-    # ----------- COMBINAR CON PLANTILLA -------------------
-    new_pdf = PdfReader(packet)
-    
-    with open(template_path, "rb") as tpl:
-        existing_pdf = PdfReader(tpl)
-        output = PdfWriter()
-        page = existing_pdf.pages[0]
-        page.merge_page(new_pdf.pages[0])
-        output.add_page(page)
-        
-        with BytesIO() as buffer:
-            output.write(buffer)
-            return buffer.getvalue()
 
 
 # -------------------------------------------------------------------
 # ✔ CONSTANCIA INYECCIÓN EDUCATIVA (participantes)
 # -------------------------------------------------------------------
-def generate_inyeccion_participante_pdf(
+def draw_inyeccion_participante(
+    c: canvas.Canvas,
     participant_name: str,
     course_name: str,
     hours: int,
     issue_date: date,
     serial: str,
-    modalidad: str,
-    template_path: Optional[str] = None
-) -> bytes:
+    modalidad: str
+) -> None:
     """
-    Genera constancia específica para INYECCIÓN EDUCATIVA (participantes).
+    Dibuja en 'c' la constancia de INYECCIÓN EDUCATIVA (participantes).
     Ajustes finos de coordenadas y espaciado para igualar el formato de 'Ejemplo inyección (2).pdf'.
     """
     
-    if template_path is None:
-        template_path = "app/static/Formato constancias.pdf"
-    
-    packet = BytesIO()
-    c = canvas.Canvas(packet, pagesize=letter)
-    
     page_width, page_height = letter
     center_x = page_width / 2
     text_width = 18 * cm
     
    # ----------- Estilo para el nombre (Fuente BrittanySignature, 38pt, multilínea) -------------------
-    style_participant_name = ParagraphStyle(
-        name='ParticipantInyeccion',
-        fontName='BrittanySignature', # Fuente Actualizada
-        fontSize=30, 
-        leading=42,
-        alignment=TA_CENTER
-    )
+    style_participant_name = STYLE_PARTICIPANT_NAME
     
     # ----------- ENCABEZADO "Otorga la presente" -------------------
     c.setFont("Helvetica", 27)
@@ -410,20 +531,8 @@ def generate_inyeccion_participante_pdf(
     y_text = y_position - (participant_height + 2 * cm) 
 
 # ----------- ESTILOS TEXTO CURSO (Interlineado dinámico) -------------------
-    style_normal_course = ParagraphStyle(
-        name='NormalCourse',
-        fontName='Helvetica',
-        fontSize=16,
-        leading=22, # Interlineado interno ajustado: 16pt + 6pt de espacio
-        alignment=TA_CENTER
-    )
-    style_bold_course = ParagraphStyle(
-        name='BoldCourse',
-        fontName='Helvetica-Bold',
-        fontSize=22,
-        leading=28, # Interlineado interno ajustado: 22pt + 6pt de espacio
-        alignment=TA_CENTER
-    )
+    style_normal_course = STYLE_NORMAL_COURSE
+    style_bold_course = STYLE_BOLD_COURSE
     
     # ----------- TEXTO "Por su participación..." -------------------
     line1 = "Por su participación en la Inyección Educativa"
@@ -461,66 +570,33 @@ def generate_inyeccion_participante_pdf(
     
     # ----------- QR CODE (abajo izquierda) -------------------
     qr_url = f"{app_settings.BASE_URL}/verificacion/{serial}"
-    qr_png_bytes = generate_qr_png(qr_url)
-    qr_image = ImageReader(BytesIO(qr_png_bytes))
-    
-    c.drawImage(qr_image, 1.5 * cm, 1.2 * cm, width=50, height=50, mask="auto")
+    draw_qr(c, qr_url, 1.5 * cm, 1.2 * cm, 50)
     
     c.setFont("Helvetica", 7)
     c.drawString(1.5 * cm, 0.8 * cm, f"Folio: {serial}")
-    
-    # ----------- GUARDAR -------------------
-    c.save()
-    packet.seek(0)
-    
-    # ----------- COMBINAR CON PLANTILLA -------------------
-    new_pdf = PdfReader(packet)
-    
-    with open(template_path, "rb") as tpl:
-        existing_pdf = PdfReader(tpl)
-        output = PdfWriter()
-        page = existing_pdf.pages[0]
-        page.merge_page(new_pdf.pages[0])
-        output.add_page(page)
-        
-        with BytesIO() as buffer:
-            output.write(buffer)
-            return buffer.getvalue()
 
 # -------------------------------------------------------------------
 # ✔ CONSTANCIA CURSO EDUCATIVO (participantes)
 # -------------------------------------------------------------------
-def generate_curso_participante_pdf(
+def draw_curso_participante(
+    c: canvas.Canvas,
     participant_name: str,
     course_name: str,
     hours: int,
     issue_date: date,
     serial: str,
-    modalidad: str,
-    template_path: Optional[str] = None
-) -> bytes:
+    modalidad: str
+) -> None:
     """
-    Genera constancia específica para CURSO EDUCATIVO (participantes).
+    Dibuja en 'c' la constancia de CURSO EDUCATIVO (participantes).
     """
     
-    if template_path is None:
-        template_path = "app/static/Formato constancias.pdf"
-    
-    packet = BytesIO()
-    c = canvas.Canvas(packet, pagesize=letter)
-    
     page_width, page_height = letter
     center_x = page_width / 2
     text_width = 18 * cm
     
    # ----------- Estilo para el nombre (Fuente BrittanySignature, 38pt, multilínea) -------------------
-    style_participant_name = ParagraphStyle(
-        name='ParticipantInyeccion',
-        fontName='BrittanySignature', # Fuente Actualizada
-        fontSize=30, 
-        leading=42,
-        alignment=TA_CENTER
-    )
+    style_participant_name = STYLE_PARTICIPANT_NAME
     
     # ----------- ENCABEZADO "Otorga la presente" -------------------
     c.setFont("Helvetica", 27)
@@ -573,20 +649,8 @@ def generate_curso_participante_pdf(
     y_text = y_position - (participant_height + 0.5 * cm) 
 
 # ----------- ESTILOS TEXTO CURSO (Interlineado dinámico) -------------------
-    style_normal_course = ParagraphStyle(
-        name='NormalCourse',
-        fontName='Helvetica',
-        fontSize=16,
-        leading=22, # Interlineado interno ajustado: 16pt + 6pt de espacio
-        alignment=TA_CENTER
-    )
-    style_bold_course = ParagraphStyle(
-        name='BoldCourse',
-        fontName='Helvetica-Bold',
-        fontSize=22,
-        leading=28, # Interlineado interno ajustado: 22pt + 6pt de espacio
-        alignment=TA_CENTER
-    )
+    style_normal_course = STYLE_NORMAL_COURSE
+    style_bold_course = STYLE_BOLD_COURSE
     
     # ----------- TEXTO "Por su participación..." -------------------
     line1 = "Por su participación en el curso"
@@ -624,31 +688,10 @@ def generate_curso_participante_pdf(
     
     # ----------- QR CODE (abajo izquierda) -------------------
     qr_url = f"{app_settings.BASE_URL}/verificacion/{serial}"
-    qr_png_bytes = generate_qr_png(qr_url)
-    qr_image = ImageReader(BytesIO(qr_png_bytes))
-    
-    c.drawImage(qr_image, 1.5 * cm, 1.2 * cm, width=50, height=50, mask="auto")
+    draw_qr(c, qr_url, 1.5 * cm, 1.2 * cm, 50)
     
     c.setFont("Helvetica", 7)
     c.drawString(1.5 * cm, 0.8 * cm, f"Folio: {serial}")
-    
-    # ----------- GUARDAR -------------------
-    c.save()
-    packet.seek(0)
-    
-    # ----------- COMBINAR CON PLANTILLA -------------------
-    new_pdf = PdfReader(packet)
-    
-    with open(template_path, "rb") as tpl:
-        existing_pdf = PdfReader(tpl)
-        output = PdfWriter()
-        page = existing_pdf.pages[0]
-        page.merge_page(new_pdf.pages[0])
-        output.add_page(page)
-        
-        with BytesIO() as buffer:
-            output.write(buffer)
-            return buffer.getvalue()
 
 # ---------------------------------------
 # Utilidad de formato académico de fechas
@@ -683,37 +726,25 @@ def format_spanish_date_range(start_date: date, end_date: date) -> str:
 # -------------------------------------------------------------------
 # ✔ CONSTANCIA DOCENTE (todas las modalidades)
 # -------------------------------------------------------------------
-def generate_docente_pdf(
+def draw_docente(
+    c: canvas.Canvas,
     participant_name: str,
     course_name: str,
     issue_date: date,
     serial: str,
     course_start_date: date, 
     course_end_date: date,
-    docente_specialty: Optional[str] = None,
-    template_path: Optional[str] = None
-) -> bytes:
+    docente_specialty: Optional[str] = None
+) -> None:
     """
-    Genera constancia para DOCENTES (cualquier tipo de producto).
+    Dibuja en 'c' la constancia para DOCENTES (cualquier tipo de producto).
     """ 	
-    if template_path is None:
-        template_path = "app/static/Formato constancias.pdf"
-    
-    packet = BytesIO()
-    c = canvas.Canvas(packet, pagesize=letter)
-    
     page_width, page_height = letter
     center_x = page_width / 2
     text_width = 18 * cm
     
     # ----------- Estilo para el nombre (Fuente BrittanySignature, 38pt, multilínea) -------------------
-    style_participant_name = ParagraphStyle(
-        name='ParticipantInyeccion',
-        fontName='BrittanySignature', # Fuente Actualizada
-        fontSize=30, 
-        leading=42,
-        alignment=TA_CENTER
-    )
+    style_participant_name = STYLE_PARTICIPANT_NAME
     
     # ----------- ENCABEZADO "Otorga la presente" -------------------
     c.setFont("Helvetica", 27)
@@ -763,21 +794,9 @@ def generate_docente_pdf(
     )
 
     # ----------- ESTILOS TEXTO CURSO (Interlineado dinámico) -------------------
-    style_normal_course = ParagraphStyle(
-        name="NormalCourse",
-        fontName="Helvetica",        # ✔ fuente base soportada nativamente
-        fontSize=16,
-        leading=22,                 # interlineado académico
-        alignment=TA_CENTER
-    )
+    style_normal_course = STYLE_NORMAL_COURSE
 
-    style_bold_course = ParagraphStyle(
-        name="BoldCourse",
-        fontName="Helvetica-Bold",   # ✔ bold real, sin mapping
-        fontSize=28,
-        leading=28,
-        alignment=TA_CENTER
-    )
+    style_bold_course = STYLE_DOCENTE_BOLD_COURSE
 
 
     # ----------- Ajuste de flujo vertical -------------------
@@ -822,34 +841,16 @@ def generate_docente_pdf(
     
     # ----------- QR y FOLIO -------------------
     qr_url = f"{app_settings.BASE_URL}/verificacion/{serial}"
-    qr_png_bytes = generate_qr_png(qr_url)
-    qr_image = ImageReader(BytesIO(qr_png_bytes))
-    c.drawImage(qr_image, 1.5 * cm, 1.5 * cm, width=50, height=50, mask="auto")
+    draw_qr(c, qr_url, 1.5 * cm, 1.5 * cm, 50)
     
     c.setFont("Helvetica", 7)
     c.drawString(1.5 * cm, 1.0 * cm, f"Folio: {serial}")
-    
-    c.save()
-    packet.seek(0)
-    
-    # ----------- COMBINAR CON PLANTILLA -------------------
-    new_pdf = PdfReader(packet)
-    
-    with open(template_path, "rb") as tpl:
-        existing_pdf = PdfReader(tpl)
-        output = PdfWriter()
-        page = existing_pdf.pages[0]
-        page.merge_page(new_pdf.pages[0])
-        output.add_page(page)
-        
-        with BytesIO() as buffer:
-            output.write(buffer)
-            return buffer.getvalue()
         
 # -------------------------------------------------------------------
-# ✔ FUNCIÓN MAESTRA: Genera PDF según tipo
+# ✔ FUNCIÓN MAESTRA: Dibuja la constancia según tipo
 # -------------------------------------------------------------------
-def generate_certificate_pdf(
+def draw_certificate(
+    c: canvas.Canvas,
     participant_name: str,
     course_name: str,
     hours: int,
@@ -863,16 +864,16 @@ def generate_certificate_pdf(
     course_start_date: Optional[date] = None, 
     course_end_date: Optional[date] = None,
     # ---
-    docente_specialty: Optional[str] = None,
-    template_path: Optional[str] = None
-) -> bytes:
+    docente_specialty: Optional[str] = None
+) -> None:
     """
     Función maestra que redirige a la función específica según el tipo.
     """
     
     # DOCENTES (cualquier tipo de producto)
     if entity_type == "docente":
-        return generate_docente_pdf(
+        return draw_docente(
+            c,
             participant_name=participant_name,
             course_name=course_name,
             issue_date=issue_date,
@@ -881,65 +882,59 @@ def generate_certificate_pdf(
             course_start_date=course_start_date,
             course_end_date=course_end_date,
             # ---
-            docente_specialty=docente_specialty,
-            template_path=template_path
+            docente_specialty=docente_specialty
         )
     
     # PILDORA EDUCATIVA (participantes)
     if tipo_producto == TipoProductoEnum.PILDORA_EDUCATIVA:
-        return generate_pildora_participante_pdf(
+        return draw_pildora_participante(
+            c,
             participant_name=participant_name,
             course_name=course_name,
             hours=hours,
             issue_date=issue_date,
             serial=serial,
-            modalidad=modalidad,
-            template_path=template_path
+            modalidad=modalidad
         )
     
     # INYECCIÓN EDUCATIVA (participantes)
     if tipo_producto == TipoProductoEnum.INYECCION_EDUCATIVA:
-        return generate_inyeccion_participante_pdf(
+        return draw_inyeccion_participante(
+            c,
             participant_name=participant_name,
             course_name=course_name,
             hours=hours,
             issue_date=issue_date,
             serial=serial,
-            modalidad=modalidad,
-            template_path=template_path
+            modalidad=modalidad
         )
     
     # CURSO EDUCATIVO (participantes)
     if tipo_producto == TipoProductoEnum.CURSO_EDUCATIVO:
-        return generate_curso_participante_pdf(
+        return draw_curso_participante(
+            c,
             participant_name=participant_name,
             course_name=course_name,
             hours=hours,
             issue_date=issue_date,
             serial=serial,
-            modalidad=modalidad,
-            template_path=template_path
+            modalidad=modalidad
         )
 
 
 # -------------------------------------------------------------------
 # RECONOCIMIENTO (USANDO MyriadPro-Regular)
 # -------------------------------------------------------------------
-def generate_recognition_pdf(
+def draw_recognition(
+    c: canvas.Canvas,
     participant_name: str,
     course_name: str,
     hours: int,
     issue_date: date,
     serial: str,
     qr_token: str,
-    competencies: List[str],
-    template_path: Optional[str] = None
-) -> bytes:
-    if template_path is None:
-        template_path = "app/static/Formato constancias.pdf"
-    
-    packet = BytesIO()
-    c = canvas.Canvas(packet, pagesize=letter)
+    competencies: List[str]
+) -> None:
     page_width, page_height = letter
     center_x = page_width / 2
     
@@ -948,18 +943,9 @@ def generate_recognition_pdf(
     x_comp_left = center_x - (max_width_comp / 2)
     y_limit_signature = 6.0 * cm 
 
-    style_participant_name = ParagraphStyle(
-        name='ParticipantRecognition',
-        fontName='BrittanySignature', 
-        fontSize=20, leading=38, alignment=TA_CENTER
-    )
+    style_participant_name = STYLE_RECOGNITION_NAME
 
-    style_course_info = ParagraphStyle(
-        name='CourseInfo',
-        fontName='Helvetica',
-        fontSize=15, leading=20, alignment=TA_CENTER,
-        leftIndent=30, rightIndent=30
-    )
+    style_course_info = STYLE_RECOGNITION_COURSE_INFO
 
     # 1. Títulos
     c.setFont("Helvetica", 28)
@@ -1008,22 +994,227 @@ def generate_recognition_pdf(
     
     # 6. QR y Folio
     qr_url = f"{app_settings.BASE_URL}/verificacion/{serial}"
-    qr_image = ImageReader(BytesIO(generate_qr_png(qr_url)))
-    c.drawImage(qr_image, 1.5 * cm, 1.5 * cm, width=50, height=50, mask="auto")
+    draw_qr(c, qr_url, 1.5 * cm, 1.5 * cm, 50)
     c.setFont("Helvetica", 7)
     c.drawString(1.5 * cm, 1.1 * cm, f"Folio del certificado: {serial}")
-    
+
+
+# -------------------------------------------------------------------
+# ✔ MOTOR DE RENDERIZADO POR LOTES
+# -------------------------------------------------------------------
+@dataclass(frozen=True)
+class CertificateRenderRequest:
+    """
+    Datos necesarios para renderizar una constancia o reconocimiento.
+    Si 'competencies' trae elementos (participante de CURSO_EDUCATIVO)
+    se genera el reconocimiento de competencias.
+    """
+    serial: str
+    participant_name: str
+    course_name: str
+    hours: int
+    issue_date: date
+    tipo_producto: TipoProductoEnum
+    modalidad: str
+    entity_type: str = "participante"
+    course_start_date: Optional[date] = None
+    course_end_date: Optional[date] = None
+    docente_specialty: Optional[str] = None
+    competencies: Optional[Tuple[str, ...]] = None
+
+
+def draw_request(c: canvas.Canvas, request: CertificateRenderRequest) -> None:
+    """
+    Dibuja en 'c' la capa de una solicitud, eligiendo entre reconocimiento y constancia.
+    """
+    if (
+        request.entity_type == "participante"
+        and request.tipo_producto == TipoProductoEnum.CURSO_EDUCATIVO
+        and request.competencies
+    ):
+        draw_recognition(
+            c,
+            participant_name=request.participant_name,
+            course_name=request.course_name,
+            hours=request.hours,
+            issue_date=request.issue_date,
+            serial=request.serial,
+            qr_token=request.serial,
+            competencies=list(request.competencies)
+        )
+        return
+
+    draw_certificate(
+        c,
+        participant_name=request.participant_name,
+        course_name=request.course_name,
+        hours=request.hours,
+        issue_date=request.issue_date,
+        serial=request.serial,
+        qr_token=request.serial,
+        entity_type=request.entity_type,
+        tipo_producto=request.tipo_producto,
+        modalidad=request.modalidad,
+        course_start_date=request.course_start_date,
+        course_end_date=request.course_end_date,
+        docente_specialty=request.docente_specialty
+    )
+
+
+def render_certificate(request: CertificateRenderRequest, template_path: Optional[str] = None) -> bytes:
+    """
+    Renderiza una sola solicitud: dibuja su capa con ReportLab y la combina
+    con la plantilla base.
+    """
+    packet = BytesIO()
+    c = canvas.Canvas(packet, pagesize=letter)
+    draw_request(c, request)
     c.save()
     packet.seek(0)
-    
-    # Merge con PDF base
-    new_pdf = PdfReader(packet)
-    with open(template_path, "rb") as tpl:
-        existing_pdf = PdfReader(tpl)
-        output = PdfWriter()
-        page = existing_pdf.pages[0]
-        page.merge_page(new_pdf.pages[0])
-        output.add_page(page)
-        with BytesIO() as buffer:
-            output.write(buffer)
-            return buffer.getvalue()
\ No newline at end of file
+
+    return merge_with_template(packet, template_path)
+
+
+def _warm_render_worker(template_path: Optional[str]) -> None:
+    """
+    Inicializador de cada proceso del pool: las fuentes quedan registradas al
+    importar este módulo y aquí se precarga la plantilla en el registro.
+    """
+    template_registry.get_page(template_path)
+
+
+def _render_chunk(
+    requests: List[CertificateRenderRequest],
+    template_path: Optional[str]
+) -> List[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Renderiza un bloque dentro de un proceso del pool. Los errores se devuelven
+    como texto para no depender de que la excepción sea serializable.
+    """
+    results = []
+    for request in requests:
+        try:
+            results.append((request.serial, render_certificate(request, template_path), None))
+        except Exception as e:
+            results.append((request.serial, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _render_batch_parallel(
+    requests: List[CertificateRenderRequest],
+    template_path: Optional[str],
+    errors: Optional[list],
+    workers: int,
+    chunk_size: int,
+    procesados: set
+) -> Iterator[Tuple[str, bytes]]:
+    chunks = [requests[i:i + chunk_size] for i in range(0, len(requests), chunk_size)]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_warm_render_worker,
+        initargs=(template_path,)
+    ) as executor:
+        # Como máximo dos bloques en vuelo por proceso para acotar la memoria
+        max_in_flight = workers * 2
+        pending = set()
+        next_chunk = 0
+
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < max_in_flight:
+                pending.add(executor.submit(_render_chunk, chunks[next_chunk], template_path))
+                next_chunk += 1
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                for serial, pdf_bytes, error in future.result():
+                    procesados.add(serial)
+                    if error is not None:
+                        if errors is None:
+                            raise RuntimeError(error)
+                        errors.append((serial, RuntimeError(error)))
+                        continue
+                    yield serial, pdf_bytes
+
+
+def render_batch(
+    requests: Iterable[CertificateRenderRequest],
+    template_path: Optional[str] = None,
+    errors: Optional[list] = None,
+    workers: int = 1,
+    chunk_size: int = 10
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Renderiza N constancias en una sola pasada y las entrega conforme se generan,
+    como pares (folio, bytes), para que el llamador pueda escribirlas a disco
+    sin acumular el lote completo en memoria.
+
+    La página base de la plantilla, las fuentes registradas y los estilos de
+    párrafo se comparten entre todas las constancias del lote.
+
+    Con workers > 1 el render (CPU puro de ReportLab/PyPDF2) se reparte en un
+    pool de procesos precalentados, en bloques de 'chunk_size'; el orden de
+    entrega puede no coincidir con el de las solicitudes. Dentro de un proceso
+    daemon (worker prefork de Celery) o si el pool no arranca, se renderiza en serie.
+
+    Si se proporciona 'errors', los fallos se agregan como (folio, excepción)
+    y el lote continúa; si no, la excepción se propaga.
+    """
+    # Los workers de Celery (prefork) son procesos daemon y no pueden tener hijos
+    if workers > 1 and not multiprocessing.current_process().daemon:
+        requests = list(requests)
+        if len(requests) > chunk_size:
+            procesados: set = set()
+            try:
+                yield from _render_batch_parallel(
+                    requests, template_path, errors, workers, max(1, chunk_size), procesados
+                )
+                return
+            except (OSError, AssertionError, BrokenProcessPool) as e:
+                # Sin pool se sigue en serie con lo que faltó por renderizar
+                logger.warning("Pool de render no disponible (%s); se continúa en serie", e)
+                requests = [r for r in requests if r.serial not in procesados]
+
+    # Cargar la plantilla una sola vez antes de empezar el lote
+    template_registry.get_page(template_path)
+
+    for request in requests:
+        try:
+            pdf_bytes = render_certificate(request, template_path)
+        except Exception as e:
+            if errors is None:
+                raise
+            errors.append((request.serial, e))
+            continue
+
+        yield request.serial, pdf_bytes
+
+
+# -------------------------------------------------------------------
+# ✔ PDF DE IMPRESIÓN: TODAS LAS CONSTANCIAS EN UN SOLO DOCUMENTO
+# -------------------------------------------------------------------
+def render_print_batch(
+    requests: Iterable[CertificateRenderRequest],
+    template_path: Optional[str] = None
+) -> bytes:
+    """
+    Genera un solo PDF multipágina (una constancia por página) para imprimir.
+    Todas las capas se dibujan en un mismo canvas de ReportLab, así que las
+    fuentes TTF se incrustan una sola vez, y la plantilla se agrega una sola
+    vez como XObject: el tamaño crece por la capa de texto de cada página,
+    no por la plantilla completa.
+    """
+    packet = BytesIO()
+    c = canvas.Canvas(packet, pagesize=letter)
+    paginas = 0
+    for request in requests:
+        draw_request(c, request)
+        c.showPage()
+        paginas += 1
+    if not paginas:
+        raise ValueError("No hay constancias para el PDF de impresión.")
+    c.save()
+    packet.seek(0)
+
+    return merge_with_template(packet, template_path)
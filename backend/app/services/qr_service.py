@@ -1,17 +1,81 @@
 import qrcode
 from io import BytesIO
+from functools import lru_cache
 from app.core.config import settings # ✅ Importar settings para BASE_URL
-from typing import Optional
+from typing import Optional, Tuple
 
 # 🎯 CORRECCIÓN: La ruta real del frontend es /verificacion/
 VERIFICATION_PATH = "/verificacion/" 
 
-# Mantenemos la función original generate_qr_png(data: str) para compatibilidad con pdf_service.py
+# Número de URLs distintas cuya matriz QR se conserva en memoria (reemisiones, vistas previas)
+QR_CACHE_SIZE = 2048
+
+# Mantenemos la función original generate_qr_png(data: str) por compatibilidad
+@lru_cache(maxsize=QR_CACHE_SIZE)
 def generate_qr_png(data: str) -> bytes:
     img = qrcode.make(data)
     buf = BytesIO(); img.save(buf, format="PNG")
     return buf.getvalue()
 
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def get_qr_matrix(data: str) -> Tuple[Tuple[bool, ...], ...]:
+    """
+    Calcula la matriz de módulos del QR (incluyendo el margen blanco), con los
+    mismos parámetros que qrcode.make. No usa PIL y el resultado se memoiza por URL.
+    """
+    qr = qrcode.QRCode()
+    qr.add_data(data)
+    qr.make(fit=True)
+    return tuple(tuple(row) for row in qr.get_matrix())
+
+
+def draw_qr(c, data: str, x: float, y: float, size: float) -> None:
+    """
+    Dibuja el QR como rectángulos vectoriales directamente sobre el canvas de
+    ReportLab, en el cuadrado (x, y, size). Los módulos oscuros contiguos de
+    cada fila se agrupan en un solo rectángulo para reducir el contenido del PDF.
+
+    Los rectángulos se emiten dentro de un Form XObject: así el contenido de la
+    página solo lleva una instrucción 'Do' y PyPDF2 no tiene que analizar cientos
+    de operadores al combinar la capa con la plantilla.
+    """
+    matrix = get_qr_matrix(data)
+    modules = len(matrix)
+    module_size = size / modules
+
+    # El nombre del XObject es único por documento: en el PDF de impresión
+    # varias constancias comparten el mismo canvas (un QR por página)
+    pagina = c.getPageNumber()
+    form_name = "qr_verificacion" if pagina == 1 else f"qr_verificacion_{pagina}"
+    c.beginForm(form_name, x, y, x + size, y + size)
+    c.saveState()
+
+    # Fondo blanco, igual que la imagen PNG que se usaba antes
+    c.setFillColorRGB(1, 1, 1)
+    c.rect(x, y, size, size, stroke=0, fill=1)
+
+    path = c.beginPath()
+    for row_index, row in enumerate(matrix):
+        # La fila 0 de la matriz es la superior; en PDF el eje Y crece hacia arriba
+        row_y = y + size - (row_index + 1) * module_size
+        col = 0
+        while col < modules:
+            if not row[col]:
+                col += 1
+                continue
+            start = col
+            while col < modules and row[col]:
+                col += 1
+            path.rect(x + start * module_size, row_y, (col - start) * module_size, module_size)
+
+    c.setFillColorRGB(0, 0, 0)
+    c.drawPath(path, stroke=0, fill=1)
+    c.restoreState()
+    c.endForm()
+
+    c.doForm(form_name)
+
 # Esta función ya no se usa directamente en pdf_service.py, pero la corregimos por si acaso.
 def generate_qr_png_with_serial(serial: str, size: int = 250) -> Optional[bytes]:
     """
@@ -0,0 +1,324 @@
+# backend/app/services/stats_service.py
+
+import json
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterable, Optional
+
+import redis
+from sqlalchemy import case, event, extract, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models
+from app.core.config import get_settings
+from app.models.enums import EstadoCorreoEnum
+from app.services.job_progress import get_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+STATS_CACHE_KEY = "lania:stats:admin"
+
+# Modelos cuyos cambios invalidan las estadísticas del panel
+_TRACKED_MODELS = (
+    models.Certificado,
+    models.Inscripcion,
+    models.Participante,
+    models.Docente,
+    models.ProductoEducativo,
+    models.Administrador,
+    models.EstadisticaCertificadosMes,
+    models.EstadisticaInscripcionesProducto,
+    models.EstadisticaCorreosMes,
+)
+
+
+# ============================================================
+# TABLAS RESUMEN: ACTUALIZACIÓN INCREMENTAL
+# ============================================================
+# Se llaman dentro de la transacción que escribe los datos, así que el resumen
+# se confirma o se deshace junto con ellos. Para borrar se usa signo=-1.
+
+def _incrementar(db: Session, model, claves: dict, **incrementos: int) -> None:
+    """UPSERT que suma 'incrementos' a la fila identificada por 'claves'."""
+    incrementos = {k: v for k, v in incrementos.items() if v}
+    if not incrementos:
+        return
+    dialecto = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialecto.insert(model).values(**claves, **incrementos)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(claves),
+        set_={campo: getattr(model, campo) + stmt.excluded[campo] for campo in incrementos},
+    )
+    db.execute(stmt)
+
+
+# Los resúmenes mensuales se agrupan por mes UTC en los tres caminos: emisión
+# masiva, emisión individual/correos y reconstrucción desde SQL.
+def _mes_utc(fecha: Optional[datetime]) -> tuple[int, int]:
+    """(año, mes) UTC de una fecha; las fechas sin zona se toman como UTC."""
+    if fecha is None:
+        fecha = datetime.now(timezone.utc)
+    elif fecha.tzinfo is not None:
+        fecha = fecha.astimezone(timezone.utc)
+    return fecha.year, fecha.month
+
+
+def _mes_utc_sql(db: Session, columna):
+    """Equivalente en SQL de _mes_utc: expresiones (año, mes) UTC de la columna."""
+    if db.get_bind().dialect.name == "postgresql":
+        # extract() sobre timestamptz usaría la zona de la sesión
+        columna = func.timezone("UTC", columna)
+    return extract("year", columna), extract("month", columna)
+
+
+def _campo(registro, nombre):
+    return registro.get(nombre) if isinstance(registro, dict) else getattr(registro, nombre)
+
+
+def registrar_certificados(db: Session, certificados: Iterable, signo: int = 1) -> None:
+    """
+    Suma (o resta) certificados al resumen por producto y mes. Acepta modelos
+    Certificado o los diccionarios que se pasan a insert(Certificado).
+    """
+    conteos: dict = {}
+    for cert in certificados:
+        clave = (_campo(cert, "producto_educativo_id"), *_mes_utc(_campo(cert, "fecha_emision")))
+        fila = conteos.setdefault(clave, Counter())
+        fila["docentes" if _campo(cert, "docente_id") else "participantes"] += signo
+        if _campo(cert, "con_competencias"):
+            fila["con_competencias"] += signo
+
+    for (producto_id, anio, mes), fila in conteos.items():
+        _incrementar(
+            db, models.EstadisticaCertificadosMes,
+            {"producto_educativo_id": producto_id, "anio": anio, "mes": mes},
+            **fila,
+        )
+
+
+def registrar_inscripciones(db: Session, producto_id: int, cantidad: int) -> None:
+    _incrementar(
+        db, models.EstadisticaInscripcionesProducto,
+        {"producto_educativo_id": producto_id},
+        total=cantidad,
+    )
+
+
+def registrar_correos(
+    db: Session,
+    enviados: Iterable[datetime] = (),
+    fallidos: Iterable[datetime] = (),
+) -> None:
+    """Cuenta los correos enviados (por fecha de envío) y los que quedaron FALLIDO (por fecha de creación)."""
+    conteos: dict = {}
+    for campo, fechas in (("enviados", enviados), ("fallidos", fallidos)):
+        for fecha in fechas:
+            conteos.setdefault(_mes_utc(fecha), Counter())[campo] += 1
+
+    for (anio, mes), fila in conteos.items():
+        _incrementar(db, models.EstadisticaCorreosMes, {"anio": anio, "mes": mes}, **fila)
+
+
+def reconstruir_estadisticas(db: Session) -> dict:
+    """
+    Recalcula las tablas resumen desde cero a partir de las tablas base
+    (carga inicial o corrección tras cambios hechos fuera de la aplicación).
+    """
+    cert = models.Certificado
+    anio, mes = _mes_utc_sql(db, cert.fecha_emision)
+    certificados = [
+        {
+            "producto_educativo_id": producto_id,
+            "anio": int(a),
+            "mes": int(m),
+            "participantes": participantes,
+            "docentes": docentes,
+            "con_competencias": con_comp or 0,
+        }
+        for producto_id, a, m, participantes, docentes, con_comp in (
+            db.query(
+                cert.producto_educativo_id, anio, mes,
+                func.count(cert.inscripcion_id),
+                func.count(cert.docente_id),
+                func.sum(case((cert.con_competencias == True, 1), else_=0)),
+            )
+            .filter(cert.fecha_emision.isnot(None))
+            .group_by(cert.producto_educativo_id, anio, mes)
+        )
+    ]
+
+    inscripciones = [
+        {"producto_educativo_id": producto_id, "total": total}
+        for producto_id, total in (
+            db.query(models.Inscripcion.producto_educativo_id, func.count(models.Inscripcion.id))
+            .group_by(models.Inscripcion.producto_educativo_id)
+        )
+    ]
+
+    envio = models.EmailOutbox
+    correos: dict = {}
+    for campo, estado, columna in (
+        ("enviados", EstadoCorreoEnum.ENVIADO, envio.fecha_envio),
+        ("fallidos", EstadoCorreoEnum.FALLIDO, envio.fecha_creacion),
+    ):
+        a, m = _mes_utc_sql(db, columna)
+        for anio_, mes_, total in (
+            db.query(a, m, func.count(envio.id))
+            .filter(envio.estado == estado, columna.isnot(None))
+            .group_by(a, m)
+        ):
+            fila = correos.setdefault((int(anio_), int(mes_)), {"anio": int(anio_), "mes": int(mes_), "enviados": 0, "fallidos": 0})
+            fila[campo] = total
+
+    try:
+        for model, filas in (
+            (models.EstadisticaCertificadosMes, certificados),
+            (models.EstadisticaInscripcionesProducto, inscripciones),
+            (models.EstadisticaCorreosMes, list(correos.values())),
+        ):
+            db.query(model).delete()
+            if filas:
+                db.execute(insert(model), filas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "certificados_mes": len(certificados),
+        "inscripciones_producto": len(inscripciones),
+        "correos_mes": len(correos),
+    }
+
+
+# ============================================================
+# CÁLCULO (desde las tablas resumen)
+# ============================================================
+def compute_admin_stats(db: Session) -> dict:
+    resumen = models.EstadisticaCertificadosMes
+    total_resumen = resumen.participantes + resumen.docentes
+
+    participantes_cert, docentes_cert, con_competencias = db.query(
+        func.coalesce(func.sum(resumen.participantes), 0),
+        func.coalesce(func.sum(resumen.docentes), 0),
+        func.coalesce(func.sum(resumen.con_competencias), 0),
+    ).one()
+    total_certificados = participantes_cert + docentes_cert
+
+    totales = {
+        "productos": db.query(func.count(models.ProductoEducativo.id))
+            .filter(models.ProductoEducativo.is_active == True).scalar(),
+        "participantes": db.query(func.count(models.Participante.id))
+            .filter(models.Participante.is_deleted == False).scalar(),
+        "docentes": db.query(func.count(models.Docente.id)).scalar(),
+        "administradores": db.query(func.count(models.Administrador.id)).scalar(),
+        "inscripciones": db.query(
+            func.coalesce(func.sum(models.EstadisticaInscripcionesProducto.total), 0)
+        ).scalar(),
+        "certificados": total_certificados,
+    }
+
+    por_destinatario = {"participantes": participantes_cert, "docentes": docentes_cert}
+    por_competencias = {
+        "con_competencias": con_competencias,
+        "sin_competencias": total_certificados - con_competencias,
+    }
+
+    por_tipo_producto = {}
+    for tipo, total in (
+        db.query(models.ProductoEducativo.tipo_producto, func.sum(total_resumen))
+        .join(models.ProductoEducativo, resumen.producto_educativo_id == models.ProductoEducativo.id)
+        .group_by(models.ProductoEducativo.tipo_producto)
+    ):
+        if total:
+            por_tipo_producto[tipo.value if tipo else "SIN_TIPO"] = total
+
+    por_mes = [
+        {"mes": f"{anio:04d}-{mes:02d}", "total": total}
+        for anio, mes, total in (
+            db.query(resumen.anio, resumen.mes, func.sum(total_resumen))
+            .group_by(resumen.anio, resumen.mes)
+            .order_by(resumen.anio, resumen.mes)
+        )
+        if total
+    ]
+
+    enviados, fallidos = db.query(
+        func.coalesce(func.sum(models.EstadisticaCorreosMes.enviados), 0),
+        func.coalesce(func.sum(models.EstadisticaCorreosMes.fallidos), 0),
+    ).one()
+
+    return {
+        "totales": totales,
+        "certificados_por_destinatario": por_destinatario,
+        "certificados_por_competencias": por_competencias,
+        "certificados_por_tipo_producto": por_tipo_producto,
+        "certificados_por_mes": por_mes,
+        "correos": {"enviados": enviados, "fallidos": fallidos},
+        "generado_en": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+# ============================================================
+# CACHÉ EN REDIS (compartida por la API y los workers)
+# ============================================================
+def get_admin_stats(db: Session) -> dict:
+    """
+    Devuelve las estadísticas del panel desde Redis (TTL STATS_CACHE_SECONDS);
+    si no están o Redis no responde, se calculan en SQL.
+    """
+    try:
+        cached = get_redis().get(STATS_CACHE_KEY)
+        if cached:
+            return json.loads(cached)
+    except redis.RedisError as e:
+        logger.warning(f"No se pudo leer la caché de estadísticas: {e}")
+
+    stats = compute_admin_stats(db)
+
+    try:
+        get_redis().setex(STATS_CACHE_KEY, settings.STATS_CACHE_SECONDS, json.dumps(stats))
+    except redis.RedisError as e:
+        logger.warning(f"No se pudo guardar la caché de estadísticas: {e}")
+    return stats
+
+
+def invalidate_admin_stats() -> None:
+    try:
+        get_redis().delete(STATS_CACHE_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"No se pudo invalidar la caché de estadísticas: {e}")
+
+
+# ============================================================
+# INVALIDACIÓN AUTOMÁTICA AL ESCRIBIR
+# ============================================================
+# Se marca la sesión cuando escribe alguno de los modelos observados (ORM o
+# insert()/update()/delete() masivos) y se invalida la caché tras el commit.
+
+@event.listens_for(Session, "after_flush")
+def _mark_stats_dirty_on_flush(session, flush_context):
+    if any(
+        isinstance(obj, _TRACKED_MODELS)
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ):
+        session.info["stats_dirty"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_stats_dirty_on_bulk(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _TRACKED_MODELS):
+        orm_execute_state.session.info["stats_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stats_after_commit(session):
+    if session.info.pop("stats_dirty", False):
+        invalidate_admin_stats()
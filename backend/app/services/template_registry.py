@@ -0,0 +1,158 @@
+# backend/app/services/template_registry.py
+
+import hashlib
+import os
+import threading
+import zlib
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from PyPDF2 import PdfReader
+from PyPDF2._page import PageObject
+
+# Plantilla base usada por todas las constancias y reconocimientos
+DEFAULT_TEMPLATE_PATH = "app/static/Formato constancias.pdf"
+
+# Nivel zlib con el que se recomprimen las imágenes de la plantilla al cargarla
+TEMPLATE_ZLIB_LEVEL = 9
+
+
+def _flate_filter(obj) -> bool:
+    filtro = obj.get("/Filter")
+    if isinstance(filtro, list):
+        filtro = filtro[0] if len(filtro) == 1 else None
+    return filtro == "/FlateDecode" and "/DecodeParms" not in obj
+
+
+def recompress_images(page: PageObject) -> int:
+    """
+    Recomprime con TEMPLATE_ZLIB_LEVEL las imágenes Flate de la página (y sus
+    máscaras /SMask). Cada constancia copia estas imágenes, así que lo que se
+    ahorra aquí una vez se ahorra en cada PDF emitido. Es sin pérdida: solo
+    cambia el nivel de compresión del mismo contenido. Devuelve los bytes ahorrados.
+    """
+    recursos = page.get("/Resources")
+    if recursos is None:
+        return 0
+    pendientes = list(recursos.get_object().get("/XObject", {}).values())
+    vistos = set()
+    ahorro = 0
+
+    while pendientes:
+        obj = pendientes.pop().get_object()
+        if id(obj) in vistos:
+            continue
+        vistos.add(id(obj))
+
+        subtipo = obj.get("/Subtype")
+        if subtipo == "/Form":
+            form_recursos = obj.get("/Resources")
+            if form_recursos is not None:
+                pendientes.extend(form_recursos.get_object().get("/XObject", {}).values())
+            continue
+        if subtipo != "/Image":
+            continue
+        if "/SMask" in obj:
+            pendientes.append(obj["/SMask"])
+        if not _flate_filter(obj):
+            continue
+
+        try:
+            nuevo = zlib.compress(zlib.decompress(obj._data), TEMPLATE_ZLIB_LEVEL)
+        except zlib.error:
+            continue
+        if len(nuevo) < len(obj._data):
+            ahorro += len(obj._data) - len(nuevo)
+            obj._data = nuevo
+            obj.decoded_self = None
+
+    return ahorro
+
+
+class _TemplateEntry(NamedTuple):
+    mtime_ns: int
+    size: int
+    sha256: str
+    reader: PdfReader
+    page: PageObject
+
+
+class TemplateRegistry:
+    """
+    Registro de plantillas PDF en memoria.
+
+    Cada plantilla se analiza una sola vez por proceso y su primera página se
+    conserva como página base inmutable: los generadores nunca la modifican,
+    sino que la clonan en su propio PdfWriter antes de combinarla.
+    La plantilla solo se vuelve a leer si cambia su mtime/tamaño, y solo se
+    vuelve a analizar si además cambia su hash sha256. Al analizarla se
+    recomprimen sus imágenes (recompress_images), antes de compartirla.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _TemplateEntry] = {}
+        self._lock = threading.Lock()
+
+    def get_page(self, template_path: Optional[str] = None) -> PageObject:
+        """Devuelve la página base (sin modificar) de la plantilla indicada."""
+        return self._get_entry(template_path).page
+
+    def new_page(self, template_path: Optional[str] = None) -> PageObject:
+        """
+        Devuelve una copia superficial de la página base, lista para combinarse.
+        merge_page solo reasigna /Contents, /Resources y /Annots de la página
+        destino, así que la copia protege a la página base sin volver a analizar
+        el PDF: los objetos internos siguen compartidos con el lector en caché.
+        """
+        base = self.get_page(template_path)
+        page = PageObject(pdf=base.pdf)
+        page.update(base)
+        return page
+
+    def get_sha256(self, template_path: Optional[str] = None) -> str:
+        """Devuelve el hash sha256 del archivo de plantilla actualmente cargado."""
+        return self._get_entry(template_path).sha256
+
+    def clear(self) -> None:
+        """Descarta todas las plantillas cargadas (se recargan en el siguiente uso)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _get_entry(self, template_path: Optional[str]) -> _TemplateEntry:
+        path = os.path.abspath(template_path or DEFAULT_TEMPLATE_PATH)
+        stat = os.stat(path)
+
+        entry = self._entries.get(path)
+        if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry
+
+        with self._lock:
+            # Otro hilo pudo haberla recargado mientras esperábamos el lock
+            entry = self._entries.get(path)
+            if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                return entry
+
+            data = Path(path).read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+
+            if entry and entry.sha256 == digest:
+                # El archivo se tocó pero su contenido es el mismo: no se vuelve a analizar
+                entry = entry._replace(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            else:
+                reader = PdfReader(BytesIO(data))
+                recompress_images(reader.pages[0])
+                entry = _TemplateEntry(
+                    mtime_ns=stat.st_mtime_ns,
+                    size=stat.st_size,
+                    sha256=digest,
+                    reader=reader,
+                    page=reader.pages[0],
+                )
+
+            self._entries[path] = entry
+            return entry
+
+
+# Instancia compartida por todo el proceso
+template_registry = TemplateRegistry()
@@ -0,0 +1,186 @@
+# backend/app/services/verification_cache.py
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import redis
+
+from app.core.config import get_settings
+from app.services.job_progress import get_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Valor guardado en Redis para un folio que no existe (caché negativa)
+_NO_EXISTE = "__no_existe__"
+
+
+def _verify_key(folio: str) -> str:
+    return f"lania:verify:{folio}"
+
+
+class _LRUCache:
+    """
+    LRU en memoria con caducidad por entrada. Guarda None para los folios
+    inexistentes, por eso se distingue 'no está en caché' con un centinela.
+    """
+
+    MISS = object()
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, tuple[float, Optional[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return self.MISS
+            expira, valor = item
+            if expira < time.monotonic():
+                del self._items[key]
+                return self.MISS
+            self._items.move_to_end(key)
+            return valor
+
+    def set(self, key: str, valor: Optional[dict], ttl: float) -> None:
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, valor)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_local_cache = _LRUCache(settings.VERIFY_CACHE_MAX_ENTRIES)
+
+
+# ============================================================
+# LECTURA CON CACHÉ (memoria -> Redis -> BD)
+# ============================================================
+def get_cached_verification(folio: str, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+    """
+    Devuelve el payload público del certificado (CertificadoPublic serializado)
+    o None si el folio no existe. Solo se llama a 'loader' (la consulta a la BD)
+    cuando el folio no está ni en memoria ni en Redis.
+    Los folios inexistentes se guardan con VERIFY_CACHE_NEGATIVE_TTL_SECONDS para
+    que los escaneos de folios erróneos tampoco lleguen a PostgreSQL.
+    """
+    valor = _local_cache.get(folio)
+    if valor is not _LRUCache.MISS:
+        return valor
+
+    if settings.VERIFY_CACHE_USE_REDIS:
+        try:
+            cached = get_redis().get(_verify_key(folio))
+            if cached is not None:
+                valor = _decode(cached)
+                _guardar_local(folio, valor)
+                return valor
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo leer la caché de verificación de {folio}: {e}")
+
+    valor = loader()
+    _guardar_local(folio, valor)
+    _guardar_redis({folio: valor})
+    return valor
+
+
+def get_cached_verifications(
+    folios: List[str],
+    loader: Callable[[List[str]], Tuple[Dict[str, dict], Set[str]]],
+) -> Tuple[Dict[str, Optional[dict]], Set[str]]:
+    """
+    Versión por lote: resuelve los folios desde memoria, luego con un solo MGET
+    en Redis, y llama a 'loader' una vez con los que falten (una consulta IN).
+    'loader' devuelve los folios encontrados y los que existen pero no se pudieron
+    armar (error de integridad). Los que no están en ninguno de los dos se guardan
+    como inexistentes con el TTL negativo; los que tienen error no se guardan en
+    caché y se devuelven aparte para reportarlos como tales.
+    """
+    resultados: Dict[str, Optional[dict]] = {}
+    con_error: Set[str] = set()
+    faltantes = []
+    for folio in folios:
+        valor = _local_cache.get(folio)
+        if valor is _LRUCache.MISS:
+            faltantes.append(folio)
+        else:
+            resultados[folio] = valor
+
+    if faltantes and settings.VERIFY_CACHE_USE_REDIS:
+        try:
+            cached = get_redis().mget([_verify_key(f) for f in faltantes])
+            pendientes = []
+            for folio, valor in zip(faltantes, cached):
+                if valor is None:
+                    pendientes.append(folio)
+                else:
+                    resultados[folio] = _decode(valor)
+                    _guardar_local(folio, resultados[folio])
+            faltantes = pendientes
+        except redis.RedisError as e:
+            logger.warning(f"No se pudo leer la caché de verificación por lote: {e}")
+
+    if faltantes:
+        encontrados, con_error = loader(faltantes)
+        nuevos = {folio: encontrados.get(folio) for folio in faltantes if folio not in con_error}
+        for folio, valor in nuevos.items():
+            _guardar_local(folio, valor)
+        _guardar_redis(nuevos)
+        resultados.update(nuevos)
+
+    return resultados, con_error
+
+
+def _decode(cached: bytes) -> Optional[dict]:
+    return None if cached.decode() == _NO_EXISTE else json.loads(cached)
+
+
+def _guardar_redis(valores: Dict[str, Optional[dict]]) -> None:
+    if not settings.VERIFY_CACHE_USE_REDIS or not valores:
+        return
+    try:
+        pipe = get_redis().pipeline()
+        for folio, valor in valores.items():
+            if valor is None:
+                pipe.setex(_verify_key(folio), settings.VERIFY_CACHE_NEGATIVE_TTL_SECONDS, _NO_EXISTE)
+            else:
+                pipe.setex(_verify_key(folio), settings.VERIFY_CACHE_TTL_SECONDS, json.dumps(valor))
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"No se pudo guardar la caché de verificación: {e}")
+
+
+def _guardar_local(folio: str, valor: Optional[dict]) -> None:
+    # En memoria el TTL es corto: una invalidación en otro proceso solo llega a Redis
+    if valor is None:
+        ttl = min(settings.VERIFY_CACHE_NEGATIVE_TTL_SECONDS, settings.VERIFY_CACHE_LOCAL_TTL_SECONDS)
+    else:
+        ttl = settings.VERIFY_CACHE_LOCAL_TTL_SECONDS
+    _local_cache.set(folio, valor, ttl)
+
+
+def invalidate_verification(folio: str) -> None:
+    """Quita el folio de la caché (por ejemplo, al eliminar el certificado)."""
+    _local_cache.delete(folio)
+    if not settings.VERIFY_CACHE_USE_REDIS:
+        return
+    try:
+        get_redis().delete(_verify_key(folio))
+    except redis.RedisError as e:
+        logger.warning(f"No se pudo invalidar la caché de verificación de {folio}: {e}")
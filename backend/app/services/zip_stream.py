@@ -0,0 +1,59 @@
+# backend/app/services/zip_stream.py
+
+import zipfile
+from typing import Iterable, Iterator, NamedTuple, Tuple
+
+
+class ZipEntry(NamedTuple):
+    name: str
+    date_time: Tuple[int, int, int, int, int, int]
+    # Bloques del contenido; se consumen mientras se escribe el ZIP
+    chunks: Iterable[bytes]
+
+
+class _Salida:
+    """
+    Destino no posicionable para zipfile: acumula lo escrito hasta que el
+    generador lo entrega. Al no tener seek(), zipfile escribe cada entrada
+    con 'data descriptor' (tamaños y CRC después del contenido).
+    """
+
+    def __init__(self):
+        self._partes: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._partes.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._partes)
+        self._partes.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[ZipEntry]) -> Iterator[bytes]:
+    """
+    Genera un ZIP por partes sin guardarlo en memoria ni en disco: en cada
+    momento solo se retiene el bloque que se está escribiendo. Las entradas
+    van sin comprimir (STORED): los PDF ya están comprimidos y así el costo
+    es solo copiar bytes. Usa ZIP64 automáticamente si el archivo pasa de 4 GB.
+    """
+    salida = _Salida()
+    with zipfile.ZipFile(salida, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for entry in entries:
+            info = zipfile.ZipInfo(entry.name, date_time=entry.date_time)
+            info.compress_type = zipfile.ZIP_STORED
+            with zf.open(info, "w") as destino:
+                for chunk in entry.chunks:
+                    destino.write(chunk)
+                    data = salida.drain()
+                    if data:
+                        yield data
+            data = salida.drain()
+            if data:
+                yield data
+    # Directorio central
+    yield salida.drain()
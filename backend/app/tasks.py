@@ -2,19 +2,28 @@
 
 import sys
 import os
-from typing import List
+from typing import List, Optional
+
+from celery import chord, group
 
 # Importaciones necesarias para Celery:
+from app import models
+from app.core.config import settings
 from app.database import SessionLocal 
-from app.services.certificate_service import CertificateService
+from app.services.certificate_service import CertificateService, merge_bulk_stats
+from app.services.email_service import process_outbox_batch
+from app.services.job_progress import JobProgress
+# Registra la invalidación de la caché de estadísticas también en los workers
+from app.services import stats_service  # noqa: F401
 from app.celery_app import celery_app  # Instancia de Celery
 
 # Ajuste para importaciones absolutas al ejecutar el worker directamente
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # 💡 TAREA CELERY QUE ACEPTA DOS PARÁMETROS
-@celery_app.task(name="emitir_y_enviar_certificados_masivamente")
+@celery_app.task(name="emitir_y_enviar_certificados_masivamente", bind=True)
 def emitir_y_enviar_certificados_masivamente_job(
+    self,
     producto_id: int,
     emitir_con_competencias: bool = False
 ):
@@ -23,29 +32,124 @@ def emitir_y_enviar_certificados_masivamente_job(
     Recibe dos argumentos:
       - producto_id (int)
       - emitir_con_competencias (bool)
+
+    No procesa el producto completo: divide las inscripciones en lotes de
+    BULK_EMISSION_CHUNK_SIZE y se reemplaza por un chord (group de lotes +
+    callback que consolida las estadísticas). El id de esta tarea conserva
+    el resultado final, así que /admin/jobs/{id} sigue funcionando igual.
     """
+    job_id = self.request.id
 
-    # Abrir sesión de DB exclusiva para el worker
     with SessionLocal() as db:
-        try:
-            cert_service = CertificateService(db)
+        producto = db.query(models.ProductoEducativo).filter(models.ProductoEducativo.id == producto_id).first()
+        if not producto:
+            raise RuntimeError(f"ProductoEducativo id={producto_id} no encontrado")
 
-            # Ejecutar lógica de negocio usando ambos argumentos
-            result = cert_service.emitir_y_enviar_masivamente(
-                producto_id=producto_id,
-                con_competencias=emitir_con_competencias
-            )
+        inscripcion_ids = [
+            row.id
+            for row in db.query(models.Inscripcion.id)
+            .filter(models.Inscripcion.producto_educativo_id == producto_id)
+            .order_by(models.Inscripcion.id)
+        ]
+        total_docentes = len(producto.docentes or [])
+
+    JobProgress(job_id).set_total(len(inscripcion_ids) + total_docentes)
+
+    size = max(1, settings.BULK_EMISSION_CHUNK_SIZE)
+    lotes = [
+        emitir_lote_certificados_job.s(
+            producto_id, emitir_con_competencias, inscripcion_ids[i:i + size], False, job_id
+        )
+        for i in range(0, len(inscripcion_ids), size)
+    ]
+    # Los docentes van en su propio lote (son pocos y solo llevan constancia tradicional)
+    lotes.append(emitir_lote_certificados_job.s(producto_id, emitir_con_competencias, [], True, job_id))
+
+    return self.replace(
+        chord(
+            group(lotes),
+            consolidar_emision_masiva_job.s(producto_id, emitir_con_competencias, job_id),
+        )
+    )
 
-            # Celery exige que el resultado sea JSON serializable
-            return {
-                "status": "completed",
-                "producto_id": producto_id,
-                "con_competencias": emitir_con_competencias,
-                "result": result
-            }
 
+# acks_late + reject_on_worker_lost: si el worker muere, Redis vuelve a entregar el lote
+# y los checkpoints del job evitan repetir lo ya emitido/encolado.
+@celery_app.task(
+    name="emitir_lote_certificados",
+    acks_late=True,
+    reject_on_worker_lost=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=3,
+)
+def emitir_lote_certificados_job(
+    producto_id: int,
+    emitir_con_competencias: bool,
+    inscripcion_ids: List[int],
+    incluir_docentes: bool = False,
+    job_id: Optional[str] = None,
+):
+    """
+    Emite las constancias de un lote de inscripciones (y/o de los docentes).
+    job_id es el id de la tarea original, bajo el que se publican los contadores de avance.
+    """
+    with SessionLocal() as db:
+        try:
+            return CertificateService(db, JobProgress(job_id)).emitir_y_enviar_masivamente(
+                producto_id=producto_id,
+                con_competencias=emitir_con_competencias,
+                inscripcion_ids=inscripcion_ids,
+                incluir_docentes=incluir_docentes,
+            )
         except Exception as e:
-            print(f"ERROR en tarea Celery para producto {producto_id}: {e}")
-            # Si quieres habilitar retries, usa:
-            # raise emitir_y_enviar_certificados_masivamente_job.retry(exc=e, countdown=60, max_retries=3)
+            print(f"ERROR en lote de emisión para producto {producto_id}: {e}")
             raise
+
+
+@celery_app.task(name="consolidar_emision_masiva")
+def consolidar_emision_masiva_job(
+    resultados: List[dict],
+    producto_id: int,
+    emitir_con_competencias: bool = False,
+    job_id: Optional[str] = None,
+):
+    """Callback del chord: suma las estadísticas de todos los lotes."""
+    # Los correos quedaron en la bandeja de salida: despertar al worker de correos
+    enviar_bandeja_correos_job.delay()
+
+    # Aviso a los clientes SSE suscritos al job
+    JobProgress(job_id).finish()
+
+    # Celery exige que el resultado sea JSON serializable
+    return {
+        "status": "completed",
+        "producto_id": producto_id,
+        "con_competencias": emitir_con_competencias,
+        "result": merge_bulk_stats(resultados),
+    }
+
+
+# 💡 TAREA CELERY QUE VACÍA LA BANDEJA DE SALIDA DE CORREOS (cola 'correos')
+@celery_app.task(name="enviar_bandeja_correos")
+def enviar_bandeja_correos_job(max_lotes: int = 20):
+    """
+    Envía por lotes los correos pendientes de email_outbox.
+    Se ejecuta al terminar cada emisión masiva y periódicamente desde Celery beat
+    para recoger los reintentos programados con backoff.
+    """
+    totales = {"tomados": 0, "enviados": 0, "reintentos": 0, "fallidos": 0}
+
+    with SessionLocal() as db:
+        for _ in range(max_lotes):
+            resumen = process_outbox_batch(db)
+            for clave, valor in resumen.items():
+                totales[clave] += valor
+            if not resumen["tomados"]:
+                break
+        else:
+            # Quedan correos: se vuelve a encolar para no acaparar el worker
+            enviar_bandeja_correos_job.delay(max_lotes)
+
+    return totales
+
@@ -0,0 +1,72 @@
+# Ruta: backend/benchmark_pdf.py
+
+import argparse
+import statistics
+import time
+from datetime import date
+
+from app.models.producto_educativo import TipoProductoEnum
+from app.services.pdf_service import CertificateRenderRequest, render_certificate
+from app.services.template_registry import template_registry
+
+
+def _generate_one(index: int, tipo_producto: TipoProductoEnum) -> bytes:
+    return render_certificate(CertificateRenderRequest(
+        serial=f"LANIA-BENCH-{index:06d}",
+        participant_name=f"Participante de Prueba {index}",
+        course_name="Curso de Benchmark de Constancias",
+        hours=20,
+        issue_date=date.today(),
+        tipo_producto=tipo_producto,
+        modalidad="REMOTA",
+        entity_type="participante",
+    ))
+
+
+def run_benchmark(n: int, tipo_producto: TipoProductoEnum, cold: bool) -> list[float]:
+    """
+    Genera 'n' constancias y devuelve la latencia (ms) de cada una.
+    Con cold=True se descarta la plantilla antes de cada constancia, lo que
+    reproduce el comportamiento anterior (abrir y analizar el PDF cada vez).
+    """
+    latencies = []
+    for i in range(n):
+        if cold:
+            template_registry.clear()
+        start = time.perf_counter()
+        _generate_one(i, tipo_producto)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _print_report(label: str, latencies: list[float]):
+    print(
+        f"{label:<28} media={statistics.mean(latencies):7.2f} ms  "
+        f"mediana={statistics.median(latencies):7.2f} ms  "
+        f"max={max(latencies):7.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mide la latencia por constancia del generador de PDF.")
+    parser.add_argument("--n", type=int, default=50, help="Número de constancias a generar por escenario.")
+    parser.add_argument(
+        "--tipo",
+        default=TipoProductoEnum.CURSO_EDUCATIVO.value,
+        choices=[t.value for t in TipoProductoEnum],
+        help="Tipo de producto educativo a generar.",
+    )
+    args = parser.parse_args()
+
+    tipo = TipoProductoEnum(args.tipo)
+
+    # Calentamiento (fuentes, imports perezosos de ReportLab, etc.)
+    _generate_one(0, tipo)
+
+    antes = run_benchmark(args.n, tipo, cold=True)
+    despues = run_benchmark(args.n, tipo, cold=False)
+
+    print(f"Constancias por escenario: {args.n} ({tipo.value})")
+    _print_report("Antes (plantilla por PDF):", antes)
+    _print_report("Después (plantilla en caché):", despues)
+    print(f"Mejora: {statistics.mean(antes) / statistics.mean(despues):.2f}x")
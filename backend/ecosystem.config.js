@@ -19,6 +19,26 @@ module.exports = {
       env: {
         PYTHONPATH: "/home/lania-siscol/lania-certificaciones/backend"
       }
+    },
+    {
+      name: "celery-correos",
+      cwd: "/home/lania-siscol/lania-certificaciones/backend",
+      script: "venv/bin/celery",
+      args: "-A app.celery_app.celery_app worker -Q correos -n correos@%h --loglevel=info",
+      interpreter: "none",
+      env: {
+        PYTHONPATH: "/home/lania-siscol/lania-certificaciones/backend"
+      }
+    },
+    {
+      name: "celery-beat",
+      cwd: "/home/lania-siscol/lania-certificaciones/backend",
+      script: "venv/bin/celery",
+      args: "-A app.celery_app.celery_app beat --loglevel=info",
+      interpreter: "none",
+      env: {
+        PYTHONPATH: "/home/lania-siscol/lania-certificaciones/backend"
+      }
     }
   ]
 }
@@ -0,0 +1,121 @@
+# Ruta: backend/pdf_size_report.py
+
+import argparse
+import random
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import StreamObject
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+CATEGORIAS = ("imagenes", "fuentes", "contenido", "estructura")
+
+
+def _grupo(path: Path, root: Path, cache_dir: Path) -> str:
+    """Almacén por contenido (sha256/), caché de render o carpeta heredada por curso."""
+    if cache_dir in path.resolve().parents:
+        return "cache de render"
+    relativa = path.relative_to(root)
+    if relativa.parts[0] == "sha256":
+        return "sha256 (por contenido)"
+    return f"heredado: {relativa.parts[0]}" if len(relativa.parts) > 1 else "heredado"
+
+
+def composicion(path: Path) -> dict:
+    """
+    Bytes del PDF por tipo de objeto: imágenes (plantilla), fuentes incrustadas,
+    contenido (páginas y Form XObjects) y el resto (diccionarios, xref, etc.).
+    """
+    reader = PdfReader(str(path))
+    tamanos = dict.fromkeys(CATEGORIAS, 0)
+
+    objetos = {}
+    numeros = {n for refs in reader.xref.values() for n in refs} | set(reader.xref_objStm)
+    for num in sorted(numeros - {0}):
+        try:
+            objetos[num] = reader.get_object(num)
+        except Exception:
+            continue
+
+    # Los archivos de fuente se reconocen por la referencia en su FontDescriptor
+    fuentes = {
+        obj.raw_get(clave).idnum
+        for obj in objetos.values() if hasattr(obj, "raw_get")
+        for clave in ("/FontFile", "/FontFile2", "/FontFile3") if clave in obj
+    }
+
+    for num, obj in objetos.items():
+        if not isinstance(obj, StreamObject):
+            continue
+        size = len(obj._data)
+        if obj.get("/Subtype") == "/Image":
+            tamanos["imagenes"] += size
+        elif num in fuentes:
+            tamanos["fuentes"] += size
+        else:
+            tamanos["contenido"] += size
+
+    tamanos["estructura"] = path.stat().st_size - sum(tamanos.values())
+    return tamanos
+
+
+def _kb(n: float) -> str:
+    return f"{n / 1024:9.1f} KB"
+
+
+def _print_grupos(archivos: list[Path], root: Path, cache_dir: Path):
+    grupos = defaultdict(list)
+    for path in archivos:
+        grupos[_grupo(path, root, cache_dir)].append(path.stat().st_size)
+
+    print(f"{'Grupo':<40} {'PDFs':>7} {'Total':>12} {'Media':>12} {'Mediana':>12} {'Máx':>12}")
+    for nombre, tamanos in sorted(grupos.items(), key=lambda g: -sum(g[1])):
+        print(
+            f"{nombre[:40]:<40} {len(tamanos):>7} {_kb(sum(tamanos))} {_kb(statistics.mean(tamanos))} "
+            f"{_kb(statistics.median(tamanos))} {_kb(max(tamanos))}"
+        )
+    todos = [t for tamanos in grupos.values() for t in tamanos]
+    print(f"{'TOTAL':<40} {len(todos):>7} {_kb(sum(todos))} {_kb(statistics.mean(todos))}")
+
+
+def _print_composicion(archivos: list[Path], muestra: int):
+    elegidos = random.Random(0).sample(archivos, min(muestra, len(archivos)))
+    totales = dict.fromkeys(CATEGORIAS, 0)
+    for path in elegidos:
+        for categoria, size in composicion(path).items():
+            totales[categoria] += size
+
+    total = sum(totales.values()) or 1
+    print(f"\nComposición promedio ({len(elegidos)} PDFs de muestra):")
+    for categoria in CATEGORIAS:
+        promedio = totales[categoria] / len(elegidos)
+        print(f"  {categoria:<12} {_kb(promedio)}  {100 * totales[categoria] / total:5.1f} %")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reporte de tamaño de los PDF emitidos en el árbol de constancias.")
+    parser.add_argument("--root", default=settings.CERT_STORAGE_ROOT, help="Carpeta raíz de las constancias.")
+    parser.add_argument("--muestra", type=int, default=20, help="PDFs a analizar por tipo de objeto (0 = omitir).")
+    parser.add_argument("--top", type=int, default=5, help="Número de PDFs más grandes a listar.")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    cache_dir = Path(settings.CERT_RENDER_CACHE_DIR).resolve()
+    archivos = sorted(root.rglob("*.pdf"))
+    if not archivos:
+        raise SystemExit(f"No se encontraron PDF en {root}")
+
+    _print_grupos(archivos, root, cache_dir)
+
+    if args.top:
+        print("\nMás grandes:")
+        for path in sorted(archivos, key=lambda p: -p.stat().st_size)[: args.top]:
+            print(f"  {_kb(path.stat().st_size)}  {path}")
+
+    if args.muestra:
+        _print_composicion(archivos, args.muestra)
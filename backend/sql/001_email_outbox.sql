@@ -0,0 +1,37 @@
+-- Ruta: backend/sql/001_email_outbox.sql
+-- Bandeja de salida de correos (models/email_outbox.py).
+-- Aplicar antes de desplegar la emisión masiva con email_outbox:
+--   psql "$DATABASE_URL" -f sql/001_email_outbox.sql
+-- Se puede ejecutar más de una vez.
+
+BEGIN;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'estadocorreoenum') THEN
+        CREATE TYPE estadocorreoenum AS ENUM ('PENDIENTE', 'ENVIANDO', 'ENVIADO', 'FALLIDO');
+    END IF;
+END
+$$;
+
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id SERIAL PRIMARY KEY,
+    certificado_id INTEGER NOT NULL REFERENCES certificados (id) ON DELETE CASCADE,
+    recipient_email VARCHAR(255) NOT NULL,
+    recipient_name VARCHAR(255) NOT NULL,
+    course_name VARCHAR(255) NOT NULL,
+    job_id VARCHAR(64),
+    estado estadocorreoenum NOT NULL DEFAULT 'PENDIENTE',
+    intentos INTEGER NOT NULL DEFAULT 0,
+    ultimo_error TEXT,
+    proximo_intento TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    fecha_creacion TIMESTAMP WITH TIME ZONE DEFAULT now(),
+    fecha_envio TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS ix_email_outbox_id ON email_outbox (id);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_certificado_id ON email_outbox (certificado_id);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_job_id ON email_outbox (job_id);
+CREATE INDEX IF NOT EXISTS ix_email_outbox_estado_proximo_intento ON email_outbox (estado, proximo_intento);
+
+COMMIT;
@@ -0,0 +1,33 @@
+-- Ruta: backend/sql/002_estadisticas.sql
+-- Tablas resumen del panel (models/estadisticas.py). Requiere 001_email_outbox.sql.
+--   psql "$DATABASE_URL" -f sql/002_estadisticas.sql
+-- Después de crearlas hay que llenarlas una vez con el histórico:
+--   POST /api/v1/admin/stats/reconstruir
+-- Se puede ejecutar más de una vez.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS estadisticas_certificados_mes (
+    producto_educativo_id INTEGER NOT NULL REFERENCES productos_educativos (id) ON DELETE CASCADE,
+    anio INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    participantes INTEGER NOT NULL DEFAULT 0,
+    docentes INTEGER NOT NULL DEFAULT 0,
+    con_competencias INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (producto_educativo_id, anio, mes)
+);
+
+CREATE TABLE IF NOT EXISTS estadisticas_inscripciones_producto (
+    producto_educativo_id INTEGER PRIMARY KEY REFERENCES productos_educativos (id) ON DELETE CASCADE,
+    total INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS estadisticas_correos_mes (
+    anio INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    enviados INTEGER NOT NULL DEFAULT 0,
+    fallidos INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (anio, mes)
+);
+
+COMMIT;
@@ -0,0 +1,8 @@
+-- Ruta: backend/sql/003_certificados_archivo_sha256.sql
+-- SHA-256 del PDF de cada certificado (ETag de las descargas).
+--   psql "$DATABASE_URL" -f sql/003_certificados_archivo_sha256.sql
+-- Los certificados ya emitidos quedan en NULL y calculan su hash la primera
+-- vez que se descargan (certificate_service.ensure_archivo_sha256).
+-- Se puede ejecutar más de una vez.
+
+ALTER TABLE certificados ADD COLUMN IF NOT EXISTS archivo_sha256 VARCHAR(64);
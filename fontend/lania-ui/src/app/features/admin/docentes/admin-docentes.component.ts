@@ -112,6 +112,12 @@ import { NotificationService } from '@shared/services/notification.service';
           </tbody>
         </table>
       </div>
+
+      <div class="pagination" *ngIf="docentes.length > 0">
+        <button class="secondary-btn" (click)="prevPage()" [disabled]="page === 1">← Atrás</button>
+        <span>Página {{ page }}</span>
+        <button class="secondary-btn" (click)="nextPage()" [disabled]="!nextCursor">Siguiente →</button>
+      </div>
     </div>
   `,
   styles: [ `
@@ -127,6 +133,8 @@ import { NotificationService } from '@shared/services/notification.service';
     .data-table th { background-color: #f9f9f9; }
     .actions { display: flex; gap: .5rem; }
     .contact-info { display: flex; flex-direction: column; }
+    .pagination { display: flex; justify-content: center; align-items: center; gap: 1rem; margin-top: 1.5rem; }
+    .pagination button:disabled { opacity: .5; cursor: not-allowed; }
     .primary-btn, .secondary-btn, .icon-btn { border: none; padding: .75rem 1.5rem; border-radius: 4px; cursor: pointer; }
     .primary-btn { background-color: #3f51b5; color: white; }
     .secondary-btn { background-color: #f0f0f0; }
@@ -143,6 +151,12 @@ export default class AdminDocentesComponent implements OnInit {
 
   docentes: DocenteDTO[] = [];
   showForm = false;
+
+  // Paginación por cursor (keyset)
+  readonly DOCENTES_LIMIT = 15;
+  cursors: (string | null)[] = [null]; // Cursor de cada página visitada (pila)
+  nextCursor: string | null = null;
+
   isEditing = false;
   currentDocenteId: number | null = null;
   docenteForm: FormGroup;
@@ -162,11 +176,30 @@ export default class AdminDocentesComponent implements OnInit {
   }
 
   loadDocentes() {
-    this.docenteService.getAll().subscribe(data => {
-      this.docentes = data;
+    const cursor = this.cursors[this.cursors.length - 1];
+    this.docenteService.getPage(cursor, this.DOCENTES_LIMIT).subscribe(page => {
+      this.docentes = page.items;
+      this.nextCursor = page.nextCursor;
     });
   }
 
+  get page(): number {
+    return this.cursors.length;
+  }
+
+  nextPage() {
+    if (!this.nextCursor) return;
+    this.cursors.push(this.nextCursor);
+    this.loadDocentes();
+  }
+
+  prevPage() {
+    if (this.cursors.length > 1) {
+      this.cursors.pop();
+    }
+    this.loadDocentes();
+  }
+
   toggleForm() {
     this.showForm = !this.showForm;
     this.isEditing = false;
@@ -184,6 +217,7 @@ export default class AdminDocentesComponent implements OnInit {
   deleteDocente(docente: DocenteDTO) {
     if (confirm(`¿Está seguro que desea eliminar a ${docente.nombre_completo}?`)) {
       this.docenteService.delete(docente.id!).subscribe(() => { // Asumiendo que el id siempre existirá
+        this.cursors = [null];
         this.loadDocentes();
         this.notificationService.showSuccess('Docente eliminado exitosamente.');
       });
@@ -198,6 +232,7 @@ export default class AdminDocentesComponent implements OnInit {
     }
 
     const handleSuccess = (message: string) => {
+      this.cursors = [null];
       this.loadDocentes();
       this.toggleForm();
       this.notificationService.showSuccess(message);
@@ -37,7 +37,8 @@ export default class AdminCertificadosComponent implements OnInit {
 
     // ✅ PROPIEDADES DE PAGINACIÓN para Participantes
     readonly PARTICIPANTES_LIMIT = 15;
-    skipParticipantes = 0; // Offset (registro inicial a buscar)
+    cursorsParticipantes: (string | null)[] = [null]; // Cursor de cada página visitada (pila)
+    nextCursorParticipantes: string | null = null; // Cursor de la página siguiente
     hasMoreParticipantes = false; // Indica si hay una página siguiente
     
     certificadosDocentes: Certificado[] = [];
@@ -47,7 +48,8 @@ export default class AdminCertificadosComponent implements OnInit {
 
     // ✅ PROPIEDADES DE PAGINACIÓN para Docentes
     readonly DOCENTES_LIMIT = 15;
-    skipDocentes = 0; // Offset (registro inicial a buscar)
+    cursorsDocentes: (string | null)[] = [null]; // Cursor de cada página visitada (pila)
+    nextCursorDocentes: string | null = null; // Cursor de la página siguiente
     hasMoreDocentes = false; // Indica si hay una página siguiente
 
     // --- PROPIEDADES PARA EL MODAL DE CREACIÓN ---
@@ -79,14 +81,14 @@ export default class AdminCertificadosComponent implements OnInit {
 
     loadCertificadosParticipantes(): void {
         this.isLoadingParticipantes = true;
-        const requestLimit = this.PARTICIPANTES_LIMIT + 1;
+        const cursor = this.cursorsParticipantes[this.cursorsParticipantes.length - 1];
 
-        this.certificadoSvc.getCertificadosParticipantes(this.skipParticipantes, requestLimit).subscribe({
-            next: (certificados) => {
-                this.hasMoreParticipantes = certificados.length > this.PARTICIPANTES_LIMIT;
-                const currentBatch = certificados.slice(0, this.PARTICIPANTES_LIMIT);
+        this.certificadoSvc.getCertificadosParticipantes(cursor, this.PARTICIPANTES_LIMIT).subscribe({
+            next: (page) => {
+                this.nextCursorParticipantes = page.nextCursor;
+                this.hasMoreParticipantes = page.nextCursor !== null;
 
-                this.certificadosParticipantes = currentBatch;
+                this.certificadosParticipantes = page.items;
                 this.filterCertificadosParticipantes(); 
                 this.isLoadingParticipantes = false;
             },
@@ -97,13 +99,20 @@ export default class AdminCertificadosComponent implements OnInit {
         });
     }
     
+    get pageParticipantes(): number {
+        return this.cursorsParticipantes.length;
+    }
+
     nextPageParticipantes(): void {
-        this.skipParticipantes += this.PARTICIPANTES_LIMIT;
+        if (!this.nextCursorParticipantes) return;
+        this.cursorsParticipantes.push(this.nextCursorParticipantes);
         this.loadCertificadosParticipantes();
     }
     
     prevPageParticipantes(): void {
-        this.skipParticipantes = Math.max(0, this.skipParticipantes - this.PARTICIPANTES_LIMIT);
+        if (this.cursorsParticipantes.length > 1) {
+            this.cursorsParticipantes.pop();
+        }
         this.loadCertificadosParticipantes();
     }
 
@@ -119,14 +128,14 @@ export default class AdminCertificadosComponent implements OnInit {
 
     loadCertificadosDocentes(): void {
         this.isLoadingDocentes = true;
-        const requestLimit = this.DOCENTES_LIMIT + 1;
+        const cursor = this.cursorsDocentes[this.cursorsDocentes.length - 1];
 
-        this.certificadoSvc.getCertificadosDocentes(this.skipDocentes, requestLimit).subscribe({
-            next: (certificados) => {
-                this.hasMoreDocentes = certificados.length > this.DOCENTES_LIMIT;
-                const currentBatch = certificados.slice(0, this.DOCENTES_LIMIT);
+        this.certificadoSvc.getCertificadosDocentes(cursor, this.DOCENTES_LIMIT).subscribe({
+            next: (page) => {
+                this.nextCursorDocentes = page.nextCursor;
+                this.hasMoreDocentes = page.nextCursor !== null;
 
-                this.certificadosDocentes = currentBatch;
+                this.certificadosDocentes = page.items;
                 this.filterCertificadosDocentes();
                 this.isLoadingDocentes = false;
             },
@@ -137,13 +146,20 @@ export default class AdminCertificadosComponent implements OnInit {
         });
     }
 
+    get pageDocentes(): number {
+        return this.cursorsDocentes.length;
+    }
+
     nextPageDocentes(): void {
-        this.skipDocentes += this.DOCENTES_LIMIT;
+        if (!this.nextCursorDocentes) return;
+        this.cursorsDocentes.push(this.nextCursorDocentes);
         this.loadCertificadosDocentes();
     }
     
     prevPageDocentes(): void {
-        this.skipDocentes = Math.max(0, this.skipDocentes - this.DOCENTES_LIMIT);
+        if (this.cursorsDocentes.length > 1) {
+            this.cursorsDocentes.pop();
+        }
         this.loadCertificadosDocentes();
     }
 
@@ -301,8 +317,8 @@ export default class AdminCertificadosComponent implements OnInit {
                 this.isLoadingModalData = false;
                 this.closeCreateModal();
                 
-                this.skipParticipantes = 0;
-                this.skipDocentes = 0;
+                this.cursorsParticipantes = [null];
+                this.cursorsDocentes = [null];
 
                 this.loadCertificadosParticipantes();
                 this.loadCertificadosDocentes();
@@ -373,8 +389,8 @@ export default class AdminCertificadosComponent implements OnInit {
                 next: () => {
                     this.notificationSvc.showSuccess('Certificado eliminado.');
                     
-                    this.skipParticipantes = 0;
-                    this.skipDocentes = 0;
+                    this.cursorsParticipantes = [null];
+                    this.cursorsDocentes = [null];
                     
                     this.loadCertificadosParticipantes();
                     this.loadCertificadosDocentes();
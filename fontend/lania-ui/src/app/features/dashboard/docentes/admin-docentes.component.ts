@@ -92,6 +92,14 @@ export default class AdminDocentesComponent implements OnInit {
   searchTerm: string = '';
   isLoading = false;
 
+  // ✅ PROPIEDADES DE PAGINACIÓN (cursor / keyset, igual que participantes)
+  readonly DOCENTES_LIMIT = 15;
+  cursors: (string | null)[] = [null]; // Cursor de cada página visitada (pila)
+  nextCursor: string | null = null; // Cursor de la página siguiente
+  hasMoreDocentes = false; // Controla el botón Siguiente
+  private searchTimer?: ReturnType<typeof setTimeout>;
+  private loadSeq = 0; // Descarta respuestas de búsquedas anteriores
+
   // 🚨 CAMBIO: Aplicación de validadores personalizados en la construcción del formulario
   constructor() {
     this.docenteForm = this.fb.group({
@@ -115,24 +123,59 @@ export default class AdminDocentesComponent implements OnInit {
     this.loadDocentes();
   }
 
+  // Paginación por cursor (keyset); la latencia no depende de la página
   loadDocentes() {
     this.isLoading = true;
-    this.docenteService.getAll().subscribe({
-      next: (data) => {
-        this.docentes = data;
-        this.filteredDocentes = data;
+
+    const cursor = this.cursors[this.cursors.length - 1];
+    const seq = ++this.loadSeq;
+
+    this.docenteService.getPage(cursor, this.DOCENTES_LIMIT, this.searchTerm).subscribe({
+      next: (page) => {
+        if (seq !== this.loadSeq) return;
+        // El backend indica con el cursor si existe una página siguiente
+        this.nextCursor = page.nextCursor;
+        this.hasMoreDocentes = page.nextCursor !== null;
+
+        this.docentes = page.items;
+        this.filteredDocentes = page.items;
         this.isLoading = false;
       },
-      error: (err: HttpErrorResponse) => this.handleError(err, 'Error al cargar los docentes.')
+      error: (err: HttpErrorResponse) => {
+        this.isLoading = false;
+        this.handleError(err, 'Error al cargar los docentes.');
+      }
     });
   }
 
+  get page(): number {
+    return this.cursors.length;
+  }
+
+  nextPageDocentes(): void {
+    if (!this.nextCursor) return;
+    this.cursors.push(this.nextCursor);
+    this.loadDocentes();
+  }
+
+  prevPageDocentes(): void {
+    if (this.cursors.length > 1) {
+      this.cursors.pop();
+    }
+    this.loadDocentes();
+  }
+
+  // Tras crear, editar, eliminar o cambiar la búsqueda se vuelve a la primera página
+  private reloadFromFirstPage(): void {
+    this.cursors = [null];
+    this.loadDocentes();
+  }
+
+  // La búsqueda se hace en el backend sobre todos los docentes; al cambiar el
+  // término se vuelve a la primera página
   filterDocentes() {
-    const term = this.searchTerm.toLowerCase();
-    this.filteredDocentes = this.docentes.filter(docente =>
-      docente.nombre_completo.toLowerCase().includes(term) ||
-      docente.especialidad?.toLowerCase().includes(term)
-    );
+    clearTimeout(this.searchTimer);
+    this.searchTimer = setTimeout(() => this.reloadFromFirstPage(), 300);
   }
 
   toggleForm() {
@@ -154,7 +197,7 @@ export default class AdminDocentesComponent implements OnInit {
       this.docenteService.delete(docente.id).subscribe({
         next: () => {
           this.notificationService.showSuccess('Docente eliminado exitosamente.');
-          this.loadDocentes();
+          this.reloadFromFirstPage();
         },
         error: (err: HttpErrorResponse) => this.handleError(err, 'Error al eliminar el docente.')
       });
@@ -176,7 +219,7 @@ export default class AdminDocentesComponent implements OnInit {
       this.docenteService.update(this.currentDocenteId, formData as UpdateDocenteDTO).subscribe({
         next: () => {
           this.notificationService.showSuccess('Docente actualizado exitosamente.');
-          this.loadDocentes();
+          this.reloadFromFirstPage();
           this.toggleForm();
         },
         error: (err: HttpErrorResponse) => this.handleError(err, 'Error al actualizar el docente.')
@@ -185,7 +228,7 @@ export default class AdminDocentesComponent implements OnInit {
       this.docenteService.create(formData as CreateDocenteDTO).subscribe({
         next: () => {
           this.notificationService.showSuccess('Docente creado exitosamente.');
-          this.loadDocentes();
+          this.reloadFromFirstPage();
           this.toggleForm();
         },
         // Los errores de backend (como unicidad) todavía se manejan aquí y se muestran en el snackbar
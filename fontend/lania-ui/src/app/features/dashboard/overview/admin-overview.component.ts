@@ -1,22 +1,10 @@
 import { Component, inject, OnInit } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { Router, RouterLink } from '@angular/router';
-import { forkJoin } from 'rxjs';
 import { HttpErrorResponse } from '@angular/common/http'; // Para manejo de errores
 
-// Importamos todos los servicios e interfaces necesarios
-import { ProductoEducativoService } from '@shared/services/producto-educativo.service';
-import { ParticipanteService } from '@shared/services/participante.service';
-import { CertificadoService } from '@shared/services/certificado.service';
-import { DocenteService } from '@shared/services/docente.service';
-// ✅ ERROR CORREGIDO: Importar la clase AdministradorService correctamente
-import { AdministradorService } from '@shared/services/administrador.service'; 
-
-import { ProductoEducativo } from '@shared/interfaces/producto-educativo.interface';
-import { Participante } from '@shared/interfaces/participante.interface';
-import { Certificado } from '@shared/interfaces/certificado.interface';
-import { DocenteDTO } from '@shared/interfaces/docente.interfaces';
-import { Administrador } from '@shared/interfaces/administrador.interface';
+import { StatsService } from '@shared/services/stats.service';
+import { AdminStats, StatsTotales } from '@shared/interfaces/stats.interface';
 
 @Component({
   selector: 'app-admin-overview',
@@ -29,20 +17,19 @@ import { Administrador } from '@shared/interfaces/administrador.interface';
   styleUrls: ['./admin-overview.component.css']
 })
 export default class AdminOverviewComponent implements OnInit {
-  // Inyección de todos los servicios necesarios
-  private productoEducativoService = inject(ProductoEducativoService);
-  private participanteService = inject(ParticipanteService);
-  private certificadoService = inject(CertificadoService);
-  private docenteService = inject(DocenteService);
-  private administradorService = inject(AdministradorService); // ✅ Inyección tipada
+  private statsService = inject(StatsService);
   private router = inject(Router);
 
-  // Propiedades para almacenar los datos
-  productos: ProductoEducativo[] = [];
-  participantes: Participante[] = [];
-  certificados: Certificado[] = [];
-  docentes: DocenteDTO[] = [];
-  administradores: Administrador[] = [];
+  // Conteos calculados en el servidor (GET /admin/stats), sin descargar los listados completos
+  stats: AdminStats | null = null;
+  totales: StatsTotales = {
+    productos: 0,
+    participantes: 0,
+    docentes: 0,
+    administradores: 0,
+    inscripciones: 0,
+    certificados: 0
+  };
   
   isLoading = true;
   errorMessage = '';
@@ -58,36 +45,12 @@ export default class AdminOverviewComponent implements OnInit {
 
     console.log('📡 Cargando datos del dashboard...');
 
-    // Usamos forkJoin para ejecutar todas las peticiones en paralelo
-    forkJoin({
-      productos: this.productoEducativoService.getAll(),
-      participantes: this.participanteService.getAll(),
-      certificados: this.certificadoService.getAll(),
-      docentes: this.docenteService.getAll(),
-      administradores: this.administradorService.getAll()
-    }).subscribe({
-      // Tipado de 'data'
-      next: (data: { 
-        productos: ProductoEducativo[], 
-        participantes: Participante[], 
-        certificados: Certificado[], 
-        docentes: DocenteDTO[], 
-        administradores: Administrador[] 
-      }) => {
-        console.log('✅ Datos cargados exitosamente:', {
-          productos: data.productos.length,
-          participantes: data.participantes.length,
-          certificados: data.certificados.length,
-          docentes: data.docentes.length,
-          administradores: data.administradores.length
-        });
+    this.statsService.getAdminStats().subscribe({
+      next: (stats: AdminStats) => {
+        console.log('✅ Estadísticas cargadas exitosamente:', stats.totales);
 
-        // Asignamos los resultados a nuestras propiedades
-        this.productos = data.productos;
-        this.participantes = data.participantes;
-        this.certificados = data.certificados;
-        this.docentes = data.docentes;
-        this.administradores = data.administradores;
+        this.stats = stats;
+        this.totales = stats.totales;
         
         this.isLoading = false;
       },
@@ -97,8 +60,7 @@ export default class AdminOverviewComponent implements OnInit {
         if (err.status === 401) {
           this.errorMessage = 'Tu sesión ha expirado. Por favor, inicia sesión nuevamente.';
         } else if (err.status === 404) {
-          // El error 404 indica que al menos una ruta falló.
-          this.errorMessage = 'Algunas secciones no fueron encontradas en el servidor (404). Contacta al administrador.';
+          this.errorMessage = 'Las estadísticas no fueron encontradas en el servidor (404). Contacta al administrador.';
         } else if (err.status === 0) {
           this.errorMessage = 'No se pudo conectar con el servidor. Verifica tu conexión.';
         } else {
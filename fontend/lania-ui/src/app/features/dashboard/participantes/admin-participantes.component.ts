@@ -92,7 +92,8 @@ export default class AdminParticipantesComponent implements OnInit {
 
   // ✅ PROPIEDADES DE PAGINACIÓN
   readonly PARTICIPANTES_LIMIT = 15;
-  skip = 0; // Offset (registro inicial a buscar)
+  cursors: (string | null)[] = [null]; // Cursor de cada página visitada (pila)
+  nextCursor: string | null = null; // Cursor de la página siguiente
   hasMoreParticipants = false; // Controla el botón Siguiente
 
 
@@ -112,23 +113,19 @@ export default class AdminParticipantesComponent implements OnInit {
     this.loadParticipants();
   }
 
-  // 🔄 FUNCIÓN MODIFICADA: Implementa paginación con skip y limit + 1
+  // 🔄 FUNCIÓN MODIFICADA: Paginación por cursor (keyset); la latencia no depende de la página
   loadParticipants() {
     this.isLoading = true;
-    
-    // Solicitamos LIMIT + 1 (16 registros) para saber si hay una página siguiente
-    const requestLimit = this.PARTICIPANTES_LIMIT + 1;
 
-    // ✅ Pasar skip y el límite de solicitud al servicio
-    this.participanteService.getAll(this.skip, requestLimit).subscribe({
-        next: (data) => {
-            // Verificar si hay más de 15 para saber si habilitar 'Siguiente'
-            this.hasMoreParticipants = data.length > this.PARTICIPANTES_LIMIT;
+    const cursor = this.cursors[this.cursors.length - 1];
 
-            // Recortar la lista para mostrar solo los 15 elementos de la página actual
-            const currentBatch = data.slice(0, this.PARTICIPANTES_LIMIT);
+    this.participanteService.getPage(cursor, this.PARTICIPANTES_LIMIT).subscribe({
+        next: (page) => {
+            // El backend indica con el cursor si existe una página siguiente
+            this.nextCursor = page.nextCursor;
+            this.hasMoreParticipants = page.nextCursor !== null;
 
-            this.participantes = currentBatch; 
+            this.participantes = page.items; 
             this.filterParticipants();
             this.isLoading = false;
         },
@@ -138,17 +135,23 @@ export default class AdminParticipantesComponent implements OnInit {
         }
     });
   }
+
+  get page(): number {
+    return this.cursors.length;
+  }
   
   // ✅ NUEVA FUNCIÓN: Siguiente página
   nextPageParticipants(): void {
-    this.skip += this.PARTICIPANTES_LIMIT;
+    if (!this.nextCursor) return;
+    this.cursors.push(this.nextCursor);
     this.loadParticipants();
   }
   
   // ✅ NUEVA FUNCIÓN: Página anterior
   prevPageParticipants(): void {
-    // Asegurar que skip nunca sea menor que 0
-    this.skip = Math.max(0, this.skip - this.PARTICIPANTES_LIMIT);
+    if (this.cursors.length > 1) {
+      this.cursors.pop();
+    }
     this.loadParticipants();
   }
 
@@ -186,7 +189,7 @@ export default class AdminParticipantesComponent implements OnInit {
         next: () => {
           this.notificationService.showSuccess('Participante eliminado correctamente.');
           // ✅ Resetear la paginación a la primera página y recargar
-          this.skip = 0; 
+          this.cursors = [null]; 
           this.loadParticipants(); // Recargar la lista
         },
         error: (err: HttpErrorResponse) => {
@@ -210,7 +213,7 @@ export default class AdminParticipantesComponent implements OnInit {
         next: () => {
           this.notificationService.showSuccess('Participante actualizado exitosamente.');
           // ✅ Resetear la paginación a la primera página y recargar
-          this.skip = 0;
+          this.cursors = [null];
           this.loadParticipants();
           this.toggleForm();
         },
@@ -221,7 +224,7 @@ export default class AdminParticipantesComponent implements OnInit {
         next: () => {
           this.notificationService.showSuccess('Participante creado exitosamente.');
           // ✅ Resetear la paginación a la primera página y recargar
-          this.skip = 0;
+          this.cursors = [null];
           this.loadParticipants();
           this.toggleForm();
         },
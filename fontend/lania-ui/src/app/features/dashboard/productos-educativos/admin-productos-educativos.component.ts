@@ -27,7 +27,7 @@ import {
 import { DocenteDTO } from '@shared/interfaces/docente.interfaces';
 import { Participante } from '@shared/interfaces/participante.interface';
 import { Inscripcion, InscripcionCreate } from '@shared/interfaces/inscripcion.interface';
-import { Certificado, CertificadoCreate, EmisionMasivaResponse } from '@shared/interfaces/certificado.interface';
+import { Certificado, CertificadoCreate, EmisionMasivaResponse, JobStatus } from '@shared/interfaces/certificado.interface';
 
 // Servicios
 import { ProductoEducativoService } from '@shared/services/producto-educativo.service';
@@ -78,6 +78,7 @@ export class AdminProductosEducativosComponent implements OnInit {
   docentes: DocenteDTO[] = [];
   participantes: Participante[] = [];
   certificados: Certificado[] = [];
+  bulkJobStatus: JobStatus | null = null; // Avance de la emisión masiva en curso (SSE)
     
   // Arrays completos (filtrados)
   cursos: ProductoEducativoWithDetails[] = [];
@@ -711,10 +712,14 @@ export class AdminProductosEducativosComponent implements OnInit {
 
         this.notificationSvc.showSuccess(response.message || 'Proceso masivo completado.');
 
-        // 🔥 AQUÍ SE APLICA LA SOLUCIÓN
-        setTimeout(() => {
-          this.loadCertificados();
-        }, 3000);
+        // 🔥 Se sigue el avance por SSE y se recargan los certificados solo al terminar
+        if (response.job_id) {
+          this.followBulkJob(response.job_id);
+        } else {
+          setTimeout(() => {
+            this.loadCertificados();
+          }, 3000);
+        }
 
         if (response.errors && response.errors.length > 0) { 
           console.error('Errores en emisión masiva normal:', response.errors); 
@@ -735,6 +740,31 @@ export class AdminProductosEducativosComponent implements OnInit {
 }
 
 
+  /**
+   * Sigue una tarea masiva por Server-Sent Events y recarga los certificados al terminar.
+   */
+  private followBulkJob(jobId: string) {
+    this.certificadoSvc.streamJobStatus(jobId).subscribe({
+      next: (status: JobStatus) => {
+        this.bulkJobStatus = status;
+        this.cdr.markForCheck();
+
+        if (status.terminado) {
+          if (status.estado === 'SUCCESS') {
+            const p = status.progreso;
+            this.notificationSvc.showSuccess(
+              `Proceso masivo terminado: ${p.committed} emitidas, ${p.resent} reenviadas, ${p.failed} con error.`
+            );
+          } else {
+            this.notificationSvc.showError(status.error || 'La tarea masiva terminó con error.');
+          }
+          this.loadCertificados();
+        }
+      },
+      error: () => this.loadCertificados()
+    });
+  }
+
   emitAndSendCompetenciesSelected() {
     if (!this.selectedCourse) { 
       this.notificationSvc.showError('No se ha seleccionado un producto.'); 
@@ -49,6 +49,45 @@ export interface EmisionMasivaResponse {
   errors: { inscripcion_id: number; error: string }[];
 }
 
+/**
+ * Respuesta del endpoint de emisión masiva (tarea encolada en Celery).
+ */
+export interface EmisionMasivaJob {
+  message: string;
+  job_id: string;
+  status_check_url: string;
+}
+
+/**
+ * Contadores de avance que publica una tarea masiva.
+ */
+export interface JobProgreso {
+  total: number;
+  rendered: number;
+  committed: number;
+  resent: number;
+  emailed: number;
+  failed: number;
+}
+
+/**
+ * Estado de una tarea masiva (GET /admin/jobs/{id} y eventos SSE).
+ */
+export interface JobStatus {
+  job_id: string;
+  estado: string;
+  terminado: boolean;
+  progreso: JobProgreso;
+  resultado?: any;
+  error?: string | null;
+}
+
+/** Token de corta duración para seguir un solo job por SSE (POST /admin/jobs/{id}/events-token). */
+export interface JobEventsToken {
+  token: string;
+  expires_in: number;
+}
+
 /**
  * Representa la información pública de un certificado para la página de verificación.
  */
@@ -0,0 +1,21 @@
+import { HttpResponse } from '@angular/common/http';
+
+/** Encabezado en el que el backend devuelve el cursor de la siguiente página. */
+export const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+/**
+ * Página de un listado paginado por cursor (keyset).
+ * 'nextCursor' es opaco y es null en la última página.
+ */
+export interface CursorPage<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+/** Convierte la respuesta HTTP completa (observe: 'response') en una CursorPage. */
+export function toCursorPage<T>(response: HttpResponse<T[]>): CursorPage<T> {
+  return {
+    items: response.body ?? [],
+    nextCursor: response.headers.get(NEXT_CURSOR_HEADER),
+  };
+}
@@ -0,0 +1,24 @@
+// Respuesta de GET /admin/stats (conteos calculados en el servidor)
+export interface StatsTotales {
+  productos: number;
+  participantes: number;
+  docentes: number;
+  administradores: number;
+  inscripciones: number;
+  certificados: number;
+}
+
+export interface CertificadosPorMes {
+  mes: string; // "YYYY-MM"
+  total: number;
+}
+
+export interface AdminStats {
+  totales: StatsTotales;
+  certificados_por_destinatario: { [destinatario: string]: number };
+  certificados_por_competencias: { [clave: string]: number };
+  certificados_por_tipo_producto: { [tipo: string]: number };
+  certificados_por_mes: CertificadosPorMes[];
+  correos: { enviados: number; fallidos: number };
+  generado_en: string;
+}
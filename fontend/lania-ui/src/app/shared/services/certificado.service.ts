@@ -1,9 +1,11 @@
 // Ruta: frontend/lania-ui/src/app/shared/services/certificado.service.ts
-import { Injectable, inject } from '@angular/core';
+import { Injectable, NgZone, inject } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http'; // ✅ Importar HttpParams
 import { Observable } from 'rxjs';
+import { map } from 'rxjs/operators';
 import { environment } from '@environments/environment';
-import { Certificado, CertificadoCreate, EmisionMasivaResponse } from '../interfaces/certificado.interface';
+import { CursorPage, toCursorPage } from '../interfaces/pagination.interface';
+import { Certificado, CertificadoCreate, EmisionMasivaResponse, JobEventsToken, JobStatus } from '../interfaces/certificado.interface';
 
 @Injectable({
     providedIn: 'root'
@@ -25,35 +27,39 @@ export class CertificadoService {
 
     // --- MÉTODOS AÑADIDOS PARA EL DASHBOARD ---
     
-    /**
-     * Obtiene la lista de certificados específicos de Participantes, con paginación.
-     * @param skip El offset (cuántos registros saltar, por defecto 0).
-     * @param limit El número máximo de registros a obtener (por defecto 15).
-     */
-    getCertificadosParticipantes(skip: number = 0, limit: number = 15): Observable<Certificado[]> {
-        let params = new HttpParams().set('v', new Date().getTime().toString());
-        
-        // ✅ Establecer skip y limit para la paginación
-        params = params.set('skip', skip.toString()); 
-        params = params.set('limit', limit.toString()); 
-        
-        return this.http.get<Certificado[]>(`${this.apiUrl}/participantes`, { params });
-    }
+    /**
+     * Obtiene una página de certificados de Participantes (paginación por cursor).
+     * @param cursor El cursor devuelto por la página anterior (null para la primera).
+     * @param limit El número máximo de registros a obtener (por defecto 15).
+     */
+    getCertificadosParticipantes(cursor: string | null = null, limit: number = 15): Observable<CursorPage<Certificado>> {
+        let params = new HttpParams().set('v', new Date().getTime().toString());
+        params = params.set('limit', limit.toString());
+        if (cursor) {
+            params = params.set('cursor', cursor);
+        }
 
-    /**
-     * Obtiene la lista de certificados específicos de Docentes, con paginación.
-     * @param skip El offset (cuántos registros saltar, por defecto 0).
-     * @param limit El número máximo de registros a obtener (por defecto 15).
-     */
-    getCertificadosDocentes(skip: number = 0, limit: number = 15): Observable<Certificado[]> {
-        let params = new HttpParams().set('v', new Date().getTime().toString());
-        
-        // ✅ Establecer skip y limit para la paginación
-        params = params.set('skip', skip.toString()); 
-        params = params.set('limit', limit.toString()); 
-        
-        return this.http.get<Certificado[]>(`${this.apiUrl}/docentes`, { params });
-    }
+        return this.http
+            .get<Certificado[]>(`${this.apiUrl}/participantes`, { params, observe: 'response' })
+            .pipe(map(toCursorPage));
+    }
+
+    /**
+     * Obtiene una página de certificados de Docentes (paginación por cursor).
+     * @param cursor El cursor devuelto por la página anterior (null para la primera).
+     * @param limit El número máximo de registros a obtener (por defecto 15).
+     */
+    getCertificadosDocentes(cursor: string | null = null, limit: number = 15): Observable<CursorPage<Certificado>> {
+        let params = new HttpParams().set('v', new Date().getTime().toString());
+        params = params.set('limit', limit.toString());
+        if (cursor) {
+            params = params.set('cursor', cursor);
+        }
+
+        return this.http
+            .get<Certificado[]>(`${this.apiUrl}/docentes`, { params, observe: 'response' })
+            .pipe(map(toCursorPage));
+    }
 
     // --- MÉTODO NUEVO PARA EL BOTÓN "👁️" ---
     /**
@@ -111,4 +117,61 @@ export class CertificadoService {
     return this.http.post<EmisionMasivaResponse>(url, {});
 }
 
-}
\ No newline at end of file
+    /**
+     * Sigue en vivo el avance de una tarea masiva (Server-Sent Events).
+     * Emite el estado al conectar y en cada avance; se completa cuando la tarea termina.
+     * EventSource no permite encabezados, así que antes de cada conexión se pide un
+     * token de corta duración válido solo para este job (nunca el JWT de sesión en la URL).
+     * @param jobId - El ID devuelto por emitir-masivo.
+     */
+    streamJobStatus(jobId: string): Observable<JobStatus> {
+        const jobUrl = `${environment.apiUrl}/admin/jobs/${encodeURIComponent(jobId)}`;
+
+        return new Observable<JobStatus>(observer => {
+            let source: EventSource | null = null;
+            let reconexiones = 0;
+            let cerrado = false;
+
+            const conectar = () => {
+                this.http.post<JobEventsToken>(`${jobUrl}/events-token`, {}).subscribe({
+                    next: ({ token }) => {
+                        if (cerrado) return;
+                        source = new EventSource(`${jobUrl}/events?token=${encodeURIComponent(token)}`);
+
+                        source.addEventListener('estado', (event: MessageEvent) => {
+                            reconexiones = 0;
+                            const status: JobStatus = JSON.parse(event.data);
+                            this.zone.run(() => {
+                                observer.next(status);
+                                if (status.terminado) {
+                                    source?.close();
+                                    observer.complete();
+                                }
+                            });
+                        });
+
+                        source.onerror = () => {
+                            // El token ya venció cuando EventSource reintenta solo: se reconecta con uno nuevo
+                            source?.close();
+                            if (cerrado) return;
+                            if (reconexiones++ < 3) {
+                                conectar();
+                            } else {
+                                this.zone.run(() => observer.error(new Error('Se perdió la conexión con el progreso de la tarea.')));
+                            }
+                        };
+                    },
+                    error: (err) => observer.error(err)
+                });
+            };
+
+            conectar();
+
+            return () => {
+                cerrado = true;
+                source?.close();
+            };
+        });
+    }
+
+}
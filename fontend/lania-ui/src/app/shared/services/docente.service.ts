@@ -1,7 +1,9 @@
 import { Injectable, inject } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
+import { map } from 'rxjs/operators';
 import { environment } from '@environments/environment';
+import { CursorPage, toCursorPage } from '@shared/interfaces/pagination.interface';
 import { DocenteDTO, CreateDocenteDTO, UpdateDocenteDTO } from '@shared/interfaces/docente.interfaces';
 
 @Injectable({
@@ -19,6 +21,24 @@ export class DocenteService {
     return this.http.get<DocenteDTO[]>(this.apiUrl);
   }
 
+  /**
+   * Obtiene una página de docentes con paginación por cursor (keyset).
+   * @param cursor El cursor devuelto por la página anterior (null para la primera).
+   * @param search Texto a buscar en nombre o especialidad (en el backend, sobre todos los docentes).
+   */
+  getPage(cursor: string | null = null, limit: number = 100, search: string = ''): Observable<CursorPage<DocenteDTO>> {
+    let params = new HttpParams().set('limit', limit.toString());
+    if (cursor) {
+      params = params.set('cursor', cursor);
+    }
+    if (search.trim()) {
+      params = params.set('q', search.trim());
+    }
+    return this.http
+      .get<DocenteDTO[]>(this.apiUrl, { params, observe: 'response' })
+      .pipe(map(toCursorPage));
+  }
+
   create(docente: CreateDocenteDTO): Observable<DocenteDTO> {
     // Esto ahora llamará a ".../admin/docentes/" (correcto)
     return this.http.post<DocenteDTO>(this.apiUrl, docente);
@@ -2,7 +2,9 @@
 import { Injectable, inject } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http'; // ✅ Importar HttpParams
 import { Observable } from 'rxjs';
+import { map } from 'rxjs/operators';
 import { environment } from '@environments/environment';
+import { CursorPage, toCursorPage } from '@shared/interfaces/pagination.interface';
 import { Participante, ParticipanteCreate, ParticipanteUpdate } from '@shared/interfaces/participante.interface';
 
 @Injectable({
@@ -31,6 +33,21 @@ export class ParticipanteService {
     return this.http.get<Participante[]>(this.apiUrl, { params });
   }
 
+  /**
+   * Obtiene una página de participantes con paginación por cursor (keyset).
+   * Llama a: /api/v1/admin/participantes/?cursor=...&limit=15
+   * @param cursor El cursor devuelto por la página anterior (null para la primera).
+   */
+  getPage(cursor: string | null = null, limit: number = 15): Observable<CursorPage<Participante>> {
+    let params = new HttpParams().set('limit', limit.toString());
+    if (cursor) {
+      params = params.set('cursor', cursor);
+    }
+    return this.http
+      .get<Participante[]>(this.apiUrl, { params, observe: 'response' })
+      .pipe(map(toCursorPage));
+  }
+
   create(participante: ParticipanteCreate): Observable<Participante> {
     // Llama a: /api/v1/admin/participantes/
     return this.http.post<Participante>(this.apiUrl, participante);
@@ -0,0 +1,17 @@
+import { Injectable, inject } from '@angular/core';
+import { HttpClient } from '@angular/common/http';
+import { Observable } from 'rxjs';
+import { AdminStats } from '@shared/interfaces/stats.interface';
+import { environment } from '@environments/environment';
+
+@Injectable({
+  providedIn: 'root'
+})
+export class StatsService {
+  private http = inject(HttpClient);
+  private apiUrl = `${environment.apiUrl}/admin/stats/`;
+
+  getAdminStats(): Observable<AdminStats> {
+    return this.http.get<AdminStats>(this.apiUrl);
+  }
+}